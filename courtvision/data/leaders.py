@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+
+from courtvision.data.nba_client import (
+    _p, _st_tag, _save_csv, _load_csv,
+    _league_player_totals,
+    league_advanced_table,
+)
+
+# stat -> (label, volume column for the percentage minimum, minimum over a full 82-game season)
+LEADER_STATS = {
+    "PTS": ("Points per game", None, 0),
+    "REB": ("Rebounds per game", None, 0),
+    "AST": ("Assists per game", None, 0),
+    "STL": ("Steals per game", None, 0),
+    "BLK": ("Blocks per game", None, 0),
+    "FG3M": ("3-pointers made per game", None, 0),
+    "TOV": ("Turnovers per game", None, 0),
+    "MIN": ("Minutes per game", None, 0),
+    "FG_PCT": ("Field goal %", "FGM", 300),
+    "FG3_PCT": ("3-point %", "FG3M", 82),
+    "FT_PCT": ("Free throw %", "FTM", 125),
+    "EFG_PCT": ("Effective FG %", "FGM", 300),
+    "TS_PCT": ("True shooting %", "FGM", 300),
+    "PER": ("Player efficiency rating", None, 0),
+    "USG_PCT": ("Usage %", None, 0),
+    "AST_TO": ("Assist / turnover", "AST", 150),
+}
+PER_GAME = ["PTS", "REB", "AST", "STL", "BLK", "FG3M", "TOV", "MIN"]
+
+# Qualifiers: share of team games played and minutes per game (minimums pro-rated to games played so far)
+QUALIFY_GP_FRAC = 0.70
+QUALIFY_MPG = 15.0
+SEASON_GAMES = 82
+
+
+# -------------------- season table --------------------
+def _leaderboard_frame(season, refresh=False, season_type="Regular Season"):
+    """Per-game values, advanced rates, qualifier flags and per-stat rank / percentile columns."""
+    p = _league_player_totals(season, refresh=refresh, season_type=season_type)
+    if p.empty:
+        return pd.DataFrame()
+    adv = league_advanced_table(season, refresh=refresh, season_type=season_type)
+
+    gp = pd.to_numeric(p["GP"], errors="coerce").fillna(0).to_numpy(float)
+    df = pd.DataFrame({
+        "PLAYER_ID": p["PLAYER_ID"].to_numpy(),
+        "PLAYER_NAME": p["PLAYER_NAME"].to_numpy(),
+        "TEAM_ID": pd.to_numeric(p["TEAM_ID"], errors="coerce").fillna(0).astype(int).to_numpy(),
+        "TEAM_ABBREVIATION": p["TEAM_ABBREVIATION"].to_numpy() if "TEAM_ABBREVIATION" in p.columns else "",
+        "GP": gp,
+    })
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for c in PER_GAME:
+            tot = pd.to_numeric(p[c], errors="coerce").fillna(0).to_numpy(float) if c in p.columns else np.zeros(len(p))
+            df[c] = np.where(gp > 0, tot / gp, np.nan)
+    for c in ["FG_PCT", "FG3_PCT", "FT_PCT"]:
+        df[c] = pd.to_numeric(p[c], errors="coerce").to_numpy(float) * 100.0 if c in p.columns else np.nan
+    for c in ["FGM", "FG3M", "FTM", "AST"]:
+        df[f"{c}_TOT"] = pd.to_numeric(p[c], errors="coerce").fillna(0).to_numpy(float) if c in p.columns else 0.0
+    if not adv.empty:
+        a = adv.set_index("PLAYER_ID")
+        for c in ["EFG_PCT", "TS_PCT", "PER", "USG_PCT", "AST_TO"]:
+            df[c] = df["PLAYER_ID"].map(a[c]).to_numpy(float) if c in a.columns else np.nan
+    else:
+        for c in ["EFG_PCT", "TS_PCT", "PER", "USG_PCT", "AST_TO"]:
+            df[c] = np.nan
+
+    # Team games so far ~ the most games anyone has played; minimums scale with it.
+    # Playoff runs differ in length, so there the games share is taken against the player's own team.
+    team_games = float(gp.max()) if len(gp) else 0.0
+    scale = min(team_games / SEASON_GAMES, 1.0)
+    if season_type != "Regular Season" and len(gp):
+        team_games = df.groupby("TEAM_ID")["GP"].transform("max").to_numpy(float)
+    df["QUALIFIED"] = (gp >= QUALIFY_GP_FRAC * team_games) & (df["MIN"].fillna(0) >= QUALIFY_MPG) & (gp > 0)
+
+    for stat, (_, vol, minimum) in LEADER_STATS.items():
+        v = df[stat]
+        ok = v.notna() & (df["GP"] > 0)
+        qual = ok & df["QUALIFIED"]
+        if vol:
+            qual &= df[f"{vol}_TOT"] >= minimum * scale
+        df[f"{stat}_RANK"] = v.where(qual).rank(ascending=False, method="min")
+        df[f"{stat}_PCTILE"] = (v.where(qual).rank(pct=True) * 100).round(1)
+        df[f"{stat}_RANK_ALL"] = v.where(ok).rank(ascending=False, method="min")
+    return df
+
+
+class Leaderboard:
+    """
+    One season's leaderboard with every stat pre-ranked.
+    For each stat a position array ordered by rank is built once (qualified players and everyone),
+    so a top-N read -- optionally restricted to one team -- is a slice, not a sort.
+    """
+    def __init__(self, table):
+        self.frame = table.reset_index(drop=True)
+        self.n = len(self.frame)
+        self._order = {}
+        for stat in LEADER_STATS:
+            for qualified, col in ((True, f"{stat}_RANK"), (False, f"{stat}_RANK_ALL")):
+                if col not in self.frame.columns:
+                    continue
+                r = self.frame[col].to_numpy(float)
+                pos = np.flatnonzero(~np.isnan(r))
+                self._order[(stat, qualified)] = pos[np.argsort(r[pos], kind="stable")]
+        self._teams = {
+            int(t): np.asarray(ix) for t, ix in self.frame.groupby("TEAM_ID").indices.items()
+        } if self.n else {}
+        self._players = pd.Series(np.arange(self.n), index=self.frame["PLAYER_ID"]) if self.n else pd.Series(dtype=int)
+
+    def top(self, stat, n=25, qualified=True, team_id=None):
+        """Rows ranked by `stat` (best first); qualified=False ranks every player with games."""
+        pos = self._order.get((stat, qualified), np.array([], dtype=int))
+        if team_id is not None:
+            pos = pos[np.isin(pos, self._teams.get(int(team_id), []))]
+        return self.frame.iloc[pos[:n]] if n else self.frame.iloc[pos]
+
+    def player(self, player_id):
+        """A player's row (values, ranks, percentiles) as a dict, or None."""
+        if player_id not in self._players.index:
+            return None
+        return self.frame.iloc[int(self._players[player_id])].to_dict()
+
+    def teams(self):
+        """(TEAM_ID, TEAM_ABBREVIATION) pairs present in the season, sorted by abbreviation."""
+        t = self.frame[["TEAM_ID", "TEAM_ABBREVIATION"]].drop_duplicates().sort_values("TEAM_ABBREVIATION")
+        return list(t.itertuples(index=False, name=None))
+
+
+_LEADERBOARDS = {}
+
+def league_leaderboard(season, refresh=False, season_type="Regular Season"):
+    """
+    Leaderboard for a season. The ranked table is stored next to the season's advanced table
+    as data/cache/league_leaders_{season}.csv (one file per season type) and loaded once per process.
+    """
+    key = (season, season_type)
+    if not refresh and key in _LEADERBOARDS:
+        return _LEADERBOARDS[key]
+    cp = _p(f"league_leaders_{season}{_st_tag(season_type)}.csv")
+    table = None
+    if cp.exists() and not refresh:
+        try: table = _load_csv(cp)
+        except Exception: table = None
+    if table is None:
+        table = _leaderboard_frame(season, refresh=refresh, season_type=season_type)
+        if table.empty:
+            return Leaderboard(table)
+        _save_csv(cp, table)
+    board = Leaderboard(table)
+    _LEADERBOARDS[key] = board
+    return board
@@ -1,15 +1,21 @@
 #from nba_api.stats.static import players
 #from nba_api.stats.endpoints import commonplayerinfo, playerprofilev2
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import json
 import time
-import logging
 import datetime as dt
+import re
+import bisect
+import unicodedata
+from functools import lru_cache
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
 
 from nba_api.stats.static import teams as static_teams, players as static_players
 from nba_api.stats.endpoints import (
-        commonplayerinfo,
+        playerindex,
         playercareerstats,
         commonteamroster,
         teamdashboardbygeneralsplits,
@@ -18,6 +24,7 @@ from nba_api.stats.endpoints import (
         teamyearbyyearstats,
         teamgamelog,
         leaguegamefinder,
+        leaguegamelog,
         shotchartdetail,
 
 )
@@ -35,6 +42,23 @@ def _load_json(path): return json.loads(path.read_text())
 def _save_csv(path, df): df.to_csv(path, index=False)
 def _load_csv(path): return pd.read_csv(path)
 
+# League-wide sweeps with failed fetches are kept in memory, but only for PARTIAL_RETRY_S.
+PARTIAL_RETRY_S = 300
+_RETRY_AT = {}   # (memo name, key) -> time.monotonic() after which a partial result is rebuilt
+
+def _memo_hit(memo, name, key):
+    if key not in memo:
+        return False
+    at = _RETRY_AT.get((name, key))
+    return at is None or time.monotonic() < at
+
+def _memo_put(memo, name, key, value, complete):
+    memo[key] = value
+    if complete:
+        _RETRY_AT.pop((name, key), None)
+    else:
+        _RETRY_AT[(name, key)] = time.monotonic() + PARTIAL_RETRY_S
+
 # -------------------- seasons --------------------
 def _current_season_str():
     today = dt.date.today()
@@ -45,6 +69,20 @@ def recent_seasons(n=10):
     start = int(_current_season_str()[:4])
     return [f"{y}-{(y+1)%100:02d}" for y in range(start, start - n, -1)]
 
+# LeagueDashPlayerStats goes back to 1996-97.
+FIRST_STATS_SEASON = "1996-97"
+
+def seasons_since(first=FIRST_STATS_SEASON):
+    """Every season from `first` to the current one, oldest first."""
+    n = int(_current_season_str()[:4]) - int(first[:4]) + 1
+    return list(reversed(recent_seasons(max(n, 1))))
+
+SEASON_TYPES = ("Regular Season", "Playoffs")
+
+def _st_tag(season_type):
+    """Cache-name suffix for a season type: "" for the regular season (the original file names), else e.g. "_Playoffs"."""
+    return "" if season_type == "Regular Season" else "_" + season_type.replace(" ", "_")
+
 # -------------------- guards --------------------
 # def _require_nba():
 #     if not NBA_OK:
@@ -55,68 +93,520 @@ def recent_seasons(n=10):
 
 # -------------------- teams & players --------------------
 def list_all_teams():
-    #_require_nba()
-    ts = static_teams.get_teams()
-    out = [{
-        "team_id": t["id"],
-        "full_name": t["full_name"],
-        "abbreviation": t.get("abbreviation", ""),
-        "city": t.get("city", ""),
-    } for t in ts]
-    return sorted(out, key=lambda x: x["full_name"])
+    """All teams as read-only records {team_id, full_name, abbreviation, city, nickname}, sorted by name."""
+    return TEAMS.teams
 
 def find_teams_by_name(query):
-    q = query.lower().strip()
-    return [t for t in list_all_teams() if q in t["full_name"].lower()]
-
-def search_players(query):
-    #_require_nba()
-    raw = static_players.find_players_by_full_name(query or "")
-    return [{"player_id": p["id"], "full_name": p["full_name"], "is_active": p.get("is_active", False)} for p in raw]
+    return TEAMS.find(query)
+
+def team_abbreviation(team_id):
+    t = TEAMS.by_id.get(int(team_id))
+    return t["abbreviation"] if t else ""
+
+def list_all_players():
+    """Every player in the static list as {player_id, full_name, is_active}, sorted by name."""
+    return [dict(e) for e in _player_search_index().by_name]
+
+# -------------------- player search index --------------------
+# Letters NFKD doesn't decompose into base + accent
+_FOLD_EXTRA = str.maketrans({"ł": "l", "đ": "d", "ø": "o", "æ": "ae", "œ": "oe", "ß": "ss", "ı": "i"})
+
+def _fold(text):
+    """Lowercase, strip accents and punctuation: 'Nikola Jokić' -> 'nikola jokic', "D'Angelo" -> 'dangelo'."""
+    t = unicodedata.normalize("NFKD", str(text).lower().translate(_FOLD_EXTRA))
+    t = "".join(c for c in t if not unicodedata.combining(c))
+    t = re.sub(r"['.’]", "", t)
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", t).split())
+
+def _trigrams(folded):
+    padded = f"  {folded} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def _player_career_spans(refresh=False):
+    """PLAYER_ID -> seasons played (TO_YEAR - FROM_YEAR + 1) from the player index table; {} if unavailable."""
+    idx = player_index_table(refresh=refresh)
+    if idx.empty:
+        return {}
+    return dict(zip(idx.index, idx["career_years"]))
+
+class TeamRegistry:
+    """
+    Immutable team lookup built once per process from the static team list.
+    Records are read-only mappings; indexes by id, abbreviation, full name and folded name
+    ('la clippers', 'clippers', 'los angeles clippers') are plain dict reads.
+    """
+    def __init__(self, teams):
+        recs = sorted(
+            (MappingProxyType({
+                "team_id": int(t["id"]),
+                "full_name": t["full_name"],
+                "abbreviation": t.get("abbreviation", ""),
+                "city": t.get("city", ""),
+                "nickname": t.get("nickname", ""),
+            }) for t in teams),
+            key=lambda r: r["full_name"],
+        )
+        self.teams = tuple(recs)
+        self.names = tuple(r["full_name"] for r in recs)
+        self.by_id = MappingProxyType({r["team_id"]: r for r in recs})
+        self.by_abbreviation = MappingProxyType({r["abbreviation"].upper(): r for r in recs})
+        self.by_name = MappingProxyType({r["full_name"]: r for r in recs})
+        folded = {}
+        for r in recs:
+            for alias in (r["full_name"], r["nickname"], f"{r['city']} {r['nickname']}", r["abbreviation"]):
+                if alias:
+                    folded.setdefault(_fold(alias), r)
+        self.by_folded = MappingProxyType(folded)
+        self._folded_names = tuple(_fold(n) for n in self.names)
+
+    def get(self, key):
+        """Team record for an id, abbreviation, full name or any folded alias; None if unknown."""
+        if isinstance(key, (int, np.integer)):
+            return self.by_id.get(int(key))
+        key = str(key)
+        return self.by_name.get(key) or self.by_abbreviation.get(key.upper()) or self.by_folded.get(_fold(key))
+
+    def find(self, query):
+        """Teams whose folded full name contains the folded query."""
+        q = _fold(query)
+        return [r for r, f in zip(self.teams, self._folded_names) if q in f]
+
+class PlayerSearchIndex:
+    """
+    In-memory player name index, built once per process.
+    Entries are ranked active first, then by career length. Every name token (and the whole folded name)
+    sits in one sorted array, so a prefix lookup is two bisects; each query token must prefix-match
+    a token of the name. Misspellings fall back to trigram overlap.
+    """
+    def __init__(self, players, spans=None):
+        spans = spans or {}
+        rows = sorted(
+            ((p["id"], p["full_name"], bool(p.get("is_active", False)), int(spans.get(p["id"], 0))) for p in players),
+            key=lambda r: (not r[2], -r[3], r[1]),
+        )
+        # entries in rank order; position == rank
+        self.entries = tuple(
+            MappingProxyType({"player_id": pid, "full_name": name, "is_active": active}) for pid, name, active, _ in rows
+        )
+        self.by_name = tuple(sorted(self.entries, key=lambda e: e["full_name"]))
+        self.by_id = MappingProxyType({e["player_id"]: e for e in self.entries})
+        self.folded = tuple(_fold(e["full_name"]) for e in self.entries)
+
+        pairs = []
+        for i, f in enumerate(self.folded):
+            for tok in set(f.split()) | {f, f.replace(" ", "")}:
+                pairs.append((tok, i))
+        pairs.sort()
+        self._tokens = [t for t, _ in pairs]
+        self._token_rank = [i for _, i in pairs]
+
+        grams = {}
+        for i, f in enumerate(self.folded):
+            for g in _trigrams(f):
+                grams.setdefault(g, []).append(i)
+        self._grams = {g: np.asarray(ix, dtype=np.int32) for g, ix in grams.items()}
+        self._gram_counts = np.array([len(_trigrams(f)) for f in self.folded], dtype=np.int32)
+
+    def _prefix(self, token):
+        lo = bisect.bisect_left(self._tokens, token)
+        hi = bisect.bisect_left(self._tokens, token + "\uffff")
+        return set(self._token_rank[lo:hi])
+
+    def search(self, query, limit=50, min_similarity=0.3):
+        q = _fold(query)
+        if not q:
+            return []
+        hits = None
+        for tok in q.split():
+            found = self._prefix(tok)
+            hits = found if hits is None else hits & found
+            if not hits:
+                break
+        if not hits:
+            hits = self._prefix(q.replace(" ", ""))
+        if hits:
+            # exact full-name / exact token matches first, then rank (active, career length)
+            exact = lambda i: 0 if self.folded[i] == q or q in self.folded[i].split() else 1
+            ranked = sorted(hits, key=lambda i: (exact(i), i))
+            return [self.entries[i] for i in ranked[:limit]]
+
+        # fuzzy: Jaccard similarity of trigram sets
+        qg = _trigrams(q)
+        counts = np.zeros(len(self.entries), dtype=np.int32)
+        for g in qg:
+            ix = self._grams.get(g)
+            if ix is not None:
+                counts[ix] += 1
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sim = counts / (len(qg) + self._gram_counts - counts)
+        cand = np.flatnonzero(sim >= min_similarity)
+        ranked = cand[np.lexsort((cand, -sim[cand]))]
+        return [self.entries[i] for i in ranked[:limit]]
+
+TEAMS = TeamRegistry(static_teams.get_teams())
+
+_PLAYER_INDEX = None
+
+def _player_search_index():
+    global _PLAYER_INDEX
+    if _PLAYER_INDEX is None:
+        _PLAYER_INDEX = PlayerSearchIndex(static_players.get_players(), _player_career_spans())
+    return _PLAYER_INDEX
+
+@lru_cache(maxsize=512)
+def _search_players(query, limit):
+    return tuple(_player_search_index().search(query, limit=limit))
+
+def search_players(query, limit=50):
+    """
+    Accent-insensitive player search: prefix match on every name token ('jokic', 'nik jok', 'lebron'),
+    trigram fuzzy fallback for typos. Ranked active first, then by career length.
+    Returns list of {player_id, full_name, is_active}.
+    """
+    return [dict(e) for e in _search_players((query or "").strip(), limit)]
 
 # -------------------- player cards & stats --------------------
+_PLAYER_TABLES = {}
+
+def player_index_table(season=None, refresh=False):
+    """
+    One row per player (every player ever, as of `season`; default current season) from a single
+    PlayerIndex call, cached as data/cache/player_index_{season}.csv and indexed by player_id.
+    Columns: player_id, full_name, team, team_id, team_abbreviation, position, is_active, from_year, to_year, career_years.
+    """
+    season = season or _current_season_str()
+    if not refresh and season in _PLAYER_TABLES:
+        return _PLAYER_TABLES[season]
+    cp = _p(f"player_index_{season}.csv")
+    raw = None
+    if cp.exists() and not refresh:
+        try: raw = _load_csv(cp)
+        except Exception: raw = None
+    if raw is None:
+        try:
+            raw = playerindex.PlayerIndex(season=season, historical_nullable=1, timeout=30).get_data_frames()[0]
+        except Exception:
+            return pd.DataFrame()
+        if raw.empty:
+            return pd.DataFrame()
+        _save_csv(cp, raw)
+
+    first = raw["PLAYER_FIRST_NAME"].fillna("").astype(str)
+    last = raw["PLAYER_LAST_NAME"].fillna("").astype(str)
+    from_year = pd.to_numeric(raw["FROM_YEAR"], errors="coerce")
+    to_year = pd.to_numeric(raw["TO_YEAR"], errors="coerce")
+    table = pd.DataFrame({
+        "player_id": pd.to_numeric(raw["PERSON_ID"], errors="coerce").fillna(0).astype(int),
+        "full_name": (first + " " + last).str.strip(),
+        "team": raw["TEAM_NAME"].fillna("").astype(str),
+        "team_id": pd.to_numeric(raw["TEAM_ID"], errors="coerce").fillna(0).astype(int),
+        "team_abbreviation": raw["TEAM_ABBREVIATION"].fillna("").astype(str),
+        "position": raw["POSITION"].fillna("").astype(str),
+        "is_active": pd.to_numeric(raw["ROSTER_STATUS"], errors="coerce").fillna(0).astype(int) == 1,
+        "from_year": from_year,
+        "to_year": to_year,
+        "career_years": (to_year - from_year + 1).fillna(0).astype(int),
+    })
+    table = table.drop_duplicates("player_id").set_index("player_id", drop=False)
+    _PLAYER_TABLES[season] = table
+    return table
+
+_CARD_COLS = ["player_id", "full_name", "team", "position"]
+
+def get_player_cards(player_ids, refresh=False):
+    """Cards {player_id, full_name, team, position} for many players from one lookup into the player index table."""
+    ids = [int(p) for p in player_ids]
+    table = player_index_table(refresh=refresh)
+    found = table.reindex(ids)[_CARD_COLS[1:]] if not table.empty else pd.DataFrame(index=ids, columns=_CARD_COLS[1:])
+    cards = []
+    for pid, (name, team, position) in zip(ids, found.itertuples(index=False, name=None)):
+        if pd.isna(name):
+            # not in the index (e.g. signed after it was cached): fall back to the static name list
+            entry = _player_search_index().by_id.get(pid)
+            cards.append({"player_id": pid, "full_name": entry["full_name"] if entry else f"Player {pid}", "team": "", "position": ""})
+        else:
+            cards.append({"player_id": pid, "full_name": name, "team": team, "position": position})
+    return cards
+
 def get_player_card(player_id, refresh=False):
-    #_require_nba()
-    cp = _p(f"player_info_{player_id}.json")
+    """Keyed lookup of one player's card (see get_player_cards)."""
+    return get_player_cards([player_id], refresh=refresh)[0]
+
+# -------------------- multi-frame responses --------------------
+def _frames_from_dict(d):
+    return {k: pd.DataFrame(v) for k, v in d.items() if isinstance(v, list)}
+
+def _endpoint_frames(name, fetch, refresh=False):
+    """
+    Every result set of one endpoint response as {set_name: DataFrame}, cached together as
+    data/cache/{name}.json (the endpoint's normalized dict). Empty dict on failure.
+    """
+    cp = _p(f"{name}.json")
     if cp.exists() and not refresh:
-        try: return _load_json(cp)
+        try: return _frames_from_dict(_load_json(cp))
         except Exception: pass
     try:
-        info = commonplayerinfo.CommonPlayerInfo(player_id=player_id, timeout=25).get_normalized_dict()
-        row = info["CommonPlayerInfo"][0]
-        card = {
-            "player_id": player_id,
-            "full_name": row.get("DISPLAY_FIRST_LAST") or row.get("DISPLAY_LAST_COMMA_FIRST") or f"Player {player_id}",
-            "team": row.get("TEAM_NAME", "") or "",
-            "position": row.get("POSITION", "") or "",
-            "last_updated": int(time.time()),
-        }
-        _save_json(cp, card)
-        return card
+        d = fetch().get_normalized_dict()
     except Exception:
-        return {"player_id": player_id, "full_name": f"Player {player_id}", "team": "", "position": ""}
+        return {}
+    _save_json(cp, d)
+    return _frames_from_dict(d)
+
+def player_career_frames(player_id, refresh=False):
+    """
+    All PlayerCareerStats frames for a player from one request: SeasonTotalsRegularSeason,
+    SeasonTotalsPostSeason, CareerTotalsRegularSeason, CareerTotalsPostSeason, the All-Star /
+    college frames and the season rankings.
+    """
+    return _endpoint_frames(
+        f"player_career_all_{player_id}",
+        lambda: playercareerstats.PlayerCareerStats(player_id=player_id, timeout=30),
+        refresh=refresh,
+    )
+
+def player_career_frame(player_id, frame="SeasonTotalsRegularSeason", refresh=False):
+    return player_career_frames(player_id, refresh=refresh).get(frame, pd.DataFrame())
+
+# season type -> PlayerCareerStats season-by-season frame
+CAREER_SEASON_FRAMES = {
+    "Regular Season": "SeasonTotalsRegularSeason",
+    "Playoffs": "SeasonTotalsPostSeason",
+    "All Star": "SeasonTotalsAllStarSeason",
+}
+
+def player_playoff_seasons(player_id, refresh=False):
+    """Post-season rows per season (same columns as the regular-season career frame)."""
+    return player_career_frame(player_id, "SeasonTotalsPostSeason", refresh=refresh)
+
+def player_career_totals(player_id, refresh=False):
+    """Career totals, one row each for "Regular Season" and "Playoffs" (when the player has any)."""
+    frames = player_career_frames(player_id, refresh=refresh)
+    parts = [
+        frames[k].assign(SEASON_TYPE=label)
+        for k, label in (("CareerTotalsRegularSeason", "Regular Season"), ("CareerTotalsPostSeason", "Playoffs"))
+        if k in frames and not frames[k].empty
+    ]
+    return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
 
 def _career_df(player_id, refresh=False):
+    """
+    Regular-season career rows (PlayerCareerStats column contract).
+    Served from the player's cached response, else an older single-frame cache file, else the
+    league career store when it holds every season of the player's career, else fetched with
+    PlayerCareerStats (all frames are cached). refresh always refetches.
+    """
     #_require_nba()
-    cp = _p(f"player_career_{player_id}.csv")
-    if cp.exists() and not refresh:
-        try: return _load_csv(cp)
-        except Exception: pass
+    if not refresh:
+        if _p(f"player_career_all_{player_id}.json").exists():
+            df = player_career_frame(player_id)
+            if not df.empty:
+                return df
+        cp = _p(f"player_career_{player_id}.csv")
+        if cp.exists():
+            try: return _load_csv(cp)
+            except Exception: pass
+        if _career_store_covers(player_id):
+            rows = career_store_rows(player_id)
+            if not rows.empty:
+                return rows
+    return player_career_frame(player_id, refresh=refresh)
+
+# -------------------- league career store --------------------
+# Same columns as PlayerCareerStats' SeasonTotalsRegularSeason frame
+CAREER_COLS = [
+    "PLAYER_ID", "SEASON_ID", "LEAGUE_ID", "TEAM_ID", "TEAM_ABBREVIATION", "PLAYER_AGE",
+    "GP", "GS", "MIN", "FGM", "FGA", "FG_PCT", "FG3M", "FG3A", "FG3_PCT", "FTM", "FTA", "FT_PCT",
+    "OREB", "DREB", "REB", "AST", "STL", "BLK", "TOV", "PF", "PTS",
+]
+_CAREER_STORE = None
+
+_STINT_SUMS = ["MIN", "FGM", "FGA", "FG3M", "FG3A", "FTM", "FTA", "OREB", "DREB", "REB", "AST", "STL", "BLK", "TOV", "PF", "PTS"]
+
+def _season_stints(season):
+    """
+    Per-team rows (GP and CAREER_COLS sums, FIRST_GAME) for the players who played for more than one
+    team in a season, from one LeagueGameLog (player) call. None on failure.
+    """
     try:
-        df = playercareerstats.PlayerCareerStats(player_id=player_id, timeout=30).get_data_frames()[0]
-        _save_csv(cp, df)
-        return df
+        log = leaguegamelog.LeagueGameLog(
+            season=season, season_type_all_star="Regular Season",
+            player_or_team_abbreviation="P", timeout=60,
+        ).get_data_frames()[0]
     except Exception:
-        return pd.DataFrame()
+        return None
+    if log.empty:
+        return None
+    for c in _STINT_SUMS:
+        log[c] = pd.to_numeric(log[c], errors="coerce").fillna(0.0) if c in log.columns else 0.0
+    g = log.groupby(["PLAYER_ID", "TEAM_ID"], sort=False)
+    stints = g[_STINT_SUMS].sum().join(g.agg(
+        TEAM_ABBREVIATION=("TEAM_ABBREVIATION", "first"), GP=("GAME_ID", "nunique"), FIRST_GAME=("GAME_DATE", "min"),
+    )).reset_index()
+    return stints[stints.duplicated("PLAYER_ID", keep=False)].reset_index(drop=True)
+
+def _season_career_rows(season, refresh=False):
+    """
+    One season of LeagueDashPlayerStats totals mapped onto CAREER_COLS, with PlayerCareerStats' row
+    shape for traded players: one row per team stint (oldest first, from _season_stints) followed by
+    the season total as TOT (TEAM_ID 0). GS isn't reported there. None if either request fails.
+    """
+    p = _league_player_totals(season, refresh=refresh)
+    stints = _season_stints(season)
+    if p.empty or stints is None:
+        return None
+    out = p.rename(columns={"AGE": "PLAYER_AGE"}).assign(SEASON_ID=season, LEAGUE_ID="00")
+    for c in CAREER_COLS:
+        if c not in out.columns:
+            out[c] = np.nan
+    out = out[CAREER_COLS]
+    traded = out["PLAYER_ID"].isin(stints["PLAYER_ID"])
+    if not traded.any():
+        return out
+
+    tot = out[traded].assign(TEAM_ID=0, TEAM_ABBREVIATION="TOT")
+    stints = stints[stints["PLAYER_ID"].isin(tot["PLAYER_ID"])].sort_values(["PLAYER_ID", "FIRST_GAME"], kind="stable")
+    rows = stints.merge(tot[["PLAYER_ID", "PLAYER_AGE"]], on="PLAYER_ID", how="left").assign(SEASON_ID=season, LEAGUE_ID="00")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for pct, made, att in (("FG_PCT", "FGM", "FGA"), ("FG3_PCT", "FG3M", "FG3A"), ("FT_PCT", "FTM", "FTA")):
+            rows[pct] = np.where(rows[att] > 0, (rows[made] / rows[att]).round(3), 0.0)
+    for c in CAREER_COLS:
+        if c not in rows.columns:
+            rows[c] = np.nan
+    parts = [out[~traded].assign(_ORDER=0), rows[CAREER_COLS].assign(_ORDER=0), tot.assign(_ORDER=1)]
+    return (pd.concat(parts, ignore_index=True)
+            .sort_values(["PLAYER_ID", "_ORDER"], kind="stable").drop(columns="_ORDER").reset_index(drop=True))
+
+def _index_career_store(df):
+    # stable: keeps each traded season's stint rows in order, TOT last
+    return df.sort_values(["PLAYER_ID", "SEASON_ID"], kind="stable").set_index(["PLAYER_ID", "SEASON_ID"], drop=False)
+
+def league_career_store():
+    """
+    The long career table (data/cache/league_careers.csv) indexed by (PLAYER_ID, SEASON_ID),
+    or an empty frame if nothing has been ingested yet. Loaded once per process.
+    """
+    global _CAREER_STORE
+    if _CAREER_STORE is None:
+        cp = _p("league_careers.csv")
+        df = pd.DataFrame(columns=CAREER_COLS)
+        if cp.exists():
+            try: df = _load_csv(cp)
+            except Exception: pass
+        _CAREER_STORE = _index_career_store(df)
+    return _CAREER_STORE
 
-def list_seasons_for_player(player_id, refresh=False):
-    df = _career_df(player_id, refresh=refresh)
-    if "SEASON_ID" not in df.columns: return []
-    seasons = sorted(df["SEASON_ID"].dropna().unique().tolist())
-    return seasons
+def ingest_career_store(seasons=None, refresh=False, max_workers=4):
+    """
+    Build / extend the career store from one LeagueDashPlayerStats Totals and one LeagueGameLog call
+    per season (default: every season since 1996-97), fetched in parallel. Completed seasons already
+    in the store are kept as-is; the current season is re-ingested on refresh.
+    Returns the list of seasons added. The app only reads the store; run this once from the repo root:
 
-def player_career_pts_fg(player_id, refresh=False):
-    df = _career_df(player_id, refresh=refresh)
+        python -c "from courtvision.data.nba_client import ingest_career_store; print(ingest_career_store())"
+    """
+    global _CAREER_STORE
+    store = league_career_store()
+    have = set(store["SEASON_ID"].astype(str).unique())
+    current = _current_season_str()
+    wanted = seasons_since() if seasons is None else list(seasons)
+    todo = [s for s in wanted if s not in have or (refresh and s == current)]
+    if not todo:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(todo)))) as ex:
+        parts = dict(zip(todo, ex.map(lambda s: _season_career_rows(s, refresh=refresh), todo)))
+    added = [s for s, part in parts.items() if part is not None and not part.empty]
+    if not added:
+        return []
+    keep = store[~store["SEASON_ID"].isin(added)].reset_index(drop=True)
+    df = pd.concat(([keep] if not keep.empty else []) + [parts[s] for s in added], ignore_index=True)
+    _save_csv(_p("league_careers.csv"), df)
+    _CAREER_STORE = _index_career_store(df)
+    return added
+
+def _career_store_covers(player_id):
+    """
+    True when the career store holds every season from the player's FROM_YEAR to TO_YEAR
+    (player_index_table) -- the store starts at 1996-97, so older careers would be cut short.
+    """
+    store = league_career_store()
+    if store.empty:
+        return False
+    table = player_index_table()
+    if table.empty or int(player_id) not in table.index:
+        return False
+    y0, y1 = table.at[int(player_id), "from_year"], table.at[int(player_id), "to_year"]
+    if pd.isna(y0) or pd.isna(y1):
+        return False
+    have = set(store.index.unique(level="SEASON_ID"))
+    last = min(int(y1), int(_current_season_str()[:4]))
+    return all(f"{y}-{(y+1)%100:02d}" in have for y in range(int(y0), last + 1))
+
+def career_store_rows(player_id):
+    """A player's seasons from the career store (CAREER_COLS, oldest first); empty if not stored."""
+    store = league_career_store()
+    try:
+        return store.loc[[int(player_id)]].reset_index(drop=True)
+    except KeyError:
+        return pd.DataFrame()
+
+class PlayerCareer:
+    """
+    A player's career frame with its SEASON_ID index built once:
+    `seasons` is the sorted season list and rows(season) is a precomputed positional slice.
+    """
+    def __init__(self, frame):
+        self.frame = frame.reset_index(drop=True)
+        self.empty = self.frame.empty or "SEASON_ID" not in self.frame.columns
+        if self.empty:
+            self.index = pd.Index([])
+            self._slices = {}
+        else:
+            self.index = pd.Index(self.frame["SEASON_ID"])
+            self._slices = {s: np.asarray(ix) for s, ix in self.frame.groupby("SEASON_ID", sort=True).indices.items()}
+        self.seasons = tuple(sorted(self._slices))
+
+    def __contains__(self, season):
+        return season in self._slices
+
+    def rows(self, season):
+        """The season's rows (one per team stint, plus TOT for traded players); empty frame if absent."""
+        ix = self._slices.get(season)
+        if ix is None:
+            return self.frame.iloc[0:0]
+        return self.frame.iloc[ix]
+
+_CAREERS = {}
+_CAREERS_MAX = 256
+
+def player_career(player_id, refresh=False, season_type="Regular Season"):
+    """
+    PlayerCareer over the player's season rows for a season type (_career_df for the regular season,
+    the matching PlayerCareerStats frame otherwise), built once per (player, season type) and kept in memory.
+    """
+    key = (int(player_id), season_type)
+    if not refresh and key in _CAREERS:
+        return _CAREERS[key]
+    if season_type == "Regular Season":
+        frame = _career_df(key[0], refresh=refresh)
+    else:
+        frame = player_career_frame(key[0], CAREER_SEASON_FRAMES.get(season_type, season_type), refresh=refresh)
+    career = PlayerCareer(frame)
+    _CAREERS[key] = career
+    while len(_CAREERS) > _CAREERS_MAX:
+        _CAREERS.pop(next(iter(_CAREERS)))
+    return career
+
+def refresh_player_career(player_id):
+    """Refetch the player's PlayerCareerStats response once and drop the careers built from the old one."""
+    player_career_frames(player_id, refresh=True)
+    for key in [k for k in _CAREERS if k[0] == int(player_id)]:
+        del _CAREERS[key]
+
+def list_seasons_for_player(player_id, refresh=False, season_type="Regular Season"):
+    return list(player_career(player_id, refresh=refresh, season_type=season_type).seasons)
+
+def player_career_pts_fg(player_id, refresh=False, season_type="Regular Season"):
+    df = player_career(player_id, refresh=refresh, season_type=season_type).frame
     if df.empty: return pd.DataFrame(columns=["Season","PTS","FG%","GP"])
     # include GP if available so callers can compute per-game values
     cols = [c for c in ["SEASON_ID","PTS","FG_PCT","GP"] if c in df.columns]
@@ -125,10 +615,8 @@ def player_career_pts_fg(player_id, refresh=False):
         df["FG%"] = (df["FG%"].astype(float) * 100).round(1)
     return df.reset_index(drop=True)
 
-def get_player_season_totals(player_id, season_id, refresh=False):
-    df = _career_df(player_id, refresh=refresh)
-    if df.empty or "SEASON_ID" not in df.columns: return pd.DataFrame()
-    row = df[df["SEASON_ID"] == season_id]
+def get_player_season_totals(player_id, season_id, refresh=False, season_type="Regular Season"):
+    row = player_career(player_id, refresh=refresh, season_type=season_type).rows(season_id)
     if row.empty: return pd.DataFrame()
     keep = [c for c in [
         "SEASON_ID","TEAM_ABBREVIATION","GP","GS","MIN","PTS","REB","AST","STL","BLK","FG_PCT","FG3_PCT","FT_PCT","TOV","PLUS_MINUS"
@@ -148,327 +636,344 @@ def get_player_season_totals(player_id, season_id, refresh=False):
     return row.reset_index(drop=True)
 
 # -------------------- team: roster & dashboards --------------------
-def get_team_roster(team_id, season, refresh=False):
-    #_require_nba()
-    cp = _p(f"team_roster_{team_id}_{season}.csv")
+_ROSTERS = {}
+
+def league_rosters(season, refresh=False, max_workers=4):
+    """
+    Every team's CommonTeamRoster for a season, fetched in one bounded parallel sweep and
+    stored as one dataset (data/cache/league_rosters_{season}.csv), indexed by TEAM_ID.
+    A sweep with failed teams is not written to disk and is only kept in memory for PARTIAL_RETRY_S.
+    """
+    if not refresh and _memo_hit(_ROSTERS, "rosters", season):
+        return _ROSTERS[season]
+    cp = _p(f"league_rosters_{season}.csv")
+    df, complete = None, True
     if cp.exists() and not refresh:
-        try: return _load_csv(cp)
-        except Exception: pass
-    try:
-        res = commonteamroster.CommonTeamRoster(team_id=team_id, season=season, timeout=30).get_data_frames()[0]
-        _save_csv(cp, res)
-        return res
-    except Exception:
+        try: df = _load_csv(cp)
+        except Exception: df = None
+    if df is None:
+        def _one(team_id):
+            try:
+                r = commonteamroster.CommonTeamRoster(team_id=team_id, season=season, timeout=30).get_data_frames()[0]
+                return r.assign(TeamID=team_id)
+            except Exception:
+                return None
+        # retrying a partial sweep only fetches the teams it is missing
+        have = _ROSTERS.get(season) if not refresh else None
+        kept = [have.reset_index(drop=True)] if have is not None else []
+        todo = [t for t in TEAMS.by_id if have is None or t not in have.index]
+        with ThreadPoolExecutor(max_workers=max_workers) as ex:
+            parts = list(ex.map(_one, todo))
+        ok = kept + [r for r in parts if r is not None]
+        if not ok:
+            return pd.DataFrame()
+        df = pd.concat(ok, ignore_index=True)
+        complete = all(r is not None for r in parts)
+        if complete:
+            _save_csv(cp, df)
+    df = df.set_index(pd.to_numeric(df["TeamID"], errors="coerce").fillna(0).astype(int).rename("TEAM_ID")).sort_index(kind="stable")
+    _memo_put(_ROSTERS, "rosters", season, df, complete)
+    return df
+
+def get_team_roster(team_id, season, refresh=False):
+    rosters = league_rosters(season, refresh=refresh)
+    if rosters.empty or team_id not in rosters.index:
         return pd.DataFrame()
+    return rosters.loc[[team_id]].reset_index(drop=True)
 
 def team_players_for_dropdown(team_id, season, refresh=False):
     roster = get_team_roster(team_id, season, refresh=refresh)
-    out = []
     pid_col = "PLAYER_ID" if "PLAYER_ID" in roster.columns else ("PERSON_ID" if "PERSON_ID" in roster.columns else None)
     name_col = "PLAYER" if "PLAYER" in roster.columns else ("PLAYER_NAME" if "PLAYER_NAME" in roster.columns else None)
-    if pid_col and name_col:
-        for _, r in roster.iterrows():
-            out.append({"player_id": int(r[pid_col]), "full_name": str(r[name_col])})
-    return out
+    if not (pid_col and name_col):
+        return []
+    ids = pd.to_numeric(roster[pid_col], errors="coerce").dropna().astype(int)
+    names = roster.loc[ids.index, name_col].astype(str)
+    return [{"player_id": i, "full_name": n} for i, n in zip(ids.tolist(), names.tolist())]
+
+TEAM_SPLITS = {
+    "Overall": "OverallTeamDashboard",
+    "Location": "LocationTeamDashboard",
+    "Wins/Losses": "WinsLossesTeamDashboard",
+    "Month": "MonthTeamDashboard",
+    "All-Star Break": "PrePostAllStarTeamDashboard",
+    "Days Rest": "DaysRestTeamDashboard",
+}
+
+def team_dashboard_frames(team_id, season, refresh=False, season_type="Regular Season"):
+    """All TeamDashboardByGeneralSplits frames (per game) from one request."""
+    return _endpoint_frames(
+        f"team_dashboard_{team_id}_{season}{_st_tag(season_type)}",
+        lambda: teamdashboardbygeneralsplits.TeamDashboardByGeneralSplits(
+            team_id=team_id,
+            season=season,
+            season_type_all_star=season_type,
+            per_mode_detailed="PerGame",
+            timeout=30,
+        ),
+        refresh=refresh,
+    )
+
+def get_team_splits(team_id, season, split="Location", refresh=False, season_type="Regular Season"):
+    """One split of the team dashboard (see TEAM_SPLITS), one row per GROUP_VALUE."""
+    frames = team_dashboard_frames(team_id, season, refresh=refresh, season_type=season_type)
+    return frames.get(TEAM_SPLITS.get(split, split), pd.DataFrame())
 
-def get_team_basic_stats(team_id, season, refresh=False):
+def get_team_basic_stats(team_id, season, refresh=False, season_type="Regular Season"):
     cp = _p(f"team_basic_{team_id}_{season}.csv")
-    if cp.exists() and not refresh:
+    if (season_type == "Regular Season" and cp.exists() and not refresh
+            and not _p(f"team_dashboard_{team_id}_{season}.json").exists()):
         try:
             return _load_csv(cp)
         except Exception:
             pass
 
-    try:
-        dash = teamdashboardbygeneralsplits.TeamDashboardByGeneralSplits(
-            team_id=team_id,
-            season=season,
-            season_type_all_star="Regular Season",     # ensure REGULAR SEASON
-            per_mode_detailed="PerGame",               # per-game not required, but fine
-            timeout=30
-        ).get_normalized_dict()
-
-        # Prefer the 'OverallTeamDashboard' key explicitly
-        df = pd.DataFrame()
-        if isinstance(dash, dict):
-            if "OverallTeamDashboard" in dash and isinstance(dash["OverallTeamDashboard"], list):
-                df = pd.DataFrame(dash["OverallTeamDashboard"])
-
-        # Fallback (rare): search by name containing "Overall"
-        if df.empty:
-            for k, v in dash.items():
-                if "overall" in str(k).lower() and isinstance(v, list):
-                    try:
-                        cand = pd.DataFrame(v)
-                        if not cand.empty:
-                            df = cand
-                            break
-                    except Exception:
-                        pass
-
-        # Final fallback: first list-like
-        if df.empty:
-            for v in dash.values():
-                if isinstance(v, list):
-                    try:
-                        cand = pd.DataFrame(v)
-                        if not cand.empty:
-                            df = cand
-                            break
-                    except Exception:
-                        pass
-
-        if not df.empty:
-            _save_csv(cp, df)
-        return df
-
-    except Exception:
-        return pd.DataFrame()
+    frames = team_dashboard_frames(team_id, season, refresh=refresh, season_type=season_type)
+    df = frames.get("OverallTeamDashboard", pd.DataFrame())
+    # Fallback (rare): any "Overall" frame, then the first non-empty one
+    if df.empty:
+        cands = sorted(frames.items(), key=lambda kv: "overall" not in kv[0].lower())
+        df = next((v for _, v in cands if not v.empty), pd.DataFrame())
+    return df
     
-def get_team_adv_summary(team_id, season, refresh=False):
+def _team_row(df, team_id):
+    """A team's row(s) of a league-wide team table, index reset; empty frame if absent."""
+    if df.empty or "TEAM_ID" not in df.columns:
+        return pd.DataFrame()
+    return df[df["TEAM_ID"] == team_id].reset_index(drop=True)
+
+def get_team_adv_summary(team_id, season, refresh=False, season_type="Regular Season"):
     """
-    Season-to-date REGULAR SEASON summary for one team.
+    Season-to-date summary for one team, read from the league-wide advanced team table.
     Returns a 1-row DataFrame with W, L, W_PCT, OFF_RATING, DEF_RATING, NET_RATING (and more).
     """
-    cp = _p(f"team_adv_{team_id}_{season}.csv")
+    return _team_row(_league_advanced(season, refresh=refresh, season_type=season_type), team_id)
+
+def _season_key_to_start_year(season_str):
+    # "2018-19" -> 2018
+    return int(str(season_str)[:4])
+
+def _team_record_from_gamelog(team_id, season, refresh=False, season_type="Regular Season"):
+    """W/L counted from the team's game log (used for season types TeamYearByYearStats doesn't break out)."""
+    log = _team_gamelog(team_id, season, refresh=refresh, season_type=season_type)
+    if log.empty or "WL" not in log.columns:
+        return pd.DataFrame()
+    W = int((log["WL"] == "W").sum()); L = int((log["WL"] == "L").sum())
+    return pd.DataFrame([{"SEASON_ID": season, "W": W, "L": L, "W_PCT": W / (W + L) if W + L else 0.0}])
+
+def _team_yby(team_id, refresh=False):
+    """The franchise's full TeamYearByYearStats frame (cached as data/cache/team_yby_{id}.csv); empty on failure."""
+    cp = _p(f"team_yby_{team_id}.csv")
     if cp.exists() and not refresh:
         try:
             return _load_csv(cp)
         except Exception:
             pass
-
     try:
-        df_all = leaguedashteamstats.LeagueDashTeamStats(
-            season=season,
-            season_type_all_star="Regular Season",
-            measure_type_detailed_defense="Advanced",  # <-- gives Off/Def/Net Rating
-            per_mode_detailed="PerGame",               # OK for counts; ratings are unaffected
-            timeout=35
-        ).get_data_frames()[0]
-
-        # Filter for just this team
-        row = df_all[df_all["TEAM_ID"] == team_id].copy()
-        if row.empty:
-            # Very rare: fall back to name match
-            # (Use your static teams list to find the official name/abbrev if desired)
-            return pd.DataFrame()
-
-        # Cache the single-row frame
-        _save_csv(cp, row)
-        return row.reset_index(drop=True)
-
+        df = teamyearbyyearstats.TeamYearByYearStats(team_id=team_id, timeout=35).get_data_frames()[0]
+        _save_csv(cp, df)
+        return df
     except Exception:
         return pd.DataFrame()
 
-def _season_key_to_start_year(season_str):
-    # "2018-19" -> 2018
-    return int(str(season_str)[:4])
+_HISTORIES = {}
 
-def get_team_record_from_yearbyyear(team_id, season, refresh=False):
+def team_history(team_id, refresh=False):
+    """
+    The franchise's year-by-year history, parsed once per team and kept in memory,
+    indexed by season start year (YEAR_START) and sorted oldest first.
+    Adds SEASON ("2018-19"), W / L / W_PCT (renamed from WINS / LOSSES / WIN_PCT), PPG and
+    box-score estimates POSS_PG (possessions per game) and ORTG_EST (points per 100 possessions);
+    the estimates are NaN for early seasons without offensive rebounds / turnovers.
+    """
+    key = int(team_id)
+    if not refresh and key in _HISTORIES:
+        return _HISTORIES[key]
+    df = _team_yby(key, refresh=refresh)
+    if df.empty:
+        return df
+    label = df["YEAR"] if "YEAR" in df.columns else df.get("SEASON_ID", pd.Series("", index=df.index))
+    start = pd.to_numeric(label.astype(str).str[:4], errors="coerce")
+    h = df.rename(columns={"WINS": "W", "LOSSES": "L", "WIN_PCT": "W_PCT"})[start.notna()].copy()
+    h["YEAR_START"] = start[start.notna()].astype(int)
+    h["SEASON"] = [f"{y}-{(y + 1) % 100:02d}" for y in h["YEAR_START"]]
+
+    def col(c):
+        return pd.to_numeric(h[c], errors="coerce") if c in h.columns else pd.Series(np.nan, index=h.index)
+    gp = col("GP").where(col("GP") > 0)
+    poss = col("FGA") - col("OREB") + col("TOV") + 0.44 * col("FTA")
+    h["PPG"] = col("PTS") / gp
+    h["POSS_PG"] = poss / gp
+    h["ORTG_EST"] = 100.0 * col("PTS") / poss.where(poss > 0)
+
+    h = h.drop_duplicates("YEAR_START", keep="last").set_index("YEAR_START", drop=False).sort_index()
+    _HISTORIES[key] = h
+    return h
+
+def franchise_decades(team_id, refresh=False):
+    """
+    Franchise history rolled up by decade: seasons, W, L, W_PCT, playoff appearances, titles,
+    average PPG / POSS_PG / ORTG_EST. Served from team_history (no extra fetch).
+    """
+    h = team_history(team_id, refresh=refresh)
+    if h.empty:
+        return pd.DataFrame()
+    po = sum((pd.to_numeric(h[c], errors="coerce").fillna(0) for c in ("PO_WINS", "PO_LOSSES") if c in h.columns),
+             pd.Series(0, index=h.index))
+    finals = h.get("NBA_FINALS_APPEARANCE", pd.Series("", index=h.index)).astype(str).str.upper()
+    g = h.assign(
+        DECADE=(h["YEAR_START"] // 10) * 10,
+        PLAYOFFS=(po > 0).astype(int),
+        TITLES=finals.str.contains("CHAMPION").astype(int),
+    ).groupby("DECADE")
+    out = g.agg(
+        SEASONS=("SEASON", "size"), W=("W", "sum"), L=("L", "sum"),
+        PLAYOFFS=("PLAYOFFS", "sum"), TITLES=("TITLES", "sum"),
+        PPG=("PPG", "mean"), POSS_PG=("POSS_PG", "mean"), ORTG_EST=("ORTG_EST", "mean"),
+    )
+    out["W_PCT"] = out["W"] / (out["W"] + out["L"]).where(lambda x: x > 0)
+    return out.reset_index()
+
+def get_team_record_from_yearbyyear(team_id, season, refresh=False, season_type="Regular Season"):
     """
     Reliable historical record. Returns DataFrame with columns:
-    ['SEASON_ID','W','L','W_PCT'] for the requested season.
+    ['SEASON_ID','W','L','W_PCT'] for the requested season (a keyed read of team_history).
+    Year-by-year rows are regular-season records; other season types are counted from the game log.
     """
+    if season_type != "Regular Season":
+        return _team_record_from_gamelog(team_id, season, refresh=refresh, season_type=season_type)
     year = _season_key_to_start_year(season)
-    cp = _p(f"team_yby_{team_id}.csv")
-    if cp.exists() and not refresh:
-        try:
-            df_all = _load_csv(cp)
-        except Exception:
-            df_all = None
-    else:
-        df_all = None
-
-    if df_all is None:
-        try:
-            df_all = teamyearbyyearstats.TeamYearByYearStats(team_id=team_id, timeout=35).get_data_frames()[0]
-            _save_csv(cp, df_all)
-        except Exception:
-            return pd.DataFrame()
-
-    # Normalize season label to start year for matching
-    # TeamYearByYearStats typically has 'YEAR' like '2018-19' or numeric start year; capture both
-    if "YEAR" in df_all.columns:
-        # Keep both YEAR (e.g., '2018-19') and a derived YEAR_START (2018)
-        tmp = df_all.copy()
-        # Some seasons are like '2018-19', some are '2018'; handle robustly
-        def _start(x):
-            s = str(x)
-            try:
-                return int(s[:4])
-            except Exception:
-                return None
-        tmp["YEAR_START"] = tmp["YEAR"].apply(_start)
-    else:
-        # older schema fallback
-        tmp = df_all.copy()
-        tmp["YEAR_START"] = tmp["SEASON_ID"].apply(lambda x: int(str(x)[:4])) if "SEASON_ID" in tmp.columns else None
-
-    row = tmp[tmp["YEAR_START"] == year]
-    if row.empty:
+    h = team_history(team_id, refresh=refresh)
+    if h.empty or year not in h.index:
         return pd.DataFrame()
-
-    # standardize columns
-    out = pd.DataFrame([{
+    row = h.loc[year]
+    return pd.DataFrame([{
         "SEASON_ID": season,
-        "W": int(row.iloc[0]["WINS"] if "WINS" in row.columns else row.iloc[0].get("W", 0)),
-        "L": int(row.iloc[0]["LOSSES"] if "LOSSES" in row.columns else row.iloc[0].get("L", 0)),
-        "W_PCT": float(row.iloc[0]["WIN_PCT"] if "WIN_PCT" in row.columns else row.iloc[0].get("W_PCT", 0.0)),
+        "W": int(row.get("W", 0)),
+        "L": int(row.get("L", 0)),
+        "W_PCT": float(row.get("W_PCT", 0.0)),
     }])
-    return out
 
 
-def get_team_ratings_from_advanced(team_id, season, refresh=False):
+def get_team_ratings_from_advanced(team_id, season, refresh=False, season_type="Regular Season"):
     """
     Season aggregate advanced ratings. Returns 1-row DF with:
     ['OFF_RATING','DEF_RATING','NET_RATING'] (or E_* variants).
     """
-    cp = _p(f"team_adv_{team_id}_{season}.csv")
-    if cp.exists() and not refresh:
-        try:
-            return _load_csv(cp)
-        except Exception:
-            pass
-    try:
-        df_all = leaguedashteamstats.LeagueDashTeamStats(
-            season=season,
-            season_type_all_star="Regular Season",
-            measure_type_detailed_defense="Advanced",
-            per_mode_detailed="PerGame",
-            timeout=35
-        ).get_data_frames()[0]
-
-        row = df_all[df_all["TEAM_ID"] == team_id].copy()
-        if row.empty:
-            return pd.DataFrame()
-
-        _save_csv(cp, row)
-        return row.reset_index(drop=True)
-    except Exception:
-        return pd.DataFrame()
+    return _team_row(_league_advanced(season, refresh=refresh, season_type=season_type), team_id)
 
 
-def get_team_record_and_ratings(team_id, season, refresh=False):
+def get_team_record_and_ratings(team_id, season, refresh=False, season_type="Regular Season"):
     """
-    Single source of truth for Team page KPIs.
-    Merges:
-      - Record from TeamYearByYearStats (reliable historically)
-      - Off/Def/Net from LeagueDashTeamStats Advanced
-    Returns 1-row DF with W, L, W_PCT, OFF_RATING, DEF_RATING, NET_RATING.
+    Single source of truth for Team page KPIs: the team's row of league_team_summary
+    (record from TeamYearByYearStats, Off/Def/Net and pace from LeagueDashTeamStats Advanced, league ranks).
+    Returns 1-row DF with W, L, W_PCT, OFF_RATING, DEF_RATING, NET_RATING (and more).
     """
-    rec = get_team_record_from_yearbyyear(team_id, season, refresh=refresh)
-    adv = get_team_ratings_from_advanced(team_id, season, refresh=refresh)
-
-    # Prepare ratings with alias handling
-    OFF = DEF = NET = None
-    if not adv.empty:
-        def _g(df, *names):
-            for n in names:
-                if n in df.columns:
-                    return float(df[n].iloc[0])
-            return None
-        OFF = _g(adv, "OFF_RATING", "E_OFF_RATING")
-        DEF = _g(adv, "DEF_RATING", "E_DEF_RATING")
-        NET = _g(adv, "NET_RATING", "E_NET_RATING")
-        if NET is None and OFF is not None and DEF is not None:
-            NET = OFF - DEF
-
-    # If record missing, return just ratings (or empty)
-    if rec.empty:
-        if OFF is None and DEF is None and NET is None:
-            return pd.DataFrame()
-        return pd.DataFrame([{
-            "SEASON_ID": season, "W": None, "L": None, "W_PCT": None,
-            "OFF_RATING": OFF or 0.0, "DEF_RATING": DEF or 0.0, "NET_RATING": NET or 0.0
-        }])
-
-    # Merge into one row
-    out = rec.copy()
+    row = get_team_summary(team_id, season, refresh=refresh, season_type=season_type)
+    if row is None:
+        return pd.DataFrame()
+    out = {k: (None if pd.isna(v) else v) for k, v in row.items()}
+    OFF, DEF = out.get("OFF_RATING"), out.get("DEF_RATING")
+    if out.get("NET_RATING") is None:
+        out["NET_RATING"] = OFF - DEF if (OFF is not None and DEF is not None) else 0.0
     out["OFF_RATING"] = OFF or 0.0
     out["DEF_RATING"] = DEF or 0.0
-    out["NET_RATING"] = NET or (OFF - DEF if (OFF is not None and DEF is not None) else 0.0)
-    return out.reset_index(drop=True)
-
-    # #_require_nba()
-    # cp = _p(f"team_basic_{team_id}_{season}.csv")
-    # if cp.exists() and not refresh:
-    #     try: return _load_csv(cp)
-    #     except Exception: pass
-    # try:
-    #     dash = teamdashboardbygeneralsplits.TeamDashboardByGeneralSplits(
-    #         team_id=team_id, season=season, timeout=30
-    #     ).get_normalized_dict()
-    #     frames = []
-    #     for k, v in dash.items():
-    #         if isinstance(v, list):
-    #             try:
-    #                 frames.append(pd.DataFrame(v))
-    #             except Exception:
-    #                 pass
-
-    #     # Prefer the frame that contains season-level W/L (overall team totals)
-    #     df = pd.DataFrame()
-    #     for f in frames:
-    #         if not f.empty and ("W" in f.columns or "W_PCT" in f.columns) and ("L" in f.columns):
-    #             df = f
-    #             break
-    #     # fallback to first frame if we couldn't find the season-level one
-    #     if df.empty and frames:
-    #         df = frames[0]
-    #     if not df.empty:
-    #         _save_csv(cp, df)
-    #     return df
-    # except Exception:
-    #     return pd.DataFrame()
-
-def get_team_players_season_stats(team_id, season, refresh=False):
+    out["SEASON_ID"] = season
+    return pd.DataFrame([out])
+
+def get_team_players_season_stats(team_id, season, refresh=False, season_type="Regular Season"):
     #_require_nba()
-    cp = _p(f"team_playerstats_{team_id}_{season}.csv")
+    cp = _p(f"team_playerstats_{team_id}_{season}{_st_tag(season_type)}.csv")
     if cp.exists() and not refresh:
         try: return _load_csv(cp)
         except Exception: pass
     try:
         df = leaguedashplayerstats.LeagueDashPlayerStats(
-            season=season, team_id_nullable=team_id, per_mode_detailed="PerGame", timeout=35
+            season=season, team_id_nullable=team_id, season_type_all_star=season_type,
+            per_mode_detailed="PerGame", timeout=35
         ).get_data_frames()[0]
         _save_csv(cp, df)
         return df
     except Exception:
         return pd.DataFrame()
-    
 
-def get_player_season_row(player_id, season, refresh=False):
+TEAM_PLAYER_VIEW_COLS = ["Name", "GP", "MIN", "PTS", "REB", "AST", "STL", "BLK", "3P%", "FT%", "AST/TO"]
+TEAM_LEADER_STATS = {"PTS": "Points", "REB": "Rebounds", "AST": "Assists"}
+_TEAM_PLAYER_VIEWS = {}
+_TEAM_PLAYER_VIEWS_MAX = 64
+
+def team_player_stats_view(team_id, season, refresh=False, season_type="Regular Season"):
+    """
+    Display table for the Team Stats page, built once per (team, season, season type) and kept in memory.
+    Returns (table, leaders): table has the present TEAM_PLAYER_VIEW_COLS (per game, 3P% / FT% on a 0-100
+    scale, AST/TO), sorted by PTS; leaders maps each TEAM_LEADER_STATS column to (name, value).
+    Both are empty when the team's player stats can't be loaded.
+    """
+    key = (int(team_id), season, season_type)
+    if not refresh and key in _TEAM_PLAYER_VIEWS:
+        return _TEAM_PLAYER_VIEWS[key]
+    pstats = get_team_players_season_stats(team_id, season, refresh=refresh, season_type=season_type)
+    if pstats.empty:
+        return pd.DataFrame(), {}
+
+    table = pd.DataFrame(index=pstats.index)
+    table["Name"] = pstats["PLAYER_NAME"] if "PLAYER_NAME" in pstats.columns else ""
+    for c in ["GP", "MIN", "PTS", "REB", "AST", "STL", "BLK"]:
+        if c in pstats.columns:
+            table[c] = pd.to_numeric(pstats[c], errors="coerce")
+    for c, label in (("FG3_PCT", "3P%"), ("FT_PCT", "FT%")):
+        if c in pstats.columns:
+            table[label] = (pd.to_numeric(pstats[c], errors="coerce") * 100).round(1)
+    if "AST" in pstats.columns and "TOV" in pstats.columns:
+        AST, TOV = _num(pstats, "AST"), _num(pstats, "TOV")
+        with np.errstate(divide="ignore", invalid="ignore"):
+            table["AST/TO"] = np.round(np.where(TOV != 0, AST / TOV, np.nan), 2)
+    if "PTS" in table.columns:
+        table = table.sort_values("PTS", ascending=False, kind="stable")
+    table = table.reset_index(drop=True)
+
+    # Leaders in one idxmax pass over the stat columns
+    stats = table[[c for c in TEAM_LEADER_STATS if c in table.columns]].dropna(axis=1, how="all")
+    leaders = {c: (table.at[i, "Name"], float(stats.at[i, c])) for c, i in stats.idxmax().items()} if len(stats) else {}
+
+    view = (table, leaders)
+    _TEAM_PLAYER_VIEWS[key] = view
+    while len(_TEAM_PLAYER_VIEWS) > _TEAM_PLAYER_VIEWS_MAX:
+        _TEAM_PLAYER_VIEWS.pop(next(iter(_TEAM_PLAYER_VIEWS)))
+    return view
+
+
+def get_player_season_row(player_id, season, refresh=False, season_type="Regular Season"):
     """Return 1-row DF of a player's season totals (min, FGA, FTA, TOV, PTS, etc.)."""
-    df = _career_df(player_id, refresh=refresh)
-    if df.empty or "SEASON_ID" not in df.columns:
+    career = player_career(player_id, refresh=refresh, season_type=season_type)
+    if career.empty:
         return pd.DataFrame()
-    row = df[df["SEASON_ID"] == season]
-    return row.reset_index(drop=True)
+    return career.rows(season).reset_index(drop=True)
 
-def get_team_season_base_totals(team_id, season, refresh=False):
+def get_team_season_base_totals(team_id, season, refresh=False, season_type="Regular Season"):
     """
-    Team season totals we need for Usage Rate denominator.
-    Pull from LeagueDashTeamStats (Base) for the whole REGULAR SEASON.
+    Team season totals we need for Usage Rate denominator,
+    read from the league-wide LeagueDashTeamStats (Base, Totals) table.
     """
-    cp = _p(f"team_base_totals_{team_id}_{season}.csv")
-    if cp.exists() and not refresh:
-        try: return _load_csv(cp)
-        except Exception: pass
-    try:
-        df = leaguedashteamstats.LeagueDashTeamStats(
-            season=season,
-            season_type_all_star="Regular Season",
-            measure_type_detailed_defense="Base",
-            per_mode_detailed="Totals",   # IMPORTANT: totals, not per-game
-            timeout=35
-        ).get_data_frames()[0]
-        row = df[df["TEAM_ID"] == team_id].copy()
-        if not row.empty:
-            _save_csv(cp, row)
-            return row.reset_index(drop=True)
-    except Exception:
-        pass
-    return pd.DataFrame()
+    return _team_row(_league_team_base(season, refresh=refresh, season_type=season_type), team_id)
+
+def _usage_rate(MP, FGA, FTA, TOV, TFGA, TFTA, TTOV, TGP):
+    """Array form of USG% (see compute_usage_rate); NaN where the denominator is not positive."""
+    # Team minutes = 48 * games * 5 (NBA regulation minutes). 'GP' is games played.
+    TMIN = 48.0 * TGP * 5.0
+    denom = MP * (TFGA + 0.44 * TFTA + TTOV)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denom > 0, 100.0 * ((FGA + 0.44 * FTA + TOV) * (TMIN / 5.0)) / denom, np.nan)
+
+def _true_shooting(PTS, FGA, FTA):
+    """Array form of TS% (see compute_true_shooting_pct); NaN where there are no attempts."""
+    denom = 2.0 * (FGA + 0.44 * FTA)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denom > 0, 100.0 * (PTS / denom), np.nan)
+
+def _scalar(arr):
+    v = float(arr[0])
+    return None if np.isnan(v) else v
 
 def compute_usage_rate(player_row, team_row):
     """
@@ -477,229 +982,333 @@ def compute_usage_rate(player_row, team_row):
     Returns float or None.
     """
     if player_row.empty or team_row.empty: return None
-    pr = player_row.iloc[0]; tr = team_row.iloc[0]
-
-    # Player stats
-    MP  = float(pr.get("MIN", 0) or 0)
-    FGA = float(pr.get("FGA", 0) or 0)
-    FTA = float(pr.get("FTA", 0) or 0)
-    TOV = float(pr.get("TOV", 0) or 0)
-
-    # Team totals
-    TFGA = float(tr.get("FGA", 0) or 0)
-    TFTA = float(tr.get("FTA", 0) or 0)
-    TTOV = float(tr.get("TOV", 0) or 0)
-    # Team minutes = 48 * games * 5 (NBA regulation minutes). 'GP' is games played.
-    TGP  = float(tr.get("GP", 0) or 0)
-    TMIN = 48.0 * TGP * 5.0
-
-    denom = MP * (TFGA + 0.44 * TFTA + TTOV)
-    if denom <= 0: return None
-    return 100.0 * ((FGA + 0.44 * FTA + TOV) * (TMIN / 5.0)) / denom
+    pr = player_row.iloc[[0]]; tr = team_row.iloc[[0]]
+    return _scalar(_usage_rate(
+        _num(pr, "MIN"), _num(pr, "FGA"), _num(pr, "FTA"), _num(pr, "TOV"),
+        _num(tr, "FGA"), _num(tr, "FTA"), _num(tr, "TOV"), _num(tr, "GP"),
+    ))
 
 def compute_true_shooting_pct(player_row):
     """TS% = PTS / (2*(FGA + 0.44*FTA))"""
     if player_row.empty: return None
-    pr = player_row.iloc[0]
-    PTS = float(pr.get("PTS", 0) or 0)
-    FGA = float(pr.get("FGA", 0) or 0)
-    FTA = float(pr.get("FTA", 0) or 0)
-    denom = 2.0 * (FGA + 0.44 * FTA)
-    if denom <= 0: return None
-    return 100.0 * (PTS / denom)
+    pr = player_row.iloc[[0]]
+    return _scalar(_true_shooting(_num(pr, "PTS"), _num(pr, "FGA"), _num(pr, "FTA")))
 
-def compute_player_PER(player_row, team_row, season, refresh=False):
+def compute_player_PER(player_row, team_row, season, refresh=False, season_type="Regular Season"):
     """
     Hollinger PER based on Basketball-Reference formula:
       1) Compute uPER with team & league constants,
       2) Adjust for pace (lgPace / tmPace),
       3) Normalize to PER (league avg = 15) using league-average uPER (minutes-weighted).
+    Inputs are single-row DFs for player and team, so a traded player's per-team row is rated against
+    that team (league_advanced_table only holds season totals). Same vectorized path as that table.
     Returns PER (float) or None.
     """
     if player_row.empty or team_row.empty:
         return None
-
-    consts = _league_constants(season, refresh=refresh)
+    consts = _league_constants(season, refresh=refresh, season_type=season_type)
     if consts is None:
         return None
+    pr = player_row.iloc[[0]]; tr = team_row.iloc[[0]]
+    if not _num(pr, "MIN")[0] > 0:
+        return None
+    team_id = int(_num(tr, "TEAM_ID")[0] or _num(pr, "TEAM_ID")[0])
+    uPER, _ = _player_uPER(pr.assign(TEAM_ID=team_id), tr.assign(TEAM_ID=team_id), consts)
+    tmPace = _team_pace(season, refresh=refresh, season_type=season_type).get(team_id)
+    if tmPace is None or not tmPace > 0:
+        return None
+    return float(uPER[0] * (consts["lgPace"] / tmPace) * (15.0 / consts["lguPER"]))
 
-    # Team ratios needed in uPER (tmAST/tmFG)
-    tmFG  = float(team_row.get("FGM", team_row.get("FG", 0)).iloc[0] if "FGM" in team_row.columns or "FG" in team_row.columns else 0.0)
-    tmAST = float(team_row.get("AST", pd.Series([0])).iloc[0] or 0.0)
-
-    # Pull player totals
-    pr = player_row.iloc[0]
-    def g(name, alt=None):
-        for k in [name, alt] if alt else [name]:
-            if k in player_row.columns:
-                try: return float(pr[k] or 0.0)
-                except Exception: return 0.0
-        return 0.0
-
-    MIN = g("MIN")
-    if MIN <= 0: return None
-
-    FG   = g("FGM","FG")
-    FGA  = g("FGA")
-    _3P  = g("FG3M","3PM")
-    FT   = g("FTM","FT")
-    FTA  = g("FTA")
-    AST  = g("AST")
-    ORB  = g("OREB","OREB_TOT")
-    TRB  = g("REB","TRB")
-    STL  = g("STL")
-    BLK  = g("BLK")
-    TOV  = g("TOV","TO")
-    PF   = g("PF")
-    PTS  = g("PTS")
-
-    factor = consts["factor"]; VOP = consts["VOP"]; DRBP = consts["DRBP"]
-    lgFT = consts["lgFT"]; lgFTA = consts["lgFTA"]; lgFG = consts["lgFG"]; lgAST = consts["lgAST"]; lgPF = consts["lgPF"]
+def _league_player_totals(season, refresh=False, season_type="Regular Season"):
+    """League-wide player season totals (LeagueDashPlayerStats, Totals)."""
+    cp = _p(f"league_player_totals_{season}{_st_tag(season_type)}.csv")
+    if cp.exists() and not refresh:
+        try: return _load_csv(cp)
+        except Exception: pass
+    try:
+        df = leaguedashplayerstats.LeagueDashPlayerStats(
+            season=season,
+            season_type_all_star=season_type,
+            per_mode_detailed="Totals",
+            timeout=45
+        ).get_data_frames()[0]
+        if not df.empty:
+            _save_csv(cp, df)
+        return df
+    except Exception:
+        return pd.DataFrame()
 
-    # uPER (BBR/Hollinger form, per minute)
-    # See: Wikipedia "Calculation" section reproducing BBR formula. :contentReference[oaicite:2]{index=2}
+def _league_team_base(season, refresh=False, season_type="Regular Season"):
+    """All teams' season totals (LeagueDashTeamStats, Base, Totals) -- one row per team."""
+    cp = _p(f"league_team_base_{season}{_st_tag(season_type)}.csv")
+    if cp.exists() and not refresh:
+        try: return _load_csv(cp)
+        except Exception: pass
     try:
-        tmAST_over_tmFG = (tmAST / max(tmFG, 1e-9)) if tmFG else 0.0
-        uPER_num = (
-            _3P
-            + (2.0/3.0) * AST
-            + FG * (2.0 - factor * tmAST_over_tmFG)
-            + 0.5 * FT * (2.0 - (1.0/3.0) * tmAST_over_tmFG)
-            - VOP * TOV
-            - VOP * DRBP * (FGA - FG)
-            - VOP * 0.44 * (0.44 + 0.56 * DRBP) * (FTA - FT)
-            + VOP * (1 - DRBP) * (TRB - ORB)
-            + VOP * DRBP * ORB
-            + VOP * STL
-            + VOP * DRBP * BLK
-            - PF * ((lgFT / max(lgPF,1e-9)) - 0.44 * (consts["lgFTA"]/max(lgPF,1e-9)) * VOP)
-        )
-        uPER = (1.0 / MIN) * uPER_num
+        df = leaguedashteamstats.LeagueDashTeamStats(
+            season=season, season_type_all_star=season_type,
+            measure_type_detailed_defense="Base", per_mode_detailed="Totals",
+            timeout=35
+        ).get_data_frames()[0]
+        if not df.empty:
+            _save_csv(cp, df)
+        return df
     except Exception:
-        return None
+        return pd.DataFrame()
 
-    # Pace adjust: PER' = uPER * (lgPace / tmPace)
-    tm_id = int(team_row.get("TEAM_ID", pd.Series([None])).iloc[0] or 0)
-    tmPace = team_pace(tm_id, season, refresh=refresh)
-    lgPace = league_pace(season, refresh=refresh)
-    if not tmPace or not lgPace:
-        return None
-    per_pace = uPER * (lgPace / tmPace)
+def _num(df, *names):
+    """First present column among names as a float array (missing/None -> 0)."""
+    for n in names:
+        if n in df.columns:
+            return pd.to_numeric(df[n], errors="coerce").fillna(0.0).to_numpy(dtype=float)
+    return np.zeros(len(df))
+
+def _uPER_numerator(p, tmAST_over_tmFG, consts):
+    """
+    Hollinger uPER numerator (before dividing by minutes) for every row of a player-totals frame.
+    tmAST_over_tmFG is an array aligned with p.
+    """
+    factor = consts["factor"]; VOP = consts["VOP"]; DRBP = consts["DRBP"]
+    lgFT = consts["lgFT"]; lgFTA = consts["lgFTA"]; lgPF = consts["lgPF"]
+
+    FG   = _num(p, "FGM", "FG")
+    FGA  = _num(p, "FGA")
+    _3P  = _num(p, "FG3M")
+    FT   = _num(p, "FTM")
+    FTA  = _num(p, "FTA")
+    AST  = _num(p, "AST")
+    ORB  = _num(p, "OREB")
+    TRB  = _num(p, "REB")
+    STL  = _num(p, "STL")
+    BLK  = _num(p, "BLK")
+    TOV  = _num(p, "TOV", "TO")
+    PF   = _num(p, "PF")
+
+    return (
+        _3P + (2.0/3.0)*AST
+        + FG * (2.0 - factor * tmAST_over_tmFG)
+        + 0.5 * FT * (2.0 - (1.0/3.0) * tmAST_over_tmFG)
+        - VOP*TOV
+        - VOP*DRBP*(FGA - FG)
+        - VOP*0.44*(0.44 + 0.56*DRBP)*(FTA - FT)
+        + VOP*(1-DRBP)*(TRB - ORB)
+        + VOP*DRBP*ORB
+        + VOP*STL
+        + VOP*DRBP*BLK
+        - PF * ((lgFT/max(lgPF,1e-9)) - 0.44*(lgFTA/max(lgPF,1e-9))*VOP)
+    )
+
+def _player_uPER(p, teams, consts):
+    """(uPER array, TEAM_ID array) for a player-totals frame; tmAST/tmFG merged on TEAM_ID (unknown team -> 0)."""
+    tm = pd.DataFrame({
+        "TEAM_ID": pd.to_numeric(teams["TEAM_ID"], errors="coerce").fillna(0).astype(int) if not teams.empty else [],
+        "_tmFG": _num(teams, "FGM", "FG"),
+        "_tmAST": _num(teams, "AST"),
+    })
+    tid = pd.to_numeric(p["TEAM_ID"], errors="coerce").fillna(0).astype(int) if "TEAM_ID" in p.columns else 0
+    m = pd.DataFrame({"TEAM_ID": tid}).merge(tm.drop_duplicates("TEAM_ID"), on="TEAM_ID", how="left")
+    tmFG = m["_tmFG"].fillna(0.0).to_numpy(dtype=float)
+    tmAST = m["_tmAST"].fillna(0.0).to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(tmFG != 0, tmAST / tmFG, 0.0)
+
+    MIN = _num(p, "MIN")
+    num = _uPER_numerator(p, ratio, consts)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        uPER = np.where(MIN > 0, num / MIN, 0.0)
+    return uPER, m["TEAM_ID"].to_numpy()
+
+def league_player_uPER(season, refresh=False, season_type="Regular Season"):
+    """
+    uPER for every player in the league for a season, computed column-wise.
+    Returns DataFrame [PLAYER_ID, PLAYER_NAME, TEAM_ID, MIN, uPER] (uPER = 0 for players with no minutes).
+    """
+    p = _league_player_totals(season, refresh=refresh, season_type=season_type)
+    if p.empty: return pd.DataFrame()
+    consts = _league_constants(season, refresh=refresh, season_type=season_type)
+    if consts is None: return pd.DataFrame()
+
+    uPER, team_ids = _player_uPER(p, _league_team_base(season, refresh=refresh, season_type=season_type), consts)
+    return pd.DataFrame({
+        "PLAYER_ID": p["PLAYER_ID"].to_numpy() if "PLAYER_ID" in p.columns else np.arange(len(p)),
+        "PLAYER_NAME": p["PLAYER_NAME"].to_numpy() if "PLAYER_NAME" in p.columns else "",
+        "TEAM_ID": team_ids,
+        "MIN": _num(p, "MIN"),
+        "uPER": uPER,
+    })
+
+def league_average_uPER(season, refresh=False, season_type="Regular Season"):
+    """
+    League-average uPER as a minutes-weighted mean of player uPER for the season,
+    read from the constants table.
+    """
+    consts = _league_constants(season, refresh=refresh, season_type=season_type)
+    return consts["lguPER"] if consts else None
 
-    # League-average uPER (minutes-weighted) for normalization
-    lguPER = league_average_uPER(season, refresh=refresh)
-    if not lguPER:
-        return None
 
-    PER = per_pace * (15.0 / lguPER)
-    return float(PER)
+_ADVANCED = {}
 
-def league_average_uPER(season, refresh=False):
+def _team_pace(season, refresh=False, season_type="Regular Season"):
+    """Team PACE from the league team advanced table, indexed by TEAM_ID (empty if unavailable)."""
+    adv = _league_advanced(season, refresh=refresh, season_type=season_type)
+    if adv.empty or "PACE" not in adv.columns:
+        return pd.Series(dtype=float)
+    return adv.drop_duplicates("TEAM_ID").set_index("TEAM_ID")["PACE"].astype(float)
+
+def league_advanced_table(season, refresh=False, season_type="Regular Season"):
     """
-    Compute league-average uPER as a minutes-weighted mean of player uPER for the season.
-    Uses team-level ratios for tmAST/tmFG mapped to each player’s team.
-    Cached to avoid recomputation.
+    Advanced metrics for every player in the league in one vectorized pass:
+    PER, TS%, USG%, eFG%, AST/TO and per-36 counting stats (percentages on a 0-100 scale).
+    Persisted as data/cache/league_advanced_{season}.csv (one file per season type) and kept in memory
+    indexed by PLAYER_ID, so per-player lookups (get_player_advanced) are dictionary-speed.
     """
-    cp = _p(f"league_avg_uPER_{season}.json")
+    key = (season, season_type)
+    if not refresh and key in _ADVANCED:
+        return _ADVANCED[key]
+
+    cp = _p(f"league_advanced_{season}{_st_tag(season_type)}.csv")
+    table = None
     if cp.exists() and not refresh:
-        try:
-            return float(_load_json(cp)["lguPER"])
-        except Exception:
-            pass
+        try: table = _load_csv(cp)
+        except Exception: table = None
 
-    # Pull player totals league-wide
-    try:
-        p = leaguedashplayerstats.LeagueDashPlayerStats(
-            season=season,
-            season_type_all_star="Regular Season",
-            per_mode_detailed="Totals",
-            timeout=45
-        ).get_data_frames()[0]
-    except Exception:
+    if table is None:
+        p = _league_player_totals(season, refresh=refresh, season_type=season_type)
+        consts = _league_constants(season, refresh=refresh, season_type=season_type)
+        if p.empty or consts is None:
+            return pd.DataFrame()
+        teams = _league_team_base(season, refresh=refresh, season_type=season_type)
+
+        MIN = _num(p, "MIN")
+        uPER, team_ids = _player_uPER(p, teams, consts)
+
+        # Pace adjustment (lgPace / tmPace) and normalization to league average 15
+        tmPace = pd.Series(team_ids).map(_team_pace(season, refresh=refresh, season_type=season_type)).to_numpy(dtype=float)
+        lgPace, lguPER = consts["lgPace"], consts["lguPER"]
+        played = MIN > 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            PER = np.where(played & (tmPace > 0), uPER * (lgPace / tmPace) * (15.0 / lguPER), np.nan)
+
+        # Team totals for usage, aligned by TEAM_ID
+        tt = (teams.drop_duplicates("TEAM_ID").set_index("TEAM_ID") if not teams.empty and "TEAM_ID" in teams.columns
+              else pd.DataFrame(columns=["FGA", "FTA", "TOV", "GP"]))
+        def team_col(c):
+            return pd.Series(team_ids).map(tt[c] if c in tt.columns else pd.Series(dtype=float)).fillna(0.0).to_numpy(dtype=float)
+
+        FGM, FGA, FG3M = _num(p, "FGM", "FG"), _num(p, "FGA"), _num(p, "FG3M")
+        FTA, PTS, AST, TOV = _num(p, "FTA"), _num(p, "PTS"), _num(p, "AST"), _num(p, "TOV", "TO")
+
+        table = pd.DataFrame({
+            "PLAYER_ID": p["PLAYER_ID"].to_numpy(),
+            "PLAYER_NAME": p["PLAYER_NAME"].to_numpy() if "PLAYER_NAME" in p.columns else "",
+            "TEAM_ID": team_ids,
+            "TEAM_ABBREVIATION": p["TEAM_ABBREVIATION"].to_numpy() if "TEAM_ABBREVIATION" in p.columns else "",
+            "GP": _num(p, "GP"),
+            "MIN": MIN,
+            "uPER": uPER,
+            "PER": PER,
+            "TS_PCT": _true_shooting(PTS, FGA, FTA),
+            "USG_PCT": _usage_rate(MIN, FGA, FTA, TOV, team_col("FGA"), team_col("FTA"), team_col("TOV"), team_col("GP")),
+        })
+        with np.errstate(divide="ignore", invalid="ignore"):
+            table["EFG_PCT"] = np.where(FGA > 0, 100.0 * (FGM + 0.5 * FG3M) / FGA, np.nan)
+            table["AST_TO"] = np.where(TOV > 0, AST / TOV, np.nan)
+            for c in ["PTS", "REB", "AST", "STL", "BLK", "TOV"]:
+                table[f"{c}_36"] = np.where(MIN > 0, _num(p, c) * 36.0 / MIN, np.nan)
+        _save_csv(cp, table)
+
+    table = table.drop_duplicates("PLAYER_ID").set_index("PLAYER_ID", drop=False)
+    _ADVANCED[key] = table
+    return table
+
+def get_player_advanced(player_id, season, refresh=False, season_type="Regular Season"):
+    """One player's row of league_advanced_table as a dict, or None if the player isn't in it."""
+    table = league_advanced_table(season, refresh=refresh, season_type=season_type)
+    if table.empty or player_id not in table.index:
         return None
-    if p.empty: return None
-
-    # Build team totals map (for tmAST/tmFG per team)
-    team_totals = leaguedashteamstats.LeagueDashTeamStats(
-        season=season, season_type_all_star="Regular Season",
-        measure_type_detailed_defense="Base", per_mode_detailed="Totals",
-        timeout=35
-    ).get_data_frames()[0]
-    team_map = {int(r["TEAM_ID"]): r for _, r in team_totals.iterrows()}
-
-    consts = _league_constants(season, refresh=refresh)
-    if consts is None: return None
-    factor = consts["factor"]; VOP = consts["VOP"]; DRBP = consts["DRBP"]
-    lgFT = consts["lgFT"]; lgFTA = consts["lgFTA"]; lgFG = consts["lgFG"]; lgAST = consts["lgAST"]; lgPF = consts["lgPF"]
-
-    # Compute uPER per player (minutes > 0)
-    def uper_row(r):
-        MIN = float(r.get("MIN", 0) or 0)
-        if MIN <= 0: return 0.0, 0.0
-        TEAM_ID = int(r.get("TEAM_ID", 0) or 0)
-        t = team_map.get(TEAM_ID, {})
-        tmFG  = float(t.get("FGM", t.get("FG", 0)) or 0.0)
-        tmAST = float(t.get("AST", 0) or 0.0)
-        tmAST_over_tmFG = (tmAST / tmFG) if tmFG else 0.0
-
-        FG   = float(r.get("FGM", r.get("FG", 0)) or 0.0)
-        FGA  = float(r.get("FGA", 0) or 0.0)
-        _3P  = float(r.get("FG3M", 0) or 0.0)
-        FT   = float(r.get("FTM", 0) or 0.0)
-        FTA  = float(r.get("FTA", 0) or 0.0)
-        AST  = float(r.get("AST", 0) or 0.0)
-        ORB  = float(r.get("OREB", 0) or 0.0)
-        TRB  = float(r.get("REB", 0) or 0.0)
-        STL  = float(r.get("STL", 0) or 0.0)
-        BLK  = float(r.get("BLK", 0) or 0.0)
-        TOV  = float(r.get("TOV", r.get("TO", 0)) or 0.0)
-        PF   = float(r.get("PF", 0) or 0.0)
-
-        uPER_num = (
-            _3P + (2.0/3.0)*AST
-            + FG * (2.0 - factor * tmAST_over_tmFG)
-            + 0.5 * FT * (2.0 - (1.0/3.0) * tmAST_over_tmFG)
-            - VOP*TOV
-            - VOP*DRBP*(FGA - FG)
-            - VOP*0.44*(0.44 + 0.56*DRBP)*(FTA - FT)
-            + VOP*(1-DRBP)*(TRB - ORB)
-            + VOP*DRBP*ORB
-            + VOP*STL
-            + VOP*DRBP*BLK
-            - PF * ((lgFT/max(lgPF,1e-9)) - 0.44*(lgFTA/max(lgPF,1e-9))*VOP)
-        )
-        return (uPER_num / MIN), MIN
+    return table.loc[player_id].to_dict()
 
-    # minutes-weighted average
-    total_uPER_x_min = 0.0
-    total_min = 0.0
-    for _, r in p.iterrows():
-        u, m = uper_row(r)
-        total_uPER_x_min += u * m
-        total_min += m
-    lguPER = (total_uPER_x_min / total_min) if total_min > 0 else None
-    if lguPER:
-        _save_json(cp, {"lguPER": lguPER})
-    return lguPER
 
+# -------------------- batch player comparison --------------------
+COMPARE_MAX = 8
 
-def get_team_head_to_head(team_id_a, team_id_b, season, refresh=False):
+def _resolve_season(career, preferred_season):
+    """(season_to_use, is_exact): the preferred season if the player has it, else their most recent one."""
+    if not career.seasons:
+        return None, False
+    if preferred_season in career:
+        return preferred_season, True
+    return career.seasons[-1], False
+
+def compare_players(player_ids, season, refresh=False, max_workers=8, season_type="Regular Season"):
     """
-    Return small dict with head-to-head W-L for 'season' between team A and B using TeamGameLog.
+    Side-by-side season stats for up to COMPARE_MAX players.
+    Careers are fetched concurrently, cards come from one player-index lookup, team totals once per distinct season,
+    and every metric is computed in one vectorized pass over the batch.
+    A player without the requested season falls back to their most recent one (EXACT = False).
+    Returns DataFrame [PLAYER_ID, NAME, SEASON, EXACT, TEAM_ID, TEAM_ABBREVIATION, GP, MPG, PPG, RPG, APG,
+                       SPG, BPG, TS_PCT, USG_PCT, PER] in the order given.
     """
-    def _one(team_id):
-        cp = _p(f"h2h_{team_id}_{season}.csv")
-        if cp.exists() and not refresh:
-            try: return _load_csv(cp)
-            except Exception: pass
-        try:
-            df = teamgamelog.TeamGameLog(team_id=team_id, season=season, season_type_all_star="Regular Season", timeout=30).get_data_frames()[0]
-            _save_csv(cp, df)
-            return df
-        except Exception:
-            return pd.DataFrame()
+    ids = list(dict.fromkeys(int(p) for p in player_ids))[:COMPARE_MAX]
+    if not ids:
+        return pd.DataFrame()
 
-    a = _one(team_id_a); b = _one(team_id_b)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(ids)))) as ex:
+        careers = list(ex.map(lambda pid: player_career(pid, refresh=refresh, season_type=season_type), ids))
+    cards = get_player_cards(ids, refresh=refresh)
+
+    rows, seasons, exact = [], [], []
+    for pid, career in zip(ids, careers):
+        s, ok = _resolve_season(career, season)
+        r = career.rows(s).head(1) if s else pd.DataFrame()
+        rows.append(r if not r.empty else pd.DataFrame({"PLAYER_ID": [pid]}))
+        seasons.append(s); exact.append(ok)
+    p = pd.concat(rows, ignore_index=True)
+    p["PLAYER_ID"] = ids
+
+    # League team totals and advanced tables, one per distinct season, fetched concurrently
+    distinct = sorted({s for s in seasons if s})
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(distinct) or 1))) as ex:
+        team_base = dict(zip(distinct, ex.map(lambda s: _league_team_base(s, refresh=refresh, season_type=season_type), distinct)))
+        adv = dict(zip(distinct, ex.map(lambda s: league_advanced_table(s, refresh=refresh, season_type=season_type), distinct)))
+
+    tid = pd.to_numeric(p["TEAM_ID"], errors="coerce").fillna(0).astype(int).to_numpy() if "TEAM_ID" in p.columns else np.zeros(len(ids), int)
+    keys = pd.DataFrame({"SEASON": seasons, "TEAM_ID": tid, "PLAYER_ID": ids})
+    tcols = ["FGA", "FTA", "TOV", "GP"]
+    tb = [t.assign(SEASON=s)[["SEASON", "TEAM_ID"] + tcols] for s, t in team_base.items()
+          if not t.empty and set(tcols) <= set(t.columns)]
+    tb = pd.concat(tb, ignore_index=True).drop_duplicates(["SEASON", "TEAM_ID"]) if tb else pd.DataFrame(columns=["SEASON", "TEAM_ID"] + tcols)
+    team = keys.merge(tb, on=["SEASON", "TEAM_ID"], how="left")
+    ad = [a[["PLAYER_ID", "PER"]].reset_index(drop=True).assign(SEASON=s) for s, a in adv.items() if not a.empty]
+    ad = pd.concat(ad, ignore_index=True) if ad else pd.DataFrame(columns=["PLAYER_ID", "PER", "SEASON"])
+    per = keys.merge(ad, on=["SEASON", "PLAYER_ID"], how="left")["PER"]
+
+    GP, MIN = _num(p, "GP"), _num(p, "MIN")
+    FGA, FTA, TOV = _num(p, "FGA"), _num(p, "FTA"), _num(p, "TOV", "TO")
+    out = pd.DataFrame({
+        "PLAYER_ID": ids,
+        "NAME": [c.get("full_name", f"Player {pid}") for pid, c in zip(ids, cards)],
+        "SEASON": seasons,
+        "EXACT": exact,
+        "TEAM_ID": tid,
+        "TEAM_ABBREVIATION": p["TEAM_ABBREVIATION"].to_numpy() if "TEAM_ABBREVIATION" in p.columns else "",
+        "GP": GP,
+    })
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for col, stat in [("MPG", "MIN"), ("PPG", "PTS"), ("RPG", "REB"), ("APG", "AST"), ("SPG", "STL"), ("BPG", "BLK")]:
+            out[col] = np.where(GP > 0, _num(p, stat) / GP, np.nan)
+    out["TS_PCT"] = _true_shooting(_num(p, "PTS"), FGA, FTA)
+    out["USG_PCT"] = _usage_rate(MIN, FGA, FTA, TOV, *(_num(team, c) for c in tcols))
+    out["PER"] = pd.to_numeric(per, errors="coerce").to_numpy(float)
+    return out
+
+
+def get_team_head_to_head(team_id_a, team_id_b, season, refresh=False, season_type="Regular Season"):
+    """
+    Return small dict with head-to-head W-L for 'season' between team A and B using TeamGameLog.
+    """
+    a = _team_gamelog(team_id_a, season, refresh=refresh, season_type=season_type)
+    b = _team_gamelog(team_id_b, season, refresh=refresh, season_type=season_type)
     if a.empty or b.empty:
         return {"A_wins": 0, "B_wins": 0, "games": 0}
 
@@ -710,11 +1319,7 @@ def get_team_head_to_head(team_id_a, team_id_b, season, refresh=False):
         losses = int((m["WL"] == "L").sum())
         return wins, losses, len(m)
 
-    # Get abbreviations from your team list (already in your file)
-    all_teams = list_all_teams()
-    ta = next(t for t in all_teams if t["team_id"] == team_id_a)
-    tb = next(t for t in all_teams if t["team_id"] == team_id_b)
-    a_abbr, b_abbr = ta["abbreviation"], tb["abbreviation"]
+    a_abbr, b_abbr = team_abbreviation(team_id_a), team_abbreviation(team_id_b)
 
     a_w, a_l, a_g = _vs(a, a_abbr, b_abbr)
     b_w, b_l, b_g = _vs(b, b_abbr, a_abbr)
@@ -833,43 +1438,31 @@ def get_team_h2h_games(team_id_a, team_id_b, season, refresh=False, season_type=
 
 # Calculating the PER
 
-def _league_team_totals(season, refresh=False):
+def _league_team_totals(season, refresh=False, season_type="Regular Season"):
     """
-    League totals by summing team totals (Regular Season).
+    League totals by summing team totals (the _league_team_base table).
     Returns one-row DataFrame with FG, FGA, 3PM, FT, FTA, AST, ORB, DRB, REB, TOV, PF, PTS, GP.
     """
-    cp = _p(f"league_team_totals_{season}.csv")
-    if cp.exists() and not refresh:
-        try: return _load_csv(cp)
-        except Exception: pass
-    try:
-        df = leaguedashteamstats.LeagueDashTeamStats(
-            season=season,
-            season_type_all_star="Regular Season",
-            measure_type_detailed_defense="Base",
-            per_mode_detailed="Totals",
-            timeout=35
-        ).get_data_frames()[0]
-        # Sum across all teams
-        cols = ["FGM","FGA","FG3M","FTM","FTA","AST","OREB","DREB","REB","TOV","PF","PTS","GP"]
-        agg = df[cols].sum(numeric_only=True).to_frame().T
-        _save_csv(cp, agg)
-        return agg
-    except Exception:
+    df = _league_team_base(season, refresh=refresh, season_type=season_type)
+    cols = ["FGM","FGA","FG3M","FTM","FTA","AST","OREB","DREB","REB","TOV","PF","PTS","GP"]
+    if df.empty or not set(cols) <= set(df.columns):
         return pd.DataFrame()
+    # Sum across all teams
+    return df[cols].sum(numeric_only=True).to_frame().T
 
-def _league_advanced(season, refresh=False):
+def _league_advanced(season, refresh=False, season_type="Regular Season"):
     """
     League advanced -> use team 'Advanced' to compute league pace (minutes-weighted).
+    Also the source of per-team ratings (get_team_ratings_from_advanced, get_team_adv_summary).
     """
-    cp = _p(f"league_team_adv_{season}.csv")
+    cp = _p(f"league_team_adv_{season}{_st_tag(season_type)}.csv")
     if cp.exists() and not refresh:
         try: return _load_csv(cp)
         except Exception: pass
     try:
         adv = leaguedashteamstats.LeagueDashTeamStats(
             season=season,
-            season_type_all_star="Regular Season",
+            season_type_all_star=season_type,
             measure_type_detailed_defense="Advanced",
             per_mode_detailed="PerGame",
             timeout=35
@@ -879,17 +1472,17 @@ def _league_advanced(season, refresh=False):
     except Exception:
         return pd.DataFrame()
 
-def _team_advanced_row(team_id, season, refresh=False):
-    adv = _league_advanced(season, refresh=refresh)
+def _team_advanced_row(team_id, season, refresh=False, season_type="Regular Season"):
+    adv = _league_advanced(season, refresh=refresh, season_type=season_type)
     if adv.empty: return pd.Series(dtype=float)
     row = adv[adv["TEAM_ID"] == team_id]
     return row.iloc[0] if not row.empty else pd.Series(dtype=float)
 
-def league_pace(season, refresh=False):
+def _compute_league_pace(season, refresh=False, season_type="Regular Season"):
     """
     Weighted league pace using team PACE weighted by GP.
     """
-    adv = _league_advanced(season, refresh=refresh)
+    adv = _league_advanced(season, refresh=refresh, season_type=season_type)
     if adv.empty: return None
     # weight by games played (GP) if present; else simple mean
     if "GP" in adv.columns and "PACE" in adv.columns:
@@ -898,19 +1491,19 @@ def league_pace(season, refresh=False):
         return float(num/den) if den else None
     return float(adv["PACE"].astype(float).mean()) if "PACE" in adv.columns else None
 
-def team_pace(team_id, season, refresh=False):
-    row = _team_advanced_row(team_id, season, refresh=refresh)
+def team_pace(team_id, season, refresh=False, season_type="Regular Season"):
+    row = _team_advanced_row(team_id, season, refresh=refresh, season_type=season_type)
     try:
         return float(row["PACE"])
     except Exception:
         return None
 
-def _league_constants(season, refresh=False):
+def _compute_league_constants(season, refresh=False, season_type="Regular Season"):
     """
     Compute factor, VOP, DRBP from league totals (Hollinger/BBR).
     Returns dict { 'factor', 'VOP', 'DRBP', 'lgFT','lgFTA','lgFG','lgAST','lgTRB','lgORB','lgPTS','lgPF' }
     """
-    lg = _league_team_totals(season, refresh=refresh)
+    lg = _league_team_totals(season, refresh=refresh, season_type=season_type)
     if lg.empty: return None
     lgFT  = float(lg["FTM"].iloc[0])
     lgFTA = float(lg["FTA"].iloc[0])
@@ -939,6 +1532,207 @@ def _league_constants(season, refresh=False):
         "lgTRB": lgTRB, "lgORB": lgORB, "lgPTS": lgPTS, "lgPF": lgPF
     }
 
+# -------------------- league constants table --------------------
+LEAGUE_CONSTANT_COLS = [
+    "SEASON", "SEASON_TYPE", "factor", "VOP", "DRBP",
+    "lgFT", "lgFTA", "lgFG", "lgAST", "lgTRB", "lgORB", "lgPTS", "lgPF",
+    "lgPace", "lguPER",
+]
+_CONSTANTS = {}   # (SEASON, SEASON_TYPE) -> row
+
+def _league_constants_row(season, refresh=False, season_type="Regular Season"):
+    """One row of the constants table: Hollinger constants, league pace and minutes-weighted lguPER."""
+    consts = _compute_league_constants(season, refresh=refresh, season_type=season_type)
+    pace = _compute_league_pace(season, refresh=refresh, season_type=season_type)
+    p = _league_player_totals(season, refresh=refresh, season_type=season_type)
+    if consts is None or not pace or p.empty:
+        return None
+    uPER, _ = _player_uPER(p, _league_team_base(season, refresh=refresh, season_type=season_type), consts)
+    MIN = _num(p, "MIN")
+    played = MIN > 0
+    if not played.any():
+        return None
+    lguPER = float((uPER[played] * MIN[played]).sum() / MIN[played].sum())
+    return {"SEASON": season, "SEASON_TYPE": season_type, **consts, "lgPace": float(pace), "lguPER": lguPER}
+
+def league_constants_table(seasons=None, refresh=False, max_workers=4, season_type="Regular Season"):
+    """
+    Per-season league constants (factor, VOP, DRBP, league totals), league pace and lguPER,
+    persisted in data/cache/league_constants.csv with one row per (season, season type).
+    Missing seasons are built in parallel.
+    Completed seasons are immutable once stored; refresh only rebuilds the current season.
+    Returns DataFrame indexed by SEASON for the given season type.
+    """
+    if not _CONSTANTS:
+        cp = _p("league_constants.csv")
+        if cp.exists():
+            try:
+                df = _load_csv(cp)
+                if "SEASON_TYPE" not in df.columns:
+                    df["SEASON_TYPE"] = "Regular Season"
+                for r in df.to_dict("records"):
+                    _CONSTANTS[(r["SEASON"], r["SEASON_TYPE"])] = r
+            except Exception:
+                pass
+
+    current = _current_season_str()
+    wanted = list(seasons) if seasons is not None else [s for s, t in _CONSTANTS if t == season_type]
+    todo = [s for s in wanted if (s, season_type) not in _CONSTANTS or (refresh and s == current)]
+    if todo:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(todo)))) as ex:
+            rows = list(ex.map(lambda s: _league_constants_row(s, refresh=refresh, season_type=season_type), todo))
+        built = [r for r in rows if r is not None]
+        for r in built:
+            _CONSTANTS[(r["SEASON"], season_type)] = r
+        if built:
+            table = pd.DataFrame(list(_CONSTANTS.values()), columns=LEAGUE_CONSTANT_COLS).sort_values(["SEASON_TYPE", "SEASON"])
+            _save_csv(_p("league_constants.csv"), table)
+
+    rows = [_CONSTANTS[(s, season_type)] for s in wanted if (s, season_type) in _CONSTANTS]
+    return pd.DataFrame(rows, columns=LEAGUE_CONSTANT_COLS).set_index("SEASON", drop=False)
+
+def _league_constants(season, refresh=False, season_type="Regular Season"):
+    """
+    League constants for one season from league_constants_table.
+    Returns dict { 'factor', 'VOP', 'DRBP', 'lgFT','lgFTA','lgFG','lgAST','lgTRB','lgORB','lgPTS','lgPF','lgPace','lguPER' }
+    or None if the season can't be built.
+    """
+    key = (season, season_type)
+    if key not in _CONSTANTS or (refresh and season == _current_season_str()):
+        league_constants_table([season], refresh=refresh, season_type=season_type)
+    row = _CONSTANTS.get(key)
+    return {k: float(row[k]) for k in LEAGUE_CONSTANT_COLS[2:]} if row else None
+
+def league_pace(season, refresh=False, season_type="Regular Season"):
+    """Weighted league pace (team PACE weighted by GP), read from the constants table."""
+    consts = _league_constants(season, refresh=refresh, season_type=season_type)
+    return consts["lgPace"] if consts else None
+
+# -------------------- league team summary --------------------
+TEAM_SUMMARY_COLS = [
+    "SEASON", "TEAM_ID", "TEAM_NAME", "TEAM_ABBREVIATION", "GP", "W", "L", "W_PCT",
+    "OFF_RATING", "DEF_RATING", "NET_RATING", "PACE", "PPG", "CONF_RANK", "DIV_RANK",
+]
+# ranked column -> ascending (True where lower is better)
+TEAM_RANKS = {"W_PCT": False, "OFF_RATING": False, "DEF_RATING": True, "NET_RATING": False, "PACE": False, "PPG": False}
+_TEAM_SUMMARIES = {}
+
+def _yby_season_rows(season, max_workers=4):
+    """
+    Every team's TeamYearByYearStats row for a season, read from the cached histories
+    (only missing ones are fetched, in parallel): (DataFrame [TEAM_ID, W, L, W_PCT, CONF_RANK, DIV_RANK], complete).
+    """
+    year = _season_key_to_start_year(season)
+    def _one(team_id):
+        h = team_history(team_id)
+        if h.empty:
+            return None
+        return h.loc[[year]].assign(TEAM_ID=team_id) if year in h.index else h.iloc[0:0]
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        parts = list(ex.map(_one, TEAMS.by_id))
+    ok = [r for r in parts if r is not None and not r.empty]
+    cols = ["TEAM_ID", "W", "L", "W_PCT", "CONF_RANK", "DIV_RANK"]
+    if not ok:
+        return pd.DataFrame(columns=cols), False
+    df = pd.concat(ok, ignore_index=True)
+    for c in cols:
+        if c not in df.columns:
+            df[c] = np.nan
+    return df[cols], all(r is not None for r in parts)
+
+def _team_summary_frame(season, refresh=False, season_type="Regular Season", max_workers=4):
+    """
+    (summary DataFrame over TEAM_SUMMARY_COLS + *_RANK columns, complete).
+    Only the current season's league tables are refetched on refresh; a completed season is rebuilt from cache.
+    """
+    live = season == _current_season_str()
+    refresh = refresh and live
+    adv = _league_advanced(season, refresh=refresh, season_type=season_type)
+    base = _league_team_base(season, refresh=refresh, season_type=season_type)
+    if adv.empty and base.empty:
+        return pd.DataFrame(), False
+
+    out = pd.DataFrame({"TEAM_ID": list(TEAMS.by_id)})
+    out["SEASON"] = season
+    out["TEAM_NAME"] = [TEAMS.by_id[t]["full_name"] for t in out["TEAM_ID"]]
+    out["TEAM_ABBREVIATION"] = [TEAMS.by_id[t]["abbreviation"] for t in out["TEAM_ID"]]
+    a = adv.drop_duplicates("TEAM_ID").set_index("TEAM_ID") if "TEAM_ID" in adv.columns else pd.DataFrame()
+    b = base.drop_duplicates("TEAM_ID").set_index("TEAM_ID") if "TEAM_ID" in base.columns else pd.DataFrame()
+    def col(frame, *names):
+        for n in names:
+            if n in frame.columns:
+                return out["TEAM_ID"].map(pd.to_numeric(frame[n], errors="coerce"))
+        return pd.Series(np.nan, index=out.index)
+    out["GP"] = col(a, "GP").fillna(col(b, "GP"))
+    for c in ["W", "L", "W_PCT"]:
+        out[c] = col(a, c).fillna(col(b, c))
+    out["OFF_RATING"] = col(a, "OFF_RATING", "E_OFF_RATING")
+    out["DEF_RATING"] = col(a, "DEF_RATING", "E_DEF_RATING")
+    out["NET_RATING"] = col(a, "NET_RATING", "E_NET_RATING").fillna(out["OFF_RATING"] - out["DEF_RATING"])
+    out["PACE"] = col(a, "PACE", "E_PACE")
+    gp_b = col(b, "GP")
+    out["PPG"] = (col(b, "PTS") / gp_b.where(gp_b > 0))
+    out["CONF_RANK"] = np.nan
+    out["DIV_RANK"] = np.nan
+
+    # Regular-season records and standings positions from year-by-year (where the franchise has the season).
+    # The cached histories can lag the current season, so there the league tables' record wins.
+    complete = True
+    if season_type == "Regular Season":
+        yby, complete = _yby_season_rows(season, max_workers=max_workers)
+        if not yby.empty:
+            y = yby.set_index("TEAM_ID")
+            for c in ["W", "L", "W_PCT"]:
+                out[c] = out[c].fillna(col(y, c)) if live else col(y, c).fillna(out[c])
+            for c in ["CONF_RANK", "DIV_RANK"]:
+                out[c] = col(y, c)
+
+    out = out[out["W"].notna() | out["OFF_RATING"].notna()].reset_index(drop=True)
+    for c, asc in TEAM_RANKS.items():
+        out[f"{c}_RANK"] = out[c].rank(ascending=asc, method="min")
+    return out, complete
+
+def league_team_summary(season, refresh=False, season_type="Regular Season", max_workers=4):
+    """
+    One row per team for a season: record, Off/Def/Net rating, pace, points per game,
+    conference/division rank and league ranks (W_PCT_RANK, OFF_RATING_RANK, ...).
+    Built in one job from the shared league team tables and the year-by-year histories,
+    stored as data/cache/league_team_summary_{season}.csv (one file per season type) and
+    kept in memory indexed by TEAM_ID. A build with failed year-by-year fetches is not written to disk
+    and is only kept in memory for PARTIAL_RETRY_S.
+    """
+    key = (season, season_type)
+    if not refresh and _memo_hit(_TEAM_SUMMARIES, "team_summary", key):
+        return _TEAM_SUMMARIES[key]
+    cp = _p(f"league_team_summary_{season}{_st_tag(season_type)}.csv")
+    df, complete = None, True
+    if cp.exists() and not refresh:
+        try: df = _load_csv(cp)
+        except Exception: df = None
+    if df is None:
+        df, complete = _team_summary_frame(season, refresh=refresh, season_type=season_type, max_workers=max_workers)
+        if df.empty:
+            return df
+        if complete:
+            _save_csv(cp, df)
+    df = df.set_index("TEAM_ID", drop=False)
+    _memo_put(_TEAM_SUMMARIES, "team_summary", key, df, complete)
+    return df
+
+def get_team_summary(team_id, season, refresh=False, season_type="Regular Season"):
+    """One team's row of league_team_summary as a dict, or None."""
+    table = league_team_summary(season, refresh=refresh, season_type=season_type)
+    if table.empty or team_id not in table.index:
+        return None
+    return table.loc[team_id].to_dict()
+
+def league_standings(season, refresh=False, season_type="Regular Season"):
+    """league_team_summary ordered by winning percentage (ties: net rating)."""
+    table = league_team_summary(season, refresh=refresh, season_type=season_type)
+    if table.empty:
+        return table
+    return table.sort_values(["W_PCT", "NET_RATING"], ascending=False).reset_index(drop=True)
+
 def get_player_shotchart(player_id, season, season_type="Regular Season", refresh=False):
     """
     Fetch shot chart data for a player for a given season and season type.
@@ -970,10 +1764,13 @@ def get_player_shotchart(player_id, season, season_type="Regular Season", refres
             context_measure_simple="FGA",
             timeout=40,
         )
-        df = res.get_data_frames()[0]
+        frames = res.get_data_frames()
+        df = frames[0]
 
-        if df.empty:
-            return pd.DataFrame()
+        # The same response carries the league zone averages; keep them for baselines
+        lp = _p(f"shotchart_league_avg_{season}_{tag}.csv")
+        if len(frames) > 1 and not frames[1].empty and (refresh or not lp.exists()):
+            _save_csv(lp, frames[1])
 
         keep = [
             "LOC_X",
@@ -988,6 +1785,10 @@ def get_player_shotchart(player_id, season, season_type="Regular Season", refres
         ]
         keep = [c for c in keep if c in df.columns]
 
+        # no shots (e.g. no playoff games): empty but with the shot columns, unlike a failed request
+        if df.empty:
+            return df[keep]
+
         df = df[keep].copy()
 
         # basic cleaning: restrict to half-court area used in most examples
@@ -999,185 +1800,96 @@ def get_player_shotchart(player_id, season, season_type="Regular Season", refres
     except Exception:
         return pd.DataFrame()
 
+def get_league_shot_averages(season, season_type="Regular Season", refresh=False):
+    """
+    League-average FGA/FGM/FG_PCT by shot zone (the 'LeagueAverages' frame of ShotChartDetail).
+    Usually already on disk from an earlier get_player_shotchart call for the same season.
 
+        data/cache/shotchart_league_avg_{season}_{season_type}.csv
+    """
+    if not season:
+        return pd.DataFrame()
 
-# BASE_DIR = Path(__file__).resolve().parents[2]  # repo root
-# DATA_DIR = BASE_DIR / "data"
-# CACHE_DIR = DATA_DIR / "cache"
-# OFFLINE_DIR = DATA_DIR / "offline"
-# # Ensure directories exist and are created relative to the repository root
-# CACHE_DIR.mkdir(parents=True, exist_ok=True)
-# OFFLINE_DIR.mkdir(parents=True, exist_ok=True)
-
-# logger = logging.getLogger(__name__)
-# logging.basicConfig(level=logging.INFO)
-
-# def _save_json(path: Path, obj: dict):
-#     path.write_text(json.dumps(obj, indent=2), encoding="utf-8")
-
-# def _load_json(path: Path):
-#     return json.loads(path.read_text(encoding="utf-8"))
-
-# def _cache_path_for_player_info(pid: int) -> Path:
-#     return CACHE_DIR / f"player_info_{pid}.json"
-
-# def _cache_path_for_player_totals(pid: int) -> Path:
-#     return CACHE_DIR / f"player_totals_{pid}.csv"
-
-# def find_player_basic(query: str):
-#     """
-#     Returns a dict with player_id, full_name, team, position (team/position may be empty if API call fails).
-#     Caches basic info to speed up repeated demos.
-#     """
-#     matches = players.find_players_by_full_name(query)
-#     if not matches:
-#         return None
-
-#     p = matches[0]
-#     pid = p["id"]
-
-#     # Try cache first
-#     info_cache = _cache_path_for_player_info(pid)
-#     if info_cache.exists():
-#         try:
-#             info = _load_json(info_cache)
-#             return info
-#         except Exception:
-#             pass  # fall through to API
-
-#     # API call
-#     try:
-#         info_raw = _with_retries(lambda: commonplayerinfo.CommonPlayerInfo(player_id=pid, timeout=10).get_normalized_dict(), max_attempts=3)
-#         row = info_raw["CommonPlayerInfo"][0]
-#         info = {
-#             "player_id": pid,
-#             "full_name": row.get("DISPLAY_FIRST_LAST", p["full_name"]),
-#             "team": row.get("TEAM_NAME", "") or "",
-#             "position": row.get("POSITION", "") or "",
-#             "last_updated": int(time.time()),
-#         }
-#         _save_json(info_cache, info)
-#         return info
-#     except Exception as exc:
-#         logger.exception("commonplayerinfo failed for pid %s: %s", pid, exc)
-#         # Minimal fallback if CommonPlayerInfo fails
-#         return {
-#             "player_id": pid,
-#             "full_name": p.get("full_name", query),
-#             "team": "",
-#             "position": "",
-#             "last_updated": None,
-#         }
-
-# def _format_percent_cols(df: pd.DataFrame) -> pd.DataFrame:
-#     for col in ["FG%", "3P%", "FT%"]:
-#         if col in df.columns:
-#             # coerce to float, but guard empty/NaN
-#             df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0.0).astype(float)
-#             # if values look like fractions (max <= 1), convert to percent scale
-#             try:
-#                 if df[col].abs().max() <= 1.01:
-#                     df[col] = df[col] * 100.0
-#             except Exception:
-#                 # in case of all-NaN or unexpected dtypes, skip scaling
-#                 pass
-#             df[col] = df[col].round(1)
-#     return df
-
-
-# def get_player_current_season_stats(player_id: int) -> pd.DataFrame:
-    
-#     #Returns a one-row DataFrame for the most recent regular season totals.
-#     #Flow:
-#     #  1) Try API
-#     #  2) If API fails, try CSV cache data/cache/player_totals_<pid>.csv
-#     #  3) If cache missing and player is LeBron (2544) OR a well-known demo, try offline demo CSV.
-    
-#     cache_csv = _cache_path_for_player_totals(player_id)
-
-#     # --- 1) API path
-#     try:
-#         prof = _with_retries(lambda: playerprofilev2.PlayerProfileV2(player_id=player_id, timeout=10).get_normalized_dict(), max_attempts=3)
-#         totals = pd.DataFrame(prof.get("SeasonTotalsRegularSeason", []))
-#         if totals.empty:
-#             # try to fall back to a career/other endpoint before bailing to cache
-#             logger.info("No SeasonTotalsRegularSeason returned for pid %s; attempting alternate endpoint", player_id)
-#             try:
-#                 # lazy import to avoid adding another heavy call unless needed
-#                 from nba_api.stats.endpoints import playercareerstats
-#                 care = _with_retries(lambda: playercareerstats.PlayerCareerStats(player_id=player_id, timeout=10).get_normalized_dict(), max_attempts=2)
-#                 # playercareerstats returns season totals under 'SeasonTotalsRegularSeason' or 'SeasonTotals'
-#                 alt = care.get("SeasonTotalsRegularSeason", []) or care.get("SeasonTotals", [])
-#                 totals = pd.DataFrame(alt)
-#             except Exception as exc2:
-#                 logger.warning("playercareerstats fallback failed for pid %s: %s", player_id, exc2)
-
-#         if totals.empty:
-#             raise RuntimeError("No regular-season totals returned.")
-
-#         # take most recent season - ensure numeric sort by season start year
-#         if "SEASON_ID" in totals.columns:
-#             # create numeric season start for robust sorting (e.g., '2023-24' -> 2023)
-#             try:
-#                 totals["SEASON_START"] = totals["SEASON_ID"].astype(str).str[:4].astype(int)
-#                 totals = totals.sort_values("SEASON_START").tail(1).drop(columns=["SEASON_START"])
-#             except Exception:
-#                 totals = totals.sort_values("SEASON_ID").tail(1)
-
-#         keep = ["SEASON_ID","GP","MIN","PTS","REB","AST","STL","BLK","FG_PCT","FG3_PCT","FT_PCT"]
-#         keep = [c for c in keep if c in totals.columns]
-#         totals = totals[keep].rename(columns={
-#             "SEASON_ID":"Season","GP":"G","MIN":"MP",
-#             "FG_PCT":"FG%","FG3_PCT":"3P%","FT_PCT":"FT%"
-#         })
-#         # convert to display percentages (guarding bad types)
-#         for pct in ["FG%","3P%","FT%"]:
-#             if pct in totals.columns:
-#                 totals[pct] = pd.to_numeric(totals[pct], errors="coerce").fillna(0.0).astype(float)
-#                 if totals[pct].abs().max() <= 1.01:
-#                     totals[pct] = (totals[pct] * 100.0).round(1)
-#                 else:
-#                     totals[pct] = totals[pct].round(1)
-#         # cache for demo reliability
-#         try:
-#             totals.to_csv(cache_csv, index=False)
-#         except Exception:
-#             logger.exception("Failed to write cache csv for pid %s", player_id)
-#         return totals
-#     except Exception as exc:
-#         logger.exception("playerprofilev2 / alternate endpoints failed for pid %s: %s", player_id, exc)
-#         # then continue to cache fallback
-
-#     # --- 2) Cache fallback
-#     if cache_csv.exists():
-#         try:
-#             df = pd.read_csv(cache_csv)
-#             return _format_percent_cols(df)
-#         except Exception:
-#             pass
-
-#     # --- 3) Offline demo fallback (only if you have a known offline file)
-#     offline_csv = OFFLINE_DIR / "lebron_demo.csv"
-#     if player_id in (2544,):  # LeBron's historical id; keeps demo simple
-#         if offline_csv.exists():
-#             try:
-#                 df = pd.read_csv(offline_csv)
-#                 return _format_percent_cols(df)
-#             except Exception:
-#                 pass
-
-#     # If we get here, give a clear empty frame
-#     return pd.DataFrame(columns=["Season","G","MP","PTS","REB","AST","STL","BLK","FG%","3P%","FT%"])
-
-# def _with_retries(func, max_attempts=3, backoff_base=2, *args, **kwargs):
-#     last_exc = None
-#     for attempt in range(1, max_attempts + 1):
-#         try:
-#             return func(*args, **kwargs)
-#         except Exception as exc:
-#             last_exc = exc
-#             logger.warning("Attempt %d/%d failed for %s: %s", attempt, max_attempts, getattr(func, "__name__", "call"), exc)
-#             if attempt < max_attempts:
-#                 time.sleep(backoff_base ** attempt)
-#     # re-raise last exception to let caller handle fallback
-#     raise last_exc
+    tag = season_type.replace(" ", "_")
+    cp = _p(f"shotchart_league_avg_{season}_{tag}.csv")
+    if cp.exists() and not refresh:
+        try:
+            return _load_csv(cp)
+        except Exception:
+            pass
+
+    try:
+        frames = shotchartdetail.ShotChartDetail(
+            team_id=0,
+            player_id=0,
+            season_nullable=season,
+            season_type_all_star=season_type,
+            context_measure_simple="FGA",
+            timeout=40,
+        ).get_data_frames()
+        df = frames[1] if len(frames) > 1 else pd.DataFrame()
+        if not df.empty:
+            _save_csv(cp, df)
+        return df
+    except Exception:
+        return pd.DataFrame()
+
+
+LEAGUE_SHOT_COLS = [
+    "GAME_ID", "GAME_DATE", "TEAM_ID", "PLAYER_ID",
+    "LOC_X", "LOC_Y", "SHOT_MADE_FLAG", "SHOT_ZONE_BASIC", "SHOT_DISTANCE",
+    "PERIOD", "ACTION_TYPE", "SHOT_TYPE",
+]
+
+def get_league_shots(season, season_type="Regular Season", refresh=False):
+    """
+    Every shot in the league for a season (ShotChartDetail with team_id=0, player_id=0), cached to
+
+        data/cache/shotchart_league_{season}_{season_type}.csv
+
+    On refresh only games from the last cached GAME_DATE on are requested, and they replace the cached
+    rows from that date (games that were still in progress then are completed) -- the file grows by
+    new games instead of being refetched.
+    """
+    if not season:
+        return pd.DataFrame()
+
+    tag = season_type.replace(" ", "_")
+    cp = _p(f"shotchart_league_{season}_{tag}.csv")
+    cached = None
+    if cp.exists():
+        try:
+            cached = _load_csv(cp)
+        except Exception:
+            cached = None
+    if cached is not None and not refresh:
+        return cached
+
+    kw = dict(
+        team_id=0,
+        player_id=0,
+        season_nullable=season,
+        season_type_all_star=season_type,
+        context_measure_simple="FGA",
+        timeout=90,
+    )
+    if cached is not None and not cached.empty and "GAME_DATE" in cached.columns:
+        last = str(int(cached["GAME_DATE"].max()))
+        kw["date_from_nullable"] = f"{last[4:6]}/{last[6:]}/{last[:4]}"
+
+    try:
+        df = shotchartdetail.ShotChartDetail(**kw).get_data_frames()[0]
+        df = df[[c for c in LEAGUE_SHOT_COLS if c in df.columns]].copy()
+        if "LOC_Y" in df.columns:
+            df = df[df["LOC_Y"] <= 470]
+        for c in ("GAME_ID", "GAME_DATE"):
+            if c in df.columns:
+                df[c] = pd.to_numeric(df[c], errors="coerce")
+        if "date_from_nullable" in kw:
+            if df.empty:
+                return cached
+            df = pd.concat([cached[cached["GAME_DATE"] < int(last)], df], ignore_index=True)
+        _save_csv(cp, df)
+        return df
+    except Exception:
+        return cached if cached is not None else pd.DataFrame()
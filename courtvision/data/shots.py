@@ -0,0 +1,735 @@
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+from courtvision.data.nba_client import (
+    _p, _save_csv, _load_csv, _save_json, _load_json, _current_season_str,
+    get_player_shotchart,
+    get_league_shots,
+    get_league_shot_averages,
+    list_seasons_for_player,
+)
+
+# Shot grid extents (NBA stats units: 1/10 ft, hoop at origin) -- same as the court charts
+X_MIN, X_MAX = -250, 250
+Y_MIN, Y_MAX = -52, 440
+
+# -------------------- grids --------------------
+def grid_edges(cell=10):
+    """Bin edges for a grid of `cell`-unit squares over the half court (cell=10 -> 1 ft)."""
+    xe = np.arange(X_MIN, X_MAX + cell, cell, dtype=float)
+    ye = np.arange(Y_MIN, Y_MAX + cell, cell, dtype=float)
+    return xe, ye
+
+
+def shot_grids(shots, cell=10):
+    """
+    Count attempts and makes per grid cell.
+    Returns (made, attempts) as float arrays shaped (ny, nx) -- row = y, like go.Heatmap z.
+    """
+    xe, ye = grid_edges(cell)
+    shape = (len(ye) - 1, len(xe) - 1)
+    if shots is None or shots.empty or "LOC_X" not in shots.columns or "LOC_Y" not in shots.columns:
+        return np.zeros(shape), np.zeros(shape)
+
+    x = shots["LOC_X"].to_numpy(dtype=float)
+    y = shots["LOC_Y"].to_numpy(dtype=float)
+    ok = np.isfinite(x) & np.isfinite(y)
+    x, y = x[ok], y[ok]
+    made_flag = (
+        shots["SHOT_MADE_FLAG"].to_numpy(dtype=float)[ok]
+        if "SHOT_MADE_FLAG" in shots.columns else np.zeros(len(x))
+    )
+
+    # Direct bin index + bincount is several times faster than histogram2d
+    ix = np.clip(((x - X_MIN) // cell).astype(np.intp), 0, shape[1] - 1)
+    iy = np.clip(((y - Y_MIN) // cell).astype(np.intp), 0, shape[0] - 1)
+    flat = iy * shape[1] + ix
+    n = shape[0] * shape[1]
+    attempts = np.bincount(flat, minlength=n).astype(float).reshape(shape)
+    made = np.bincount(flat, weights=np.nan_to_num(made_flag), minlength=n).reshape(shape)
+    return made, attempts
+
+
+# -------------------- FFT smoothing --------------------
+_GAUSS_FFT = {}
+
+def _gaussian_fft(shape, sigma):
+    """rfft2 of a unit-mass Gaussian on a `shape` grid (analytic transform, cached per shape/sigma)."""
+    key = (shape, round(float(sigma), 6))
+    g = _GAUSS_FFT.get(key)
+    if g is None:
+        fy = np.fft.fftfreq(shape[0])[:, None]
+        fx = np.fft.rfftfreq(shape[1])[None, :]
+        g = np.exp(-2.0 * (np.pi * sigma) ** 2 * (fx ** 2 + fy ** 2))
+        _GAUSS_FFT[key] = g
+    return g
+
+
+def _fast_len(n):
+    # next power of two -- numpy's pocketfft is fastest there
+    return 1 << int(np.ceil(np.log2(max(n, 2))))
+
+
+def fft_smooth(grid, sigma):
+    """
+    Convolve a 2-D grid with a Gaussian of `sigma` cells via FFT.
+    The grid is zero-padded by 4 sigma so nothing wraps around the court edges.
+    """
+    if sigma <= 0:
+        return grid.astype(float, copy=True)
+    pad = int(np.ceil(4 * sigma))
+    shape = (_fast_len(grid.shape[0] + pad), _fast_len(grid.shape[1] + pad))
+    spec = np.fft.rfft2(grid, s=shape)
+    out = np.fft.irfft2(spec * _gaussian_fft(shape, sigma), s=shape)
+    out = out[:grid.shape[0], :grid.shape[1]]
+    return np.clip(out, 0.0, None)
+
+
+# -------------------- league baseline --------------------
+def cell_zones(cell=10):
+    """
+    SHOT_ZONE_BASIC label for the center of every grid cell, from court geometry.
+    Corner threes are labelled 'Corner 3' (left/right are pooled for the baseline).
+    """
+    xe, ye = grid_edges(cell)
+    xc = (xe[:-1] + xe[1:]) / 2
+    yc = (ye[:-1] + ye[1:]) / 2
+    X, Y = np.meshgrid(xc, yc)
+    dist = np.hypot(X, Y)
+
+    zones = np.full(X.shape, "Mid-Range", dtype=object)
+    zones[(np.abs(X) <= 80) & (Y <= 142.5)] = "In The Paint (Non-RA)"
+    zones[dist <= 40] = "Restricted Area"
+    zones[(Y > 92.5) & (dist >= 237.5)] = "Above the Break 3"
+    zones[(Y <= 92.5) & (np.abs(X) >= 220)] = "Corner 3"
+    zones[Y > 422.5] = "Backcourt"
+    return zones
+
+
+def _zone_fg(df):
+    """{zone: FG%} from a frame with SHOT_ZONE_BASIC and FGM/FGA (or SHOT_MADE_FLAG) columns."""
+    if df is None or df.empty or "SHOT_ZONE_BASIC" not in df.columns:
+        return {}
+    zone = df["SHOT_ZONE_BASIC"].astype(str).str.replace(r"^(Left|Right) Corner 3$", "Corner 3", regex=True)
+    if "FGA" in df.columns and "FGM" in df.columns:
+        g = pd.DataFrame({"z": zone, "m": df["FGM"].astype(float), "a": df["FGA"].astype(float)})
+    elif "SHOT_MADE_FLAG" in df.columns:
+        g = pd.DataFrame({"z": zone, "m": df["SHOT_MADE_FLAG"].astype(float), "a": 1.0})
+    else:
+        return {}
+    g = g.groupby("z")[["m", "a"]].sum()
+    g = g[g["a"] > 0]
+    return (g["m"] / g["a"]).to_dict()
+
+
+def baseline_surface(season, season_type="Regular Season", cell=10, shots=None):
+    """
+    Per-cell league FG% baseline: league zone averages painted onto the grid.
+    Falls back to the supplied shots' own zone FG% when league averages are unavailable.
+    """
+    fg = _zone_fg(get_league_shot_averages(season, season_type=season_type))
+    if not fg:
+        fg = _zone_fg(shots)
+    zones = cell_zones(cell)
+    overall = float(np.mean(list(fg.values()))) if fg else 0.45
+    out = np.full(zones.shape, overall)
+    for z, v in fg.items():
+        out[zones == z] = v
+    return out
+
+
+# -------------------- smoothed efficiency surface --------------------
+def smoothed_fg_surface(shots, sigma_ft=2.0, cell=10, baseline=None, prior_weight=0.0, min_density=0.05):
+    """
+    Kernel-density FG% surface.
+      made_s, att_s = Gaussian(made), Gaussian(attempts)         (FFT convolution)
+      fg            = (made_s + k * baseline) / (att_s + k)       (k = prior_weight, in smoothed attempts)
+    With k = 0 this is the plain kernel ratio. Cells with att_s < min_density are NaN
+    so the court stays empty where the player never shoots.
+
+    Returns dict with x/y cell centers and 'fg', 'attempts', 'made' arrays shaped (ny, nx).
+    """
+    made, attempts = shot_grids(shots, cell=cell)
+    return smoothed_surface_from_grids(made, attempts, sigma_ft=sigma_ft, cell=cell, baseline=baseline,
+                                       prior_weight=prior_weight, min_density=min_density)
+
+
+def smoothed_surface_from_grids(made, attempts, sigma_ft=2.0, cell=10, baseline=None, prior_weight=0.0,
+                                min_density=0.05):
+    """smoothed_fg_surface() for pre-binned (made, attempts) grids, e.g. summed season partitions."""
+    sigma = float(sigma_ft) * 10.0 / cell
+    made_s = fft_smooth(made, sigma)
+    att_s = fft_smooth(attempts, sigma)
+
+    k = float(prior_weight or 0.0)
+    if baseline is None or k <= 0:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            fg = np.where(att_s > 0, made_s / att_s, np.nan)
+    else:
+        fg = (made_s + k * baseline) / (att_s + k)
+    fg = np.where(att_s >= min_density, np.clip(fg, 0.0, 1.0), np.nan)
+
+    xe, ye = grid_edges(cell)
+    out = {
+        "x": (xe[:-1] + xe[1:]) / 2,
+        "y": (ye[:-1] + ye[1:]) / 2,
+        "fg": fg,
+        "attempts": att_s,
+        "made": made_s,
+        "cell": cell,
+        "sigma_ft": float(sigma_ft),
+    }
+    for v in out.values():
+        if isinstance(v, np.ndarray):
+            v.setflags(write=False)
+    return out
+
+
+_HOT_ZONES = {}
+_HOT_ZONES_MAX = 64
+
+def player_hot_zones(player_id, season, season_type="Regular Season", sigma_ft=2.0, cell=10,
+                     prior_weight=0.0, refresh=False):
+    """
+    Smoothed FG% surface for one player-season, optionally shrunk toward the league baseline
+    (prior_weight > 0). Cached in memory per (player, season, season type, parameters).
+    Returns None when the player has no shots.
+    """
+    key = (player_id, season, season_type, float(sigma_ft), cell, float(prior_weight))
+    if not refresh and key in _HOT_ZONES:
+        return _HOT_ZONES[key]
+
+    shots = player_shot_index(player_id, season, season_type=season_type, refresh=refresh).frame
+    if shots.empty:
+        return None
+    baseline = baseline_surface(season, season_type, cell=cell, shots=shots) if prior_weight else None
+    surf = smoothed_fg_surface(shots, sigma_ft=sigma_ft, cell=cell, baseline=baseline, prior_weight=prior_weight)
+
+    _HOT_ZONES[key] = surf
+    while len(_HOT_ZONES) > _HOT_ZONES_MAX:
+        _HOT_ZONES.pop(next(iter(_HOT_ZONES)))
+    return surf
+
+
+# -------------------- indexed shot queries --------------------
+PERIOD_LABELS = {1: "1st", 2: "2nd", 3: "3rd", 4: "4th"}
+
+def period_label(p):
+    try:
+        p = int(p)
+    except Exception:
+        return "?"
+    return PERIOD_LABELS.get(p, "OT")
+
+
+def result_label(flag):
+    try:
+        return "Made" if int(flag) == 1 else "Missed"
+    except Exception:
+        return "?"
+
+
+class ShotIndex:
+    """
+    Read-only query index over one shot frame.
+
+    Categorical columns (period, action type, shot type, zone, result) get one packed bitmap per value;
+    GAME_DATE gets a sorted order so date ranges / 'last N games' are a searchsorted slice; with GAME_ID
+    (league / team frames, several games per date) 'last N games' counts games, not dates.
+    A query ORs the bitmaps of the chosen values within a column, ANDs across columns,
+    and takes the surviving rows once -- the frame itself is never rescanned.
+    """
+    CATEGORICAL = {
+        "PERIOD": period_label,
+        "ACTION_TYPE": str,
+        "SHOT_TYPE": str,
+        "SHOT_ZONE_BASIC": str,
+        "SHOT_MADE_FLAG": result_label,
+    }
+
+    def __init__(self, shots):
+        self.frame = shots.reset_index(drop=True)
+        self.n = len(self.frame)
+        self._bitmaps = {}   # column -> {value: packed bitmap}
+        for col, norm in self.CATEGORICAL.items():
+            if col not in self.frame.columns:
+                continue
+            # normalize the distinct values only (e.g. periods 5, 6, 7 all become 'OT')
+            codes, uniques = pd.factorize(self.frame[col], sort=True)
+            groups = {}
+            for i, u in enumerate(uniques):
+                groups.setdefault(norm(u), []).append(i)
+            self._bitmaps[col] = {
+                v: np.packbits(np.isin(codes, ids)) for v, ids in sorted(groups.items())
+            }
+
+        self._date_order = None
+        self._dates = None
+        if "GAME_DATE" in self.frame.columns:
+            dates = pd.to_datetime(self.frame["GAME_DATE"].astype(str), format="%Y%m%d", errors="coerce")
+            if dates.isna().all():
+                dates = pd.to_datetime(self.frame["GAME_DATE"], errors="coerce")
+            d = dates.to_numpy(dtype="datetime64[D]")
+            order = np.argsort(d, kind="stable")
+            self._date_order = order
+            self._dates = d[order]
+            self.game_dates = np.unique(self._dates[~np.isnat(self._dates)])
+        else:
+            self.game_dates = np.array([], dtype="datetime64[D]")
+
+        self._game_recency = None   # per row: 0 = most recent game
+        if self._dates is not None and "GAME_ID" in self.frame.columns:
+            g = pd.DataFrame({"d": d, "g": self.frame["GAME_ID"].to_numpy()})
+            games = g.drop_duplicates("g").sort_values(["d", "g"], na_position="first", kind="stable")["g"]
+            recency = pd.Series(np.arange(len(games))[::-1], index=games.to_numpy())
+            self._game_recency = recency.reindex(g["g"]).to_numpy()
+
+        self._all = np.packbits(np.ones(self.n, dtype=bool))
+        self._results = {}
+
+    def values(self, col):
+        """Sorted distinct values available for a categorical column."""
+        return list(self._bitmaps.get(col, {}).keys())
+
+    def _date_bitmap(self, date_from, date_to):
+        lo = 0 if date_from is None else np.searchsorted(self._dates, np.datetime64(date_from, "D"), side="left")
+        hi = len(self._dates) if date_to is None else np.searchsorted(self._dates, np.datetime64(date_to, "D"), side="right")
+        mask = np.zeros(self.n, dtype=bool)
+        mask[self._date_order[lo:hi]] = True
+        return np.packbits(mask)
+
+    def positions(self, periods=None, action_types=None, shot_types=None, zones=None, results=None,
+                  date_from=None, date_to=None, last_n_games=None):
+        """Row positions matching every given filter (None / empty = no filter on that column)."""
+        bits = self._all
+        for col, chosen in (
+            ("PERIOD", periods),
+            ("ACTION_TYPE", action_types),
+            ("SHOT_TYPE", shot_types),
+            ("SHOT_ZONE_BASIC", zones),
+            ("SHOT_MADE_FLAG", results),
+        ):
+            if not chosen or col not in self._bitmaps:
+                continue
+            index = self._bitmaps[col]
+            col_bits = np.zeros_like(bits)
+            for v in chosen:
+                b = index.get(v)
+                if b is not None:
+                    col_bits |= b
+            bits = bits & col_bits
+
+        if self._dates is not None:
+            if last_n_games and self._game_recency is not None:
+                bits = bits & np.packbits(self._game_recency < int(last_n_games))
+            elif last_n_games:
+                if len(self.game_dates) > int(last_n_games):
+                    cutoff = self.game_dates[-int(last_n_games)]
+                    date_from = cutoff if date_from is None else max(np.datetime64(date_from, "D"), cutoff)
+            if date_from is not None or date_to is not None:
+                bits = bits & self._date_bitmap(date_from, date_to)
+
+        return np.flatnonzero(np.unpackbits(bits, count=self.n))
+
+    def query(self, **filters):
+        """
+        Filtered shot frame. Same keywords as positions(); results are memoized per
+        filter combination, so treat the returned frame as read-only.
+        """
+        key = tuple(
+            (k, tuple(sorted(v)) if isinstance(v, (list, tuple, set)) else v)
+            for k, v in sorted(filters.items())
+        )
+        hit = self._results.get(key)
+        if hit is not None:
+            return hit
+        pos = self.positions(**filters)
+        out = self.frame if len(pos) == self.n else self.frame.take(pos).reset_index(drop=True)
+        if len(self._results) >= 32:
+            self._results.pop(next(iter(self._results)))
+        self._results[key] = out
+        return out
+
+
+_SHOT_INDEXES = {}
+_SHOT_INDEXES_MAX = 32
+
+def player_shot_index(player_id, season, season_type="Regular Season", refresh=False):
+    """ShotIndex over get_player_shotchart(...), built once per player-season and kept in memory."""
+    key = (player_id, season, season_type)
+    if not refresh and key in _SHOT_INDEXES:
+        return _SHOT_INDEXES[key]
+    idx = ShotIndex(get_player_shotchart(player_id, season, season_type=season_type, refresh=refresh))
+    if refresh:
+        # surfaces derived from the old frame are stale now
+        for k in [k for k in _HOT_ZONES if k[:3] == key]:
+            del _HOT_ZONES[k]
+    _SHOT_INDEXES[key] = idx
+    while len(_SHOT_INDEXES) > _SHOT_INDEXES_MAX:
+        _SHOT_INDEXES.pop(next(iter(_SHOT_INDEXES)))
+    return idx
+
+
+# -------------------- career profile (per-season partitions) --------------------
+# ShotChartDetail has location data from 1996-97 on.
+FIRST_SHOT_SEASON = "1996-97"
+
+def season_zone_table(shots):
+    """FGA / FGM per SHOT_ZONE_BASIC for one season's shots."""
+    if shots is None or shots.empty or "SHOT_ZONE_BASIC" not in shots.columns:
+        return pd.DataFrame(columns=["SHOT_ZONE_BASIC", "FGA", "FGM"])
+    made = shots["SHOT_MADE_FLAG"] if "SHOT_MADE_FLAG" in shots.columns else pd.Series(0, index=shots.index)
+    g = pd.DataFrame({"SHOT_ZONE_BASIC": shots["SHOT_ZONE_BASIC"].astype(str), "FGM": made.astype(int)})
+    out = g.groupby("SHOT_ZONE_BASIC")["FGM"].agg(FGA="size", FGM="sum").reset_index()
+    return out
+
+
+_CAREER = {}
+_CAREER_MAX = 64
+
+def player_career_shots(player_id, season_type="Regular Season", cell=10, refresh=False):
+    """
+    Career shot profile assembled from immutable per-season partitions.
+
+    Each season's zone table (data/cache/shot_profile_{pid}_{type}.csv) and made/attempt grids
+    (shot_grid_{pid}_{season}_{type}_{cell}.npz) are written once -- a completed season without
+    shots gets an all-zero grid as its marker. Completed seasons are never refetched or
+    re-aggregated; only the current season is rebuilt, and only on refresh.
+
+    Returns dict:
+      profile  -- SEASON, SHOT_ZONE_BASIC, FGA, FGM, FG_PCT, ZONE_SHARE (one row per season x zone)
+      made, attempts -- career grids (sum of the season grids)
+      seasons  -- seasons with at least one shot
+    """
+    tag = season_type.replace(" ", "_")
+    key = (player_id, tag, cell)
+    if not refresh and key in _CAREER:
+        return _CAREER[key]
+
+    current = _current_season_str()
+    seasons = [s for s in list_seasons_for_player(player_id, refresh=refresh, season_type=season_type) if s >= FIRST_SHOT_SEASON]
+
+    pp = _p(f"shot_profile_{player_id}_{tag}.csv")
+    profile = pd.DataFrame(columns=["SEASON", "SHOT_ZONE_BASIC", "FGA", "FGM"])
+    if pp.exists():
+        try:
+            profile = _load_csv(pp)
+        except Exception:
+            pass
+
+    grids = {}
+    changed = False
+    for season in seasons:
+        gp = _p(f"shot_grid_{player_id}_{season}_{tag}_{cell}.npz")
+        stale = refresh and season == current
+        if gp.exists() and not stale:
+            try:
+                with np.load(gp) as z:
+                    grids[season] = (z["made"], z["attempts"])
+                continue
+            except Exception:
+                pass
+
+        shots = get_player_shotchart(player_id, season, season_type=season_type, refresh=stale)
+        made, attempts = shot_grids(shots, cell=cell)
+        zt = season_zone_table(shots)
+        zt.insert(0, "SEASON", season)
+        profile = pd.concat([profile[profile["SEASON"] != season], zt], ignore_index=True)
+        # a frame without columns is a failed request; an empty completed season is persisted as a marker
+        if not shots.empty or (len(shots.columns) and season != current):
+            np.savez_compressed(gp, made=made, attempts=attempts)
+        grids[season] = (made, attempts)
+        changed = True
+
+    if changed:
+        profile = profile.sort_values(["SEASON", "SHOT_ZONE_BASIC"]).reset_index(drop=True)
+        _save_csv(pp, profile)
+
+    profile = profile[profile["SEASON"].isin(seasons)].copy()
+    profile["FGA"] = profile["FGA"].astype(int)
+    profile["FGM"] = profile["FGM"].astype(int)
+    profile["FG_PCT"] = profile["FGM"] / profile["FGA"].where(profile["FGA"] > 0)
+    profile["ZONE_SHARE"] = profile["FGA"] / profile.groupby("SEASON")["FGA"].transform("sum")
+
+    shape = shot_grids(None, cell=cell)[0].shape
+    made = np.zeros(shape)
+    attempts = np.zeros(shape)
+    for m, a in grids.values():
+        made += m
+        attempts += a
+
+    out = {
+        "profile": profile.reset_index(drop=True),
+        "made": made,
+        "attempts": attempts,
+        "seasons": sorted(profile["SEASON"].unique().tolist()),
+    }
+    _CAREER[key] = out
+    while len(_CAREER) > _CAREER_MAX:
+        _CAREER.pop(next(iter(_CAREER)))
+    return out
+
+
+# -------------------- team / opponent shot cube --------------------
+CUBE_CELL = 20   # 2 ft spatial bins
+
+def _with_opponent(shots):
+    """Add OPP_TEAM_ID: the other TEAM_ID that took shots in the same GAME_ID."""
+    g = shots.groupby("GAME_ID")["TEAM_ID"].agg(["min", "max"])
+    lo = shots["GAME_ID"].map(g["min"])
+    hi = shots["GAME_ID"].map(g["max"])
+    out = shots.copy()
+    out["OPP_TEAM_ID"] = np.where(shots["TEAM_ID"] == lo, hi, lo)
+    return out
+
+
+CUBE_KEYS = ["TEAM_ID", "OPP_TEAM_ID", "SHOT_ZONE_BASIC", "BIN"]
+
+def _cube_rows(shots, cell):
+    """Aggregate raw shots to (TEAM_ID, OPP_TEAM_ID, SHOT_ZONE_BASIC, BIN) -> FGA, FGM."""
+    if shots is None or shots.empty:
+        return pd.DataFrame(columns=CUBE_KEYS + ["FGA", "FGM"])
+    shots = _with_opponent(shots.dropna(subset=["LOC_X", "LOC_Y"]))
+    xe, ye = grid_edges(cell)
+    nx, ny = len(xe) - 1, len(ye) - 1
+    ix = np.clip(((shots["LOC_X"].to_numpy(float) - X_MIN) // cell).astype(np.intp), 0, nx - 1)
+    iy = np.clip(((shots["LOC_Y"].to_numpy(float) - Y_MIN) // cell).astype(np.intp), 0, ny - 1)
+    frame = pd.DataFrame({
+        "TEAM_ID": shots["TEAM_ID"].to_numpy(),
+        "OPP_TEAM_ID": shots["OPP_TEAM_ID"].to_numpy(),
+        "SHOT_ZONE_BASIC": shots["SHOT_ZONE_BASIC"].astype(str).to_numpy(),
+        "BIN": iy * nx + ix,
+        "FGM": shots["SHOT_MADE_FLAG"].fillna(0).astype(int).to_numpy(),
+    })
+    return frame.groupby(CUBE_KEYS)["FGM"].agg(FGA="size", FGM="sum").reset_index()
+
+
+def _sum_cube(parts):
+    """Add cube row frames cell by cell (negated FGA/FGM subtract); cells that reach 0 attempts are dropped."""
+    parts = [p for p in parts if p is not None and not p.empty]
+    if not parts:
+        return _cube_rows(None, CUBE_CELL)
+    rows = pd.concat(parts, ignore_index=True).groupby(CUBE_KEYS)[["FGA", "FGM"]].sum().reset_index()
+    return rows[rows["FGA"] > 0].reset_index(drop=True)
+
+
+def update_shot_cube(season, season_type="Regular Season", cell=CUBE_CELL, refresh=False):
+    """
+    Season shot cube: FGA/FGM by (TEAM_ID, OPP_TEAM_ID, SHOT_ZONE_BASIC, BIN), persisted as
+
+        data/cache/shot_cube_{season}_{season_type}_{cell}.csv   (+ .json listing the GAME_IDs folded in)
+
+    Only games that are not in the cube yet are aggregated and added, so a refresh costs
+    the new games rather than the season. Games on the last GAME_DATE may still be in progress
+    (get_league_shots re-reads that date on its next refresh), so they are kept "open": their rows
+    are stored in the .json too, taken back out and re-aggregated on every update, and their
+    GAME_IDs are only recorded once a later date exists.
+    """
+    tag = season_type.replace(" ", "_")
+    cp = _p(f"shot_cube_{season}_{tag}_{cell}.csv")
+    mp = _p(f"shot_cube_{season}_{tag}_{cell}.json")
+
+    cube, games, open_rows = None, set(), None
+    if cp.exists() and mp.exists():
+        try:
+            cube = _load_csv(cp)
+            meta = _load_json(mp)
+            games = set(int(g) for g in meta.get("games", []))
+            open_rows = pd.DataFrame(meta.get("open", []), columns=cube.columns)
+        except Exception:
+            cube, games, open_rows = None, set(), None
+    if cube is not None and not refresh:
+        return cube
+
+    shots = get_league_shots(season, season_type=season_type, refresh=refresh)
+    if shots.empty:
+        return cube if cube is not None else _cube_rows(None, cell)
+
+    new = shots[~shots["GAME_ID"].isin(games)]
+    is_open = (new["GAME_DATE"] == shots["GAME_DATE"].max()).to_numpy()
+    done = _cube_rows(new[~is_open], cell)
+    still_open = _cube_rows(new[is_open], cell)
+    if open_rows is not None and not open_rows.empty:
+        open_rows = open_rows.assign(FGA=-open_rows["FGA"], FGM=-open_rows["FGM"])
+    rows = _sum_cube([cube, open_rows, done, still_open])
+    games.update(int(g) for g in new.loc[~is_open, "GAME_ID"].dropna().unique())
+    _save_csv(cp, rows)
+    _save_json(mp, {"games": sorted(games), "open": still_open.to_dict("records"), "cell": cell})
+    return rows
+
+
+class TeamShotCube:
+    """
+    In-memory view of one season cube, indexed by team for both sides of the ball:
+      offense[team_id] -- shots the team took;  defense[team_id] -- shots its opponents took.
+    Each entry is {'made', 'attempts' (grids), 'zones' (SHOT_ZONE_BASIC, FGA, FGM)}.
+    """
+    def __init__(self, rows, cell=CUBE_CELL):
+        self.cell = cell
+        shape = shot_grids(None, cell=cell)[0].shape
+        n = shape[0] * shape[1]
+        self.offense, self.defense = {}, {}
+        self.league = self._entry(rows, shape, n)
+        for side, col in (("offense", "TEAM_ID"), ("defense", "OPP_TEAM_ID")):
+            index = getattr(self, side)
+            for team_id, part in rows.groupby(col):
+                index[int(team_id)] = self._entry(part, shape, n)
+
+    @staticmethod
+    def _entry(part, shape, n):
+        b = part["BIN"].to_numpy(np.intp)
+        made = np.bincount(b, weights=part["FGM"].to_numpy(float), minlength=n).reshape(shape)
+        att = np.bincount(b, weights=part["FGA"].to_numpy(float), minlength=n).reshape(shape)
+        zones = part.groupby("SHOT_ZONE_BASIC")[["FGA", "FGM"]].sum().reset_index()
+        return {"made": made, "attempts": att, "zones": zones}
+
+    def team(self, team_id, side="offense"):
+        return getattr(self, side).get(int(team_id))
+
+
+_TEAM_CUBES = {}
+
+def team_shot_cube(season, season_type="Regular Season", cell=CUBE_CELL, refresh=False):
+    """TeamShotCube for a season, built once per process (rebuilt after a refresh)."""
+    key = (season, season_type, cell)
+    if not refresh and key in _TEAM_CUBES:
+        return _TEAM_CUBES[key]
+    cube = TeamShotCube(update_shot_cube(season, season_type=season_type, cell=cell, refresh=refresh), cell=cell)
+    _TEAM_CUBES[key] = cube
+    return cube
+
+
+def team_shot_profile(team_id, season, season_type="Regular Season", side="offense", refresh=False):
+    """
+    One lookup into the season cube: grids and zone table for a team's shots ('offense')
+    or the shots it allowed ('defense'), plus the league entry for baselines. None if missing.
+    """
+    cube = team_shot_cube(season, season_type=season_type, refresh=refresh)
+    entry = cube.team(team_id, side)
+    if entry is None:
+        return None
+    return {**entry, "league": cube.league, "cell": cube.cell}
+
+
+# -------------------- league-scale rasterization --------------------
+def rasterize(x, y, values=None, width=250, height=246, how="count"):
+    """
+    Aggregate points into a fixed (height, width) pixel grid over the half court.
+      how='count' -- points per pixel;  how='mean' -- mean of `values` per pixel (NaN where empty).
+    Cost is one bincount over the points; the output size never depends on len(x).
+    Row 0 is the baseline side (lowest LOC_Y).
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    ok = np.isfinite(x) & np.isfinite(y) & (x >= X_MIN) & (x < X_MAX) & (y >= Y_MIN) & (y < Y_MAX)
+    ix = ((x[ok] - X_MIN) * (width / (X_MAX - X_MIN))).astype(np.intp)
+    iy = ((y[ok] - Y_MIN) * (height / (Y_MAX - Y_MIN))).astype(np.intp)
+    flat = iy * width + ix
+    n = width * height
+    counts = np.bincount(flat, minlength=n).astype(float).reshape(height, width)
+    if how == "count":
+        return counts
+    if how == "mean":
+        w = np.nan_to_num(np.asarray(values, dtype=float)[ok])
+        sums = np.bincount(flat, weights=w, minlength=n).reshape(height, width)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(counts > 0, sums / counts, np.nan)
+    raise ValueError(f"unknown aggregation: {how}")
+
+
+def normalize_raster(img, how="eq_hist"):
+    """
+    Map an aggregate to [0, 1] for coloring; empty pixels (0 or NaN) stay NaN.
+      'linear' -- v / max;  'log' -- log1p(v) / log1p(max);
+      'eq_hist' -- rank of v among the non-empty pixels (histogram equalization).
+    """
+    img = np.asarray(img, dtype=float)
+    filled = np.isfinite(img) & (img > 0)
+    out = np.full(img.shape, np.nan)
+    if not filled.any():
+        return out
+    v = img[filled]
+    if how == "linear":
+        out[filled] = v / v.max()
+    elif how == "log":
+        out[filled] = np.log1p(v) / np.log1p(v.max())
+    elif how == "eq_hist":
+        uniq, inverse, counts = np.unique(v, return_inverse=True, return_counts=True)
+        cdf = np.cumsum(counts).astype(float)
+        cdf = (cdf - cdf[0]) / max(cdf[-1] - cdf[0], 1.0)
+        out[filled] = cdf[inverse] if len(uniq) > 1 else 1.0
+    else:
+        raise ValueError(f"unknown normalization: {how}")
+    return out
+
+
+_LEAGUE_INDEXES = {}
+
+def league_shot_index(season, season_type="Regular Season", refresh=False):
+    """
+    ShotIndex over every league shot of a season (get_league_shots), built once per process.
+    Building a new index drops the cached rasters, which are views of the previous one.
+    """
+    key = (season, season_type)
+    if not refresh and key in _LEAGUE_INDEXES:
+        return _LEAGUE_INDEXES[key]
+    idx = ShotIndex(get_league_shots(season, season_type=season_type, refresh=refresh))
+    _LEAGUE_INDEXES.clear()   # one league season in memory at a time
+    _RASTERS.clear()
+    _LEAGUE_INDEXES[key] = idx
+    return idx
+
+
+_RASTERS = {}
+_RASTERS_MAX = 32
+
+def query_hash(**params):
+    """Stable short hash of a query's parameters (used as the raster cache key)."""
+    blob = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha1(blob.encode()).hexdigest()[:16]
+
+
+def league_raster(season, season_type="Regular Season", how="count", norm="eq_hist",
+                  width=250, height=246, refresh=False, **filters):
+    """
+    Rasterized league shot map for any ShotIndex filter combination
+    (periods, shot_types, action_types, zones, results, date range...).
+      how='count' -> shot density;  how='mean' -> FG% per pixel.
+    Returns dict: image (normalized 0..1, NaN = empty), raw aggregate, n shots, pixel geometry and
+    the query hash. Cached in memory by query hash.
+    """
+    qh = query_hash(season=season, season_type=season_type, how=how, norm=norm,
+                    width=width, height=height, **filters)
+    if not refresh and qh in _RASTERS:
+        return _RASTERS[qh]
+
+    idx = league_shot_index(season, season_type=season_type, refresh=refresh)
+    if idx.n == 0:
+        return None
+    pos = idx.positions(**filters)
+    f = idx.frame
+    x = f["LOC_X"].to_numpy(dtype=float)[pos]
+    y = f["LOC_Y"].to_numpy(dtype=float)[pos]
+    vals = f["SHOT_MADE_FLAG"].to_numpy(dtype=float)[pos] if how == "mean" else None
+
+    raw = rasterize(x, y, values=vals, width=width, height=height, how=how)
+    # FG% is already on a 0..1 scale (NaN where nobody shot); counts get normalized
+    image = raw if how == "mean" else normalize_raster(raw, norm)
+
+    out = {
+        "image": image,
+        "raw": raw,
+        "n": int(len(pos)),
+        "x0": X_MIN + (X_MAX - X_MIN) / width / 2,
+        "dx": (X_MAX - X_MIN) / width,
+        "y0": Y_MIN + (Y_MAX - Y_MIN) / height / 2,
+        "dy": (Y_MAX - Y_MIN) / height,
+        "hash": qh,
+    }
+    _RASTERS[qh] = out
+    while len(_RASTERS) > _RASTERS_MAX:
+        _RASTERS.pop(next(iter(_RASTERS)))
+    return out
@@ -0,0 +1,191 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from courtvision.data.nba_client import (
+    _p, _current_season_str, _num, _usage_rate, _true_shooting,
+    _league_player_totals,
+    _league_team_base,
+)
+
+# Style vector: per-36 production plus shooting / usage rates
+SIM_FEATURES = [
+    "PTS_36", "REB_36", "OREB_36", "AST_36", "STL_36", "BLK_36", "TOV_36",
+    "FG3A_36", "FTA_36", "TS_PCT", "FG3A_RATE", "USG_PCT",
+]
+SIM_MIN_MINUTES = 300   # players below this are too noisy to index
+
+
+# -------------------- per-season blocks --------------------
+def season_features(season, refresh=False):
+    """Raw similarity features for every player with at least SIM_MIN_MINUTES in a season."""
+    p = _league_player_totals(season, refresh=refresh)
+    if p.empty:
+        return pd.DataFrame()
+    MIN = _num(p, "MIN")
+    keep = MIN >= SIM_MIN_MINUTES
+    if not keep.any():
+        return pd.DataFrame()
+    p = p[keep].reset_index(drop=True)
+    MIN = MIN[keep]
+
+    teams = _league_team_base(season, refresh=refresh)
+    tt = teams.drop_duplicates("TEAM_ID").set_index("TEAM_ID") if not teams.empty else pd.DataFrame()
+    tid = pd.to_numeric(p["TEAM_ID"], errors="coerce").fillna(0).astype(int)
+    def team_col(c):
+        return tid.map(tt[c] if c in tt.columns else pd.Series(dtype=float)).fillna(0.0).to_numpy(float)
+
+    FGA, FG3A, FTA, TOV = _num(p, "FGA"), _num(p, "FG3A"), _num(p, "FTA"), _num(p, "TOV", "TO")
+    out = pd.DataFrame({
+        "PLAYER_ID": p["PLAYER_ID"].to_numpy(),
+        "PLAYER_NAME": p["PLAYER_NAME"].astype(str).to_numpy(),
+        "TEAM_ABBREVIATION": p["TEAM_ABBREVIATION"].astype(str).to_numpy() if "TEAM_ABBREVIATION" in p.columns else "",
+        "SEASON": season,
+        "MIN": MIN,
+    })
+    for c in ["PTS", "REB", "OREB", "AST", "STL", "BLK", "TOV", "FG3A", "FTA"]:
+        out[f"{c}_36"] = _num(p, c) * 36.0 / MIN
+    out["TS_PCT"] = _true_shooting(_num(p, "PTS"), FGA, FTA)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out["FG3A_RATE"] = np.where(FGA > 0, 100.0 * FG3A / FGA, 0.0)
+    out["USG_PCT"] = _usage_rate(MIN, FGA, FTA, TOV, team_col("FGA"), team_col("FTA"), team_col("TOV"), team_col("GP"))
+    out[SIM_FEATURES] = out[SIM_FEATURES].fillna(out[SIM_FEATURES].mean()).fillna(0.0)
+    return out
+
+
+def _season_vectors(features):
+    """Z-score each feature within the season, then scale rows to unit length (cosine = dot product)."""
+    X = features[SIM_FEATURES].to_numpy(float)
+    sd = X.std(axis=0)
+    Z = (X - X.mean(axis=0)) / np.where(sd > 0, sd, 1.0)
+    norm = np.linalg.norm(Z, axis=1, keepdims=True)
+    return (Z / np.where(norm > 0, norm, 1.0)).astype(np.float32)
+
+
+_BLOCKS = {}
+
+def season_block(season, refresh=False):
+    """
+    Normalized vectors and labels for one season, persisted as data/cache/similarity_{season}.npz.
+    Completed seasons are built once; the current season is rebuilt on refresh.
+    Returns dict (ids, names, teams, seasons, minutes, raw, vectors) or None.
+    """
+    rebuild = refresh and season == _current_season_str()
+    if not rebuild and season in _BLOCKS:
+        return _BLOCKS[season]
+
+    cp = _p(f"similarity_{season}.npz")
+    block = None
+    if cp.exists() and not rebuild:
+        try:
+            with np.load(cp) as z:
+                block = {k: z[k] for k in z.files}
+        except Exception:
+            block = None
+    if block is None:
+        f = season_features(season, refresh=rebuild)
+        if f.empty:
+            return None
+        block = {
+            "ids": f["PLAYER_ID"].to_numpy(np.int64),
+            "names": f["PLAYER_NAME"].to_numpy(str),
+            "teams": f["TEAM_ABBREVIATION"].to_numpy(str),
+            "seasons": f["SEASON"].to_numpy(str),
+            "minutes": f["MIN"].to_numpy(float),
+            "raw": f[SIM_FEATURES].to_numpy(float),
+            "vectors": _season_vectors(f),
+        }
+        np.savez(cp, **block)
+    _BLOCKS[season] = block
+    return block
+
+
+# -------------------- index --------------------
+class SimilarityIndex:
+    """
+    Brute-force cosine index over stacked season blocks.
+    Vectors are unit length, so one matrix-vector product (BLAS) scores every player-season.
+    """
+    def __init__(self, blocks):
+        blocks = [b for b in blocks if b is not None]
+        cat = lambda k: np.concatenate([b[k] for b in blocks]) if blocks else np.array([])
+        self.ids = cat("ids").astype(np.int64)
+        self.seasons = cat("seasons").astype(str)
+        self.names = cat("names").astype(str)
+        self.teams = cat("teams").astype(str)
+        self.minutes = cat("minutes").astype(float)
+        self.raw = np.vstack([b["raw"] for b in blocks]) if blocks else np.zeros((0, len(SIM_FEATURES)))
+        self.X = np.ascontiguousarray(
+            np.vstack([b["vectors"] for b in blocks]) if blocks else np.zeros((0, len(SIM_FEATURES)), np.float32)
+        )
+        self.n = len(self.ids)
+        self._rows = {(int(i), s): r for r, (i, s) in enumerate(zip(self.ids, self.seasons))}
+
+    def _frame(self, rows, scores):
+        out = pd.DataFrame({
+            "PLAYER_ID": self.ids[rows],
+            "PLAYER_NAME": self.names[rows],
+            "SEASON": self.seasons[rows],
+            "TEAM_ABBREVIATION": self.teams[rows],
+            "SIMILARITY": np.round(scores.astype(float) * 100.0, 1),
+            "MIN": self.minutes[rows],
+        })
+        return pd.concat([out, pd.DataFrame(self.raw[rows], columns=SIM_FEATURES)], axis=1)
+
+    def row(self, player_id, season):
+        """The query player-season as a one-row frame (similarity 100), or empty if not indexed."""
+        r = self._rows.get((int(player_id), season))
+        if r is None:
+            return pd.DataFrame()
+        return self._frame(np.array([r]), np.array([1.0]))
+
+    def query(self, player_id, season, k=10, exclude_player=True):
+        """The k player-seasons closest to (player_id, season); the player's own seasons are skipped by default."""
+        r = self._rows.get((int(player_id), season))
+        if r is None or self.n < 2:
+            return pd.DataFrame()
+        scores = self.X @ self.X[r]
+        scores[r] = -np.inf
+        if exclude_player:
+            scores[self.ids == int(player_id)] = -np.inf
+        k = min(k, int(np.isfinite(scores).sum()))
+        if k <= 0:
+            return pd.DataFrame()
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return self._frame(top, scores[top])
+
+
+_INDEXES = {}
+_INDEXES_MAX = 8   # one float32 matrix per season window
+
+def similarity_index(seasons, refresh=False, max_workers=4):
+    """Index over the given seasons; missing season blocks are built in parallel."""
+    key = tuple(seasons)
+    if refresh:
+        _BLOCKS.pop(_current_season_str(), None)
+        for k in [k for k in _INDEXES if _current_season_str() in k]:
+            del _INDEXES[k]
+    if key in _INDEXES:
+        return _INDEXES[key]
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(key)))) as ex:
+        blocks = list(ex.map(lambda s: season_block(s, refresh=refresh), key))
+    index = SimilarityIndex(blocks)
+    _INDEXES[key] = index
+    while len(_INDEXES) > _INDEXES_MAX:
+        _INDEXES.pop(next(iter(_INDEXES)))
+    return index
+
+
+def similar_players(player_id, season, seasons=None, k=10, refresh=False):
+    """
+    The k most similar player-seasons to a player's season.
+    seasons=None searches only that season; pass e.g. nba_client.seasons_since() to search across history.
+    Returns (query_row, matches) DataFrames; both empty if the player isn't indexed for that season.
+    """
+    seasons = [season] if seasons is None else list(seasons)
+    if season not in seasons:
+        seasons.append(season)
+    index = similarity_index(seasons, refresh=refresh)
+    return index.row(player_id, season), index.query(player_id, season, k=k)
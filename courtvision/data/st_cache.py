@@ -0,0 +1,188 @@
+"""
+Streamlit caching for the data layer -- the pages import their data from here.
+
+- Getters that return tables / plain values are wrapped in st.cache_data, keyed by their arguments.
+  The disk cache (data/cache) stays the source of truth: completed seasons there never change and
+  the current season only changes on refresh, so the TTL just bounds how long a session can keep
+  showing a value another session has since refreshed.
+- Shared objects (leaderboards, shot indexes) are already held once per process by the data layer,
+  so they are served from there directly.
+- refresh=True refetches through the data layer and then drops only that call's cache key.
+  A page showing several views of one fetched table (career rows, the league team summary, a
+  franchise history) calls the matching refresh_* once and reads the views without refresh.
+"""
+import streamlit as st
+
+from courtvision.data import nba_client as nc
+from courtvision.data import leaders, shots, similarity
+
+DATA_TTL = 3600          # seconds
+DATA_MAX_ENTRIES = 512
+
+
+def _read(cached, source, *args, refresh=False, **kwargs):
+    """cached(*args, **kwargs); on refresh first rebuild through source(..., refresh=True) and drop the key."""
+    if refresh:
+        source(*args, refresh=True, **kwargs)
+        cached.clear(*args, **kwargs)
+    return cached(*args, **kwargs)
+
+
+# -------------------- shared resources --------------------
+league_leaderboard = leaders.league_leaderboard
+player_shot_index = shots.player_shot_index
+league_shot_index = shots.league_shot_index
+
+
+# -------------------- players --------------------
+@st.cache_data(ttl=DATA_TTL, max_entries=DATA_MAX_ENTRIES, show_spinner=False)
+def search_players(query, limit=50):
+    return nc.search_players(query, limit=limit)
+
+@st.cache_data(ttl=DATA_TTL, show_spinner=False)
+def list_all_players():
+    return nc.list_all_players()
+
+@st.cache_data(ttl=DATA_TTL, max_entries=DATA_MAX_ENTRIES, show_spinner=False)
+def _get_player_card(player_id):
+    return nc.get_player_card(player_id)
+
+def get_player_card(player_id, refresh=False):
+    return _read(_get_player_card, nc.get_player_card, player_id, refresh=refresh)
+
+@st.cache_data(ttl=DATA_TTL, max_entries=DATA_MAX_ENTRIES, show_spinner=False)
+def _list_seasons_for_player(player_id, season_type="Regular Season"):
+    return nc.list_seasons_for_player(player_id, season_type=season_type)
+
+def list_seasons_for_player(player_id, refresh=False, season_type="Regular Season"):
+    return _read(_list_seasons_for_player, nc.list_seasons_for_player, player_id, refresh=refresh, season_type=season_type)
+
+@st.cache_data(ttl=DATA_TTL, max_entries=DATA_MAX_ENTRIES, show_spinner=False)
+def _get_player_season_totals(player_id, season_id, season_type="Regular Season"):
+    return nc.get_player_season_totals(player_id, season_id, season_type=season_type)
+
+def get_player_season_totals(player_id, season_id, refresh=False, season_type="Regular Season"):
+    return _read(_get_player_season_totals, nc.get_player_season_totals, player_id, season_id, refresh=refresh, season_type=season_type)
+
+@st.cache_data(ttl=DATA_TTL, max_entries=DATA_MAX_ENTRIES, show_spinner=False)
+def _player_career_pts_fg(player_id, season_type="Regular Season"):
+    return nc.player_career_pts_fg(player_id, season_type=season_type)
+
+def player_career_pts_fg(player_id, refresh=False, season_type="Regular Season"):
+    return _read(_player_career_pts_fg, nc.player_career_pts_fg, player_id, refresh=refresh, season_type=season_type)
+
+@st.cache_data(ttl=DATA_TTL, max_entries=DATA_MAX_ENTRIES, show_spinner=False)
+def _player_playoff_seasons(player_id):
+    return nc.player_playoff_seasons(player_id)
+
+def player_playoff_seasons(player_id, refresh=False):
+    return _read(_player_playoff_seasons, nc.player_playoff_seasons, player_id, refresh=refresh)
+
+@st.cache_data(ttl=DATA_TTL, max_entries=DATA_MAX_ENTRIES, show_spinner=False)
+def _player_career_totals(player_id):
+    return nc.player_career_totals(player_id)
+
+def player_career_totals(player_id, refresh=False):
+    return _read(_player_career_totals, nc.player_career_totals, player_id, refresh=refresh)
+
+def refresh_player_career(player_id):
+    """Refetch the player's career response once and drop every cached view of it (all players' keys)."""
+    nc.refresh_player_career(player_id)
+    for cached in (_list_seasons_for_player, _get_player_season_totals, _player_career_pts_fg,
+                   _player_playoff_seasons, _player_career_totals):
+        cached.clear()
+
+@st.cache_data(ttl=DATA_TTL, max_entries=DATA_MAX_ENTRIES, show_spinner=False)
+def _compare_players(player_ids, season, season_type="Regular Season"):
+    return nc.compare_players(player_ids, season, season_type=season_type)
+
+def compare_players(player_ids, season, refresh=False, season_type="Regular Season"):
+    return _read(_compare_players, nc.compare_players, list(player_ids), season, refresh=refresh, season_type=season_type)
+
+@st.cache_data(ttl=DATA_TTL, max_entries=DATA_MAX_ENTRIES, show_spinner=False)
+def _similar_players(player_id, season, seasons=None, k=10):
+    return similarity.similar_players(player_id, season, seasons=seasons, k=k)
+
+def similar_players(player_id, season, seasons=None, k=10, refresh=False):
+    seasons = None if seasons is None else list(seasons)
+    return _read(_similar_players, similarity.similar_players, player_id, season, seasons=seasons, k=k, refresh=refresh)
+
+
+# -------------------- teams --------------------
+@st.cache_data(ttl=DATA_TTL, max_entries=DATA_MAX_ENTRIES, show_spinner=False)
+def _team_players_for_dropdown(team_id, season):
+    return nc.team_players_for_dropdown(team_id, season)
+
+def team_players_for_dropdown(team_id, season, refresh=False):
+    return _read(_team_players_for_dropdown, nc.team_players_for_dropdown, team_id, season, refresh=refresh)
+
+@st.cache_data(ttl=DATA_TTL, max_entries=DATA_MAX_ENTRIES, show_spinner=False)
+def _get_team_roster(team_id, season):
+    return nc.get_team_roster(team_id, season)
+
+def get_team_roster(team_id, season, refresh=False):
+    return _read(_get_team_roster, nc.get_team_roster, team_id, season, refresh=refresh)
+
+@st.cache_data(ttl=DATA_TTL, max_entries=DATA_MAX_ENTRIES, show_spinner=False)
+def _get_team_record_and_ratings(team_id, season, season_type="Regular Season"):
+    return nc.get_team_record_and_ratings(team_id, season, season_type=season_type)
+
+def get_team_record_and_ratings(team_id, season, refresh=False, season_type="Regular Season"):
+    return _read(_get_team_record_and_ratings, nc.get_team_record_and_ratings, team_id, season,
+                 refresh=refresh, season_type=season_type)
+
+@st.cache_data(ttl=DATA_TTL, max_entries=DATA_MAX_ENTRIES, show_spinner=False)
+def _league_standings(season, season_type="Regular Season"):
+    return nc.league_standings(season, season_type=season_type)
+
+def league_standings(season, refresh=False, season_type="Regular Season"):
+    return _read(_league_standings, nc.league_standings, season, refresh=refresh, season_type=season_type)
+
+def refresh_team_summary(season, season_type="Regular Season"):
+    """Rebuild the league team summary once and drop the team KPI and standings views of it."""
+    nc.league_team_summary(season, refresh=True, season_type=season_type)
+    _get_team_record_and_ratings.clear()
+    _league_standings.clear()
+
+@st.cache_data(ttl=DATA_TTL, max_entries=DATA_MAX_ENTRIES, show_spinner=False)
+def _get_team_splits(team_id, season, split="Location", season_type="Regular Season"):
+    return nc.get_team_splits(team_id, season, split, season_type=season_type)
+
+def get_team_splits(team_id, season, split="Location", refresh=False, season_type="Regular Season"):
+    return _read(_get_team_splits, nc.get_team_splits, team_id, season, split, refresh=refresh, season_type=season_type)
+
+@st.cache_data(ttl=DATA_TTL, max_entries=DATA_MAX_ENTRIES, show_spinner=False)
+def _team_player_stats_view(team_id, season, season_type="Regular Season"):
+    return nc.team_player_stats_view(team_id, season, season_type=season_type)
+
+def team_player_stats_view(team_id, season, refresh=False, season_type="Regular Season"):
+    return _read(_team_player_stats_view, nc.team_player_stats_view, team_id, season,
+                 refresh=refresh, season_type=season_type)
+
+@st.cache_data(ttl=DATA_TTL, max_entries=DATA_MAX_ENTRIES, show_spinner=False)
+def _team_history(team_id):
+    return nc.team_history(team_id)
+
+def team_history(team_id, refresh=False):
+    return _read(_team_history, nc.team_history, team_id, refresh=refresh)
+
+@st.cache_data(ttl=DATA_TTL, max_entries=DATA_MAX_ENTRIES, show_spinner=False)
+def _franchise_decades(team_id):
+    return nc.franchise_decades(team_id)
+
+def franchise_decades(team_id, refresh=False):
+    return _read(_franchise_decades, nc.franchise_decades, team_id, refresh=refresh)
+
+def refresh_team_history(team_id):
+    """Refetch the franchise history once and drop its history and decade views."""
+    nc.team_history(team_id, refresh=True)
+    _team_history.clear(team_id)
+    _franchise_decades.clear(team_id)
+
+@st.cache_data(ttl=DATA_TTL, max_entries=DATA_MAX_ENTRIES, show_spinner=False)
+def _get_team_h2h_games(team_id_a, team_id_b, season, season_type="Regular Season"):
+    return nc.get_team_h2h_games(team_id_a, team_id_b, season, season_type=season_type)
+
+def get_team_h2h_games(team_id_a, team_id_b, season, refresh=False, season_type="Regular Season"):
+    return _read(_get_team_h2h_games, nc.get_team_h2h_games, team_id_a, team_id_b, season,
+                 refresh=refresh, season_type=season_type)
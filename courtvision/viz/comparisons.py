@@ -0,0 +1,48 @@
+import numpy as np
+
+import plotly.graph_objects as go
+
+# Radar axes: column -> label
+RADAR_METRICS = {
+    "PPG": "Points",
+    "RPG": "Rebounds",
+    "APG": "Assists",
+    "SPG": "Steals",
+    "BPG": "Blocks",
+    "TS_PCT": "TS%",
+    "USG_PCT": "Usage",
+    "PER": "PER",
+}
+
+
+def build_radar_figure(table, metrics=RADAR_METRICS):
+    """
+    One polar trace per player. Each axis is scaled to the best of the compared players (= 1),
+    so players with very different volumes still share a readable chart; hover shows raw values.
+    """
+    cols = [c for c in metrics if c in table.columns]
+    labels = [metrics[c] for c in cols]
+    raw = table[cols].to_numpy(float)
+    top = np.where(raw > 0, raw, 0.0).max(axis=0) if len(raw) else np.ones(len(cols))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scaled = np.nan_to_num(np.clip(raw / np.where(top > 0, top, np.nan), 0, 1))
+
+    fig = go.Figure()
+    for i, name in enumerate(table["NAME"]):
+        label = f"{name} ({table['SEASON'].iloc[i]})"
+        fig.add_trace(go.Scatterpolar(
+            r=np.append(scaled[i], scaled[i][:1]),
+            theta=labels + labels[:1],
+            customdata=np.append(raw[i], raw[i][:1]),
+            name=label,
+            fill="toself",
+            opacity=0.55,
+            hovertemplate=f"{label}<br>%{{theta}}: %{{customdata:.1f}}<extra></extra>",
+        ))
+    fig.update_layout(
+        polar=dict(radialaxis=dict(range=[0, 1], showticklabels=False)),
+        legend=dict(orientation="h", yanchor="top", y=-0.1),
+        height=520,
+        margin=dict(l=40, r=40, t=40, b=40),
+    )
+    return fig
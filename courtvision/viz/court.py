@@ -0,0 +1,144 @@
+import numpy as np
+
+# Court extents used by every shot chart (NBA stats units: 1/10 ft, hoop at origin)
+X_RANGE = [-250, 250]
+Y_RANGE = [-52, 440]
+
+# -------------------- geometry --------------------
+def _build_court_lines():
+    """
+    Generate court line coordinates as numpy arrays for plotting.
+    Returns tuple of (x, y) arrays for each court element.
+    """
+    lines = []
+
+    # Court dimensions
+    baseline_y = -47.5
+    court_width = 250
+
+    # ===== OUTER BOUNDARY =====
+    # Baseline
+    lines.append((np.array([-court_width, court_width]), np.array([baseline_y, baseline_y])))
+    # Left sideline
+    lines.append((np.array([-court_width, -court_width]), np.array([baseline_y, 470])))
+    # Right sideline
+    lines.append((np.array([court_width, court_width]), np.array([baseline_y, 470])))
+
+    # ===== BACKBOARD =====
+    lines.append((np.array([-30, 30]), np.array([-7.5, -7.5])))
+
+    # ===== HOOP =====
+    hoop_theta = np.linspace(0, 2*np.pi, 50)
+    lines.append((7.5 * np.cos(hoop_theta), 7.5 * np.sin(hoop_theta)))
+
+    # ===== PAINT/KEY =====
+    lane_width = 80  # half width on each side
+    free_throw_y = baseline_y + 190
+
+    # Left lane line
+    lines.append((np.array([-lane_width, -lane_width]), np.array([baseline_y, free_throw_y])))
+    # Right lane line
+    lines.append((np.array([lane_width, lane_width]), np.array([baseline_y, free_throw_y])))
+    # Free throw line
+    lines.append((np.array([-lane_width, lane_width]), np.array([free_throw_y, free_throw_y])))
+
+    # ===== FREE THROW CIRCLE =====
+    # Top arc (solid)
+    ft_theta = np.linspace(0, np.pi, 50)
+    lines.append((60 * np.cos(ft_theta), 60 * np.sin(ft_theta) + free_throw_y))
+
+    # ===== RESTRICTED AREA =====
+    # Small arc under basket
+    restricted_theta = np.linspace(0, np.pi, 30)
+    lines.append((40 * np.cos(restricted_theta), 40 * np.sin(restricted_theta)))
+
+    # ===== THREE-POINT LINE =====
+    # Left corner
+    lines.append((np.array([-220, -220]), np.array([baseline_y, 92.5])))
+    # Right corner
+    lines.append((np.array([220, 220]), np.array([baseline_y, 92.5])))
+
+    # Three-point arc
+    corner_angle = np.arctan2(92.5, 220)
+    three_theta = np.linspace(corner_angle, np.pi - corner_angle, 100)
+    lines.append((237.5 * np.cos(three_theta), 237.5 * np.sin(three_theta)))
+
+    for x, y in lines:
+        x.setflags(write=False)
+        y.setflags(write=False)
+    return tuple(lines)
+
+
+def _lines_to_path(lines):
+    """Encode all court lines as one SVG path string (one M...L run per element)."""
+    parts = []
+    for x, y in lines:
+        pts = [f"{px:.1f},{py:.1f}" for px, py in zip(x, y)]
+        parts.append("M" + "L".join(pts))
+    return "".join(parts)
+
+
+# Built once per process; every figure reuses the same geometry.
+COURT_LINES = _build_court_lines()
+COURT_PATH = _lines_to_path(COURT_LINES)
+
+
+def draw_court_lines():
+    """Return the cached court line arrays (read-only)."""
+    return COURT_LINES
+
+
+# -------------------- figure helpers --------------------
+def _axis_refs(fig):
+    """(xref, yref) pairs for every subplot in the figure, e.g. ('x', 'y'), ('x2', 'y2')."""
+    refs = [("x", "y")]
+    i = 2
+    while f"xaxis{i}" in fig.layout and f"yaxis{i}" in fig.layout:
+        refs.append((f"x{i}", f"y{i}"))
+        i += 1
+    return refs
+
+
+def add_simplified_court(fig, color="#333333", width=2):
+    """
+    Add court lines to every subplot as a single layout path shape per axis,
+    instead of one scatter trace per court element.
+    """
+    shapes = [
+        dict(
+            type="path",
+            path=COURT_PATH,
+            xref=xref,
+            yref=yref,
+            line=dict(color=color, width=width),
+            layer="above",
+        )
+        for xref, yref in _axis_refs(fig)
+    ]
+    fig.update_layout(shapes=list(fig.layout.shapes or ()) + shapes)
+    return fig
+
+
+def apply_court_layout(fig):
+    """
+    Apply consistent court dimensions and aspect ratio to all subplots.
+    """
+    # Update all x and y axes
+    fig.update_xaxes(
+        range=X_RANGE,
+        showgrid=False,
+        zeroline=False,
+        showticklabels=False,
+        title=""
+    )
+    fig.update_yaxes(
+        range=Y_RANGE,
+        scaleanchor="x",
+        scaleratio=1,
+        showgrid=False,
+        zeroline=False,
+        showticklabels=False,
+        title=""
+    )
+
+    return fig
@@ -0,0 +1,404 @@
+import base64
+import io
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from courtvision.viz.court import X_RANGE, Y_RANGE, add_simplified_court, apply_court_layout
+
+HEAT_BINS = 30
+
+# Kernel-density hot zones: 1 ft cells, 2 ft Gaussian, shrink toward league with
+# the weight of one smoothed attempt per cell.
+HOT_CELL = 10
+HOT_SIGMA_FT = 2.0
+HOT_PRIOR = 1.0
+
+FG_SCALE = [
+    [0.0, "#1a0033"],   # Deep purple (0%)
+    [0.2, "#4d0080"],   # Purple
+    [0.35, "#8B00FF"],  # Violet
+    [0.5, "#FF1493"],   # Deep pink
+    [0.65, "#FF6347"],  # Tomato
+    [0.8, "#FFD700"],   # Gold
+    [1.0, "#FFFF00"],   # Bright yellow (100%)
+]
+
+VOLUME_SCALE = [
+    [0.0, "#0a0a0a"],   # Almost black (low)
+    [0.2, "#2d1b69"],   # Dark purple
+    [0.4, "#7209b7"],   # Purple
+    [0.6, "#f72585"],   # Pink
+    [0.8, "#ff6d00"],   # Orange
+    [1.0, "#ffd60a"],   # Yellow (high)
+]
+
+PLAYER_COLORS = px.colors.qualitative.D3
+
+# -------------------- figure spec cache --------------------
+class FigureCache:
+    """
+    Small thread-safe LRU of built charts and summary values.
+    Keys are tuples that start with the data selection, e.g.
+    ((player_ids), season, season_type, "scatter", color_mode).
+    Figures are kept as the built go.Figure: st.plotly_chart serializes a Figure without
+    re-validating it, so a hit skips pandas, plotly.express and figure construction.
+    Cached figures are shared between sessions and must not be mutated.
+    Plain values are kept as JSON strings, so every hit gets its own copy.
+    """
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self._specs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_or_put(self, key, build, dumps, loads):
+        with self._lock:
+            spec = self._specs.get(key)
+            if spec is not None:
+                self._specs.move_to_end(key)
+        if spec is None:
+            obj = build()
+            if obj is None:
+                return None
+            spec = dumps(obj)
+            with self._lock:
+                self._specs[key] = spec
+                self._specs.move_to_end(key)
+                while len(self._specs) > self.maxsize:
+                    self._specs.popitem(last=False)
+        return loads(spec)
+
+    def figure(self, key, build):
+        """Return the cached figure for key, calling build() -> go.Figure on a miss."""
+        return self._get_or_put(key, build, _same, _same)
+
+    def data(self, key, build):
+        """Same as figure() but for plain JSON-able values (summary tables etc.)."""
+        return self._get_or_put(key, build, json.dumps, json.loads)
+
+    def invalidate(self, prefix):
+        """Drop every entry whose key starts with the given tuple prefix."""
+        n = len(prefix)
+        with self._lock:
+            for k in [k for k in self._specs if k[:n] == prefix]:
+                del self._specs[k]
+
+    def clear(self):
+        with self._lock:
+            self._specs.clear()
+
+    def __len__(self):
+        return len(self._specs)
+
+
+def _same(obj):
+    return obj
+
+
+# One per process; shared by every session of the Shot Charts page.
+SHOT_FIGURES = FigureCache()
+
+# -------------------- figure builders --------------------
+def shot_summary(shots, names):
+    """Per-player made / attempts / FG% rows for the metric cards."""
+    out = []
+    for name in names:
+        player_shots = shots[shots["Player"] == name]
+        total_shots = len(player_shots)
+        made_shots = int((player_shots["SHOT_MADE_FLAG"] == 1).sum()) if "SHOT_MADE_FLAG" in player_shots.columns else 0
+        fg_pct = (made_shots / total_shots * 100) if total_shots > 0 else 0
+        out.append({
+            "Player": name,
+            "Total Shots": total_shots,
+            "Made": made_shots,
+            "FG%": f"{fg_pct:.1f}%"
+        })
+    return out
+
+
+def build_scatter_figure(shots, color_mode, facet):
+    """Shot scatter over the half court, colored by player, make/miss or zone."""
+    if color_mode == "Player":
+        color_col = "Player"
+        # Selection order: first player blue, second orange, ...
+        names = shots["Player"].drop_duplicates().tolist()
+        color_map = dict(zip(names, PLAYER_COLORS * (len(names) // len(PLAYER_COLORS) + 1)))
+    elif color_mode == "Make/Miss" and "Result" in shots.columns:
+        color_col = "Result"
+        color_map = {"Made": "#2ecc71", "Miss": "#e74c3c"}  # Green for made, red for miss
+    else:
+        color_col = "SHOT_ZONE_BASIC" if "SHOT_ZONE_BASIC" in shots.columns else "Player"
+        color_map = None
+
+    # Minimal hover: player, distance, result
+    hover_data = {
+        "Player": True,
+        "SHOT_DISTANCE": True,
+        "Result": True if "Result" in shots.columns else False,
+        "SHOT_ZONE_BASIC": False,
+        "GAME_DATE": False,
+        "LOC_X": False,
+        "LOC_Y": False,
+    }
+    hover_data = {k: v for k, v in hover_data.items() if k in shots.columns}
+
+    fig = px.scatter(
+        shots,
+        x="LOC_X",
+        y="LOC_Y",
+        color=color_col,
+        color_discrete_map=color_map,
+        hover_data=hover_data,
+        facet_col="Player" if facet else None,
+        opacity=0.7,
+    )
+
+    # Update marker size and styling
+    fig.update_traces(marker=dict(size=8, line=dict(width=0.5, color='#333333')))
+
+    # Apply court layout and add court lines
+    fig = apply_court_layout(fig)
+    fig = add_simplified_court(fig)
+
+    fig.update_layout(
+        height=650,
+        margin=dict(l=10, r=10, t=50, b=10),
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="center",
+            x=0.5,
+            font=dict(size=12, color="#333333")
+        ),
+        plot_bgcolor="#f0e6d2",  # Light tan court color (like real wood)
+        paper_bgcolor="#ffffff",
+        font=dict(color="#333333", size=12),
+    )
+
+    # Update subplot titles
+    fig.for_each_annotation(lambda a: a.update(
+        text=a.text.split("=")[-1],
+        font=dict(size=16, color="#333333", family="Arial Black")
+    ))
+    return fig
+
+
+def build_heatmap_figure(shots, metric, facet, bins=HEAT_BINS):
+    """FG% or volume density heatmap on fixed court bins. Returns None if no locations."""
+    shots_heat = shots.dropna(subset=["LOC_X", "LOC_Y"])
+    if shots_heat.empty:
+        return None
+
+    # Fixed court extents
+    x_min, x_max = X_RANGE
+    y_min, y_max = Y_RANGE
+
+    if metric == "FG%" and "SHOT_MADE_FLAG" in shots_heat.columns:
+        fig = px.density_heatmap(
+            shots_heat,
+            x="LOC_X",
+            y="LOC_Y",
+            z="SHOT_MADE_FLAG",
+            histfunc="avg",
+            nbinsx=bins,
+            nbinsy=bins,
+            facet_col="Player" if facet else None,
+            color_continuous_scale=FG_SCALE,
+            range_color=(0, 1),
+            labels={"SHOT_MADE_FLAG": "FG%"},
+        )
+        color_title = "FG%"
+    else:
+        fig = px.density_heatmap(
+            shots_heat,
+            x="LOC_X",
+            y="LOC_Y",
+            nbinsx=bins,
+            nbinsy=bins,
+            facet_col="Player" if facet else None,
+            color_continuous_scale=VOLUME_SCALE,
+        )
+        color_title = "Shot Count"
+
+    # Force consistent bins across court
+    fig.update_traces(
+        xbins=dict(start=x_min, end=x_max, size=(x_max - x_min) / bins),
+        ybins=dict(start=y_min, end=y_max, size=(y_max - y_min) / bins),
+        zsmooth="best",
+    )
+
+    # Apply court layout and add court lines
+    fig = apply_court_layout(fig)
+    fig = add_simplified_court(fig)
+
+    fig.update_layout(
+        height=650,
+        margin=dict(l=10, r=10, t=50, b=10),
+        coloraxis_colorbar=dict(
+            title=dict(text=color_title, font=dict(size=14, color="white")),
+            tickformat=".0%" if metric == "FG%" else None,
+            tickfont=dict(color="white", size=12),
+            len=0.7,
+            thickness=20,
+        ),
+        plot_bgcolor="#000000",  # Black background like Curry chart
+        paper_bgcolor="#16213e",
+        font=dict(color="white", size=12),
+    )
+
+    # Update subplot titles
+    fig.for_each_annotation(lambda a: a.update(
+        text=a.text.split("=")[-1],
+        font=dict(size=16, color="white", family="Arial Black")
+    ))
+    return fig
+
+
+def build_hot_zone_figure(surfaces):
+    """
+    Server-side smoothed FG% maps, one subplot per (name, surface) pair
+    where surface comes from courtvision.data.shots.player_hot_zones.
+    """
+    n = len(surfaces)
+    fig = make_subplots(
+        rows=1, cols=n,
+        subplot_titles=[name for name, _ in surfaces] if n > 1 else None,
+        horizontal_spacing=0.03,
+    )
+    for i, (name, surf) in enumerate(surfaces, start=1):
+        fig.add_trace(
+            go.Heatmap(
+                x=surf["x"],
+                y=surf["y"],
+                z=surf["fg"],
+                coloraxis="coloraxis",
+                zsmooth="best",
+                hovertemplate=f"{name}<br>FG%: %{{z:.0%}}<extra></extra>",
+            ),
+            row=1, col=i,
+        )
+
+    fig = apply_court_layout(fig)
+    fig = add_simplified_court(fig)
+
+    fig.update_layout(
+        height=650,
+        margin=dict(l=10, r=10, t=50, b=10),
+        coloraxis=dict(
+            colorscale=FG_SCALE,
+            cmin=0,
+            cmax=1,
+            colorbar=dict(
+                title=dict(text="FG%", font=dict(size=14, color="white")),
+                tickformat=".0%",
+                tickfont=dict(color="white", size=12),
+                len=0.7,
+                thickness=20,
+            ),
+        ),
+        plot_bgcolor="#000000",
+        paper_bgcolor="#16213e",
+        font=dict(color="white", size=12),
+    )
+    fig.for_each_annotation(lambda a: a.update(
+        font=dict(size=16, color="white", family="Arial Black")
+    ))
+    return fig
+
+
+def build_career_zone_mix_figure(profile, name):
+    """Stacked share of attempts by zone for each season of a career shot profile."""
+    fig = px.bar(
+        profile,
+        x="SEASON",
+        y="ZONE_SHARE",
+        color="SHOT_ZONE_BASIC",
+        labels={"SEASON": "Season", "ZONE_SHARE": "Share of FGA", "SHOT_ZONE_BASIC": "Zone"},
+        hover_data={"FGA": True, "FG_PCT": ":.1%"},
+        title=f"{name} — shot mix by season",
+    )
+    fig.update_layout(
+        barmode="stack",
+        height=420,
+        margin=dict(l=10, r=10, t=50, b=10),
+        yaxis=dict(tickformat=".0%", range=[0, 1]),
+        legend=dict(orientation="h", yanchor="bottom", y=-0.35, xanchor="center", x=0.5),
+    )
+    return fig
+
+
+def build_career_efficiency_figure(profile, name, min_fga=25):
+    """FG% by zone across seasons (zones with fewer than min_fga attempts in a season are hidden)."""
+    df = profile[profile["FGA"] >= min_fga]
+    fig = px.line(
+        df,
+        x="SEASON",
+        y="FG_PCT",
+        color="SHOT_ZONE_BASIC",
+        markers=True,
+        labels={"SEASON": "Season", "FG_PCT": "FG%", "SHOT_ZONE_BASIC": "Zone"},
+        hover_data={"FGA": True},
+        title=f"{name} — FG% by zone",
+    )
+    fig.update_layout(
+        height=420,
+        margin=dict(l=10, r=10, t=50, b=10),
+        yaxis=dict(tickformat=".0%"),
+        legend=dict(orientation="h", yanchor="bottom", y=-0.35, xanchor="center", x=0.5),
+    )
+    return fig
+
+
+def _colorize(image, scale):
+    """Map a 0..1 image (NaN = empty) through a plotly colorscale to RGBA uint8, empty -> transparent."""
+    stops = np.array([float(p) for p, _ in scale])
+    rgb = np.array([[int(c[i:i + 2], 16) for i in (1, 3, 5)] for _, c in scale], dtype=float)
+    v = np.clip(np.nan_to_num(image, nan=0.0), 0.0, 1.0)
+    out = np.empty(image.shape + (4,), dtype=np.uint8)
+    for ch in range(3):
+        out[..., ch] = np.interp(v, stops, rgb[:, ch]).astype(np.uint8)
+    out[..., 3] = np.where(np.isfinite(image), 255, 0)
+    return out
+
+
+def _png_data_uri(rgba):
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    buf = io.BytesIO()
+    Image.fromarray(rgba, mode="RGBA").save(buf, format="PNG", optimize=True)
+    return "data:image/png;base64," + base64.b64encode(buf.getvalue()).decode()
+
+
+def build_raster_figure(raster, title, colorscale=VOLUME_SCALE):
+    """
+    One image trace over the court for a courtvision.data.shots.league_raster result.
+    The image is sent as a PNG (or an RGBA array without Pillow), so the figure size
+    depends on the pixel grid, not on how many shots went into it.
+    """
+    rgba = _colorize(raster["image"], colorscale)
+    geom = dict(x0=raster["x0"], dx=raster["dx"], y0=raster["y0"], dy=raster["dy"])
+    uri = _png_data_uri(rgba)
+    trace = go.Image(source=uri, **geom) if uri else go.Image(z=rgba, colormodel="rgba", **geom)
+    trace.update(hoverinfo="skip")
+
+    fig = go.Figure(trace)
+    fig = apply_court_layout(fig)
+    fig = add_simplified_court(fig, color="#bbbbbb", width=1.5)
+    fig.update_layout(
+        title=dict(text=title, font=dict(size=16, color="white")),
+        height=650,
+        margin=dict(l=10, r=10, t=50, b=10),
+        plot_bgcolor="#000000",
+        paper_bgcolor="#16213e",
+        font=dict(color="white", size=12),
+    )
+    return fig
@@ -1,10 +1,11 @@
 import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
-from courtvision.data.nba_client import (
-    list_all_teams, team_players_for_dropdown, search_players,
+from courtvision.data.nba_client import TEAMS, SEASON_TYPES, recent_seasons
+from courtvision.data.st_cache import (
+    team_players_for_dropdown, search_players,
     get_player_card, list_seasons_for_player, get_player_season_totals,
-    player_career_pts_fg, recent_seasons,
+    player_career_pts_fg, player_playoff_seasons, player_career_totals, refresh_player_career,
 )
 
 # Page config
@@ -63,8 +64,7 @@ st.divider()
 st.markdown("### Search & Filter")
 cols = st.columns([2, 1.5, 2.5, 1])
 
-teams = list_all_teams()
-team_options = ["— All Teams —"] + [t["full_name"] for t in teams]
+team_options = ["— All Teams —"] + list(TEAMS.names)
 team_name = cols[0].selectbox("Filter by Team", options=team_options)
 team_season = cols[1].selectbox("Team Season", options=recent_seasons(10))
 query = cols[2].text_input("Search by Player Name", placeholder="e.g., LeBron James")
@@ -73,7 +73,7 @@ refresh = cols[3].button("🔄 Refresh", use_container_width=True)
 # Build choices (team roster first; fallback to name search)
 choices = []
 if team_name != "— All Teams —":
-    team = next(t for t in teams if t["full_name"] == team_name)
+    team = TEAMS.by_name[team_name]
     roster = team_players_for_dropdown(team["team_id"], team_season, refresh=refresh)
     choices = [f"{p['full_name']} (id={p['player_id']})" for p in roster]
 
@@ -102,6 +102,9 @@ st.divider()
 
 # Card & seasons
 card = get_player_card(player_id, refresh=refresh)
+if refresh:
+    # one refetch of the career response; the season / trend / totals views below read it
+    refresh_player_career(player_id)
 
 # Player Header with enhanced styling
 st.markdown(f"""
@@ -117,16 +120,18 @@ st.markdown(f"""
     </div>
 """, unsafe_allow_html=True)
 
-seasons = list_seasons_for_player(player_id, refresh=refresh)
+season_cols = st.columns([3, 2])
+season_type = season_cols[1].radio("Season Type", options=SEASON_TYPES, horizontal=True)
+seasons = list_seasons_for_player(player_id, season_type=season_type)
 if not seasons:
-    st.error("No seasons found for this player.")
+    st.error(f"No {season_type.lower()} seasons found for this player.")
     st.stop()
 
-season = st.selectbox("Select Season", options=list(reversed(seasons)))
+season = season_cols[0].selectbox("Select Season", options=list(reversed(seasons)))
 
 # Season totals
 with st.spinner("Loading season statistics..."):
-    totals = get_player_season_totals(player_id, season, refresh=refresh)
+    totals = get_player_season_totals(player_id, season, season_type=season_type)
 
 if totals.empty:
     st.info("No season totals available for this season.")
@@ -233,7 +238,7 @@ st.divider()
 st.markdown("### Career Trends")
 st.caption("Track performance progression throughout the player's career")
 
-series = player_career_pts_fg(player_id, refresh=refresh)
+series = player_career_pts_fg(player_id, season_type=season_type)
 if series.empty or "Season" not in series.columns:
     st.info("Not enough data to display career trends.")
 else:
@@ -301,6 +306,37 @@ else:
         
         st.pyplot(fig2, clear_figure=True)
 
+# Playoffs and career totals need the player's full PlayerCareerStats response, which the
+# league career store does not hold -- only load it when asked for.
+st.divider()
+if st.toggle("Show career totals and playoff runs", key="show_career_extras"):
+    playoffs = player_playoff_seasons(player_id)
+    career_totals = player_career_totals(player_id)
+    if not career_totals.empty:
+        st.markdown("### Career Totals")
+        per_game_cols = ["PTS", "REB", "AST", "STL", "BLK"]
+        ct = career_totals.set_index("SEASON_TYPE")
+        ct_disp = pd.DataFrame({"GP": ct["GP"]})
+        for c in per_game_cols:
+            if c in ct.columns:
+                ct_disp[c] = (ct[c] / ct["GP"].where(ct["GP"] > 0)).round(1)
+        for c, label in (("FG_PCT", "FG%"), ("FG3_PCT", "3P%"), ("FT_PCT", "FT%")):
+            if c in ct.columns:
+                ct_disp[label] = (ct[c].astype(float) * 100).round(1)
+        st.dataframe(ct_disp.reset_index().rename(columns={"SEASON_TYPE": "Type"}), use_container_width=True, hide_index=True)
+
+    if not playoffs.empty and "SEASON_ID" in playoffs.columns:
+        st.markdown("### Playoff Runs")
+        po = playoffs.copy()
+        gp = po["GP"].where(po["GP"] > 0)
+        po_disp = pd.DataFrame({"Season": po["SEASON_ID"], "Team": po.get("TEAM_ABBREVIATION", ""), "GP": po["GP"]})
+        for c, label in (("PTS", "PPG"), ("REB", "RPG"), ("AST", "APG")):
+            if c in po.columns:
+                po_disp[label] = (po[c] / gp).round(1)
+        if "FG_PCT" in po.columns:
+            po_disp["FG%"] = (po["FG_PCT"].astype(float) * 100).round(1)
+        st.dataframe(po_disp.sort_values("Season", ascending=False), use_container_width=True, hide_index=True)
+
 # Footer
 st.divider()
 st.markdown("""
@@ -3,10 +3,11 @@ import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 
-from courtvision.data.nba_client import (
-    list_all_teams, recent_seasons,
-    get_team_basic_stats, get_team_roster, get_team_players_season_stats, get_team_adv_summary, 
-    get_team_record_and_ratings,
+from courtvision.data.nba_client import TEAMS, SEASON_TYPES, recent_seasons, TEAM_SPLITS, TEAM_LEADER_STATS
+from courtvision.data.st_cache import (
+    get_team_roster, team_player_stats_view,
+    get_team_record_and_ratings, get_team_splits, league_standings,
+    team_history, franchise_decades, refresh_team_summary, refresh_team_history,
 )
 
 # Page config
@@ -76,12 +77,11 @@ st.divider()
 
 # Enhanced Controls
 st.markdown("### Select Team & Season")
-control_cols = st.columns([3, 2, 1.5])
+control_cols = st.columns([3, 2, 2, 1.5])
 
-teams = list_all_teams()
 team_name = control_cols[0].selectbox(
     "Team",
-    options=[t["full_name"] for t in teams],
+    options=TEAMS.names,
     help="Choose a team to view their statistics"
 )
 season = control_cols[1].selectbox(
@@ -89,9 +89,10 @@ season = control_cols[1].selectbox(
     options=recent_seasons(10),
     help="Select the season year"
 )
-refresh = control_cols[2].button("🔄 Refresh", use_container_width=True)
+season_type = control_cols[2].selectbox("Season Type", options=SEASON_TYPES)
+refresh = control_cols[3].button("🔄 Refresh", use_container_width=True)
 
-team = next(t for t in teams if t["full_name"] == team_name)
+team = TEAMS.by_name[team_name]
 team_id = team["team_id"]
 
 st.divider()
@@ -101,14 +102,17 @@ st.markdown(f"""
     <div class='team-banner'>
         <h2 style='color: white; margin: 0; font-size: 2.5rem;'>{team_name}</h2>
         <p style='color: rgba(255,255,255,0.9); margin: 0.5rem 0 0 0; font-size: 1.3rem;'>
-            {season} Season Analysis
+            {season} {"Season" if season_type == "Regular Season" else season_type} Analysis
         </p>
     </div>
 """, unsafe_allow_html=True)
 
 # Load Dashboard Data
 with st.spinner("Loading team performance data..."):
-    dash = get_team_record_and_ratings(team_id, season, refresh=refresh)
+    if refresh:
+        # the KPIs and standings are views of one league summary: rebuild it once
+        refresh_team_summary(season, season_type=season_type)
+    dash = get_team_record_and_ratings(team_id, season, season_type=season_type)
 
 if dash.empty:
     st.error("Could not load team dashboard for that season.")
@@ -167,16 +171,134 @@ with k4:
     )
     st.markdown('</div>', unsafe_allow_html=True)
 
+def _rank(col):
+    v = dash[col].iloc[0] if col in dash.columns else None
+    return f"#{int(v)}" if v is not None and pd.notna(v) else "—"
+
+st.caption(
+    f"League rank — Win%: {_rank('W_PCT_RANK')} · Offense: {_rank('OFF_RATING_RANK')} · "
+    f"Defense: {_rank('DEF_RATING_RANK')} · Net: {_rank('NET_RATING_RANK')} · Pace: {_rank('PACE_RANK')}"
+)
+
+# League Standings (same summary table the KPIs above are read from)
+with st.expander("League Standings"):
+    standings = league_standings(season, season_type=season_type)
+    if standings.empty:
+        st.info("No standings available for this season.")
+    else:
+        stand_cols = ["TEAM_NAME", "W", "L", "W_PCT", "CONF_RANK", "OFF_RATING", "DEF_RATING", "NET_RATING", "PACE", "PPG"]
+        sd = standings[[c for c in stand_cols if c in standings.columns]].rename(columns={
+            "TEAM_NAME": "Team", "W_PCT": "Win%", "CONF_RANK": "Conf Rank",
+            "OFF_RATING": "ORtg", "DEF_RATING": "DRtg", "NET_RATING": "Net", "PACE": "Pace",
+        })
+        sd.insert(0, "#", range(1, len(sd) + 1))
+        sd["Win%"] = (sd["Win%"].astype(float) * 100).round(1)
+        st.dataframe(
+            sd.style.apply(lambda r: ["font-weight: bold" if r["Team"] == team_name else "" for _ in r], axis=1),
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "ORtg": st.column_config.NumberColumn("ORtg", format="%.1f"),
+                "DRtg": st.column_config.NumberColumn("DRtg", format="%.1f"),
+                "Net": st.column_config.NumberColumn("Net", format="%.1f"),
+                "Pace": st.column_config.NumberColumn("Pace", format="%.1f"),
+                "PPG": st.column_config.NumberColumn("PPG", format="%.1f"),
+            },
+        )
+
+st.divider()
+
+# Team Splits (one dashboard request covers every split)
+st.markdown('<p class="section-title">Team Splits</p>', unsafe_allow_html=True)
+
+split = st.radio("Split", options=[k for k in TEAM_SPLITS if k != "Overall"], horizontal=True)
+splits = get_team_splits(team_id, season, split, refresh=refresh, season_type=season_type)
+if splits.empty:
+    st.info("No split data available for this season.")
+else:
+    split_cols = ["GROUP_VALUE", "GP", "W", "L", "W_PCT", "PTS", "REB", "AST", "FG_PCT", "FG3_PCT", "PLUS_MINUS"]
+    sdisp = splits[[c for c in split_cols if c in splits.columns]].rename(columns={
+        "GROUP_VALUE": split, "W_PCT": "Win%", "FG_PCT": "FG%", "FG3_PCT": "3P%", "PLUS_MINUS": "+/-",
+    })
+    for c in ("Win%", "FG%", "3P%"):
+        if c in sdisp.columns:
+            sdisp[c] = (sdisp[c].astype(float) * 100).round(1)
+    st.dataframe(sdisp, use_container_width=True, hide_index=True)
+
+st.divider()
+
+# Franchise History (year-by-year history is loaded once per team; no extra requests)
+st.markdown('<p class="section-title">Franchise History</p>', unsafe_allow_html=True)
+
+if refresh:
+    refresh_team_history(team_id)
+history = team_history(team_id)
+if history.empty:
+    st.info("No franchise history available.")
+else:
+    h1, h2 = st.columns(2)
+
+    with h1:
+        st.markdown("#### Wins by Season")
+        fig_w, ax_w = plt.subplots(figsize=(8, 4.5))
+        made = (history.get("PO_WINS", 0) + history.get("PO_LOSSES", 0)) > 0
+        ax_w.bar(history["YEAR_START"], history["W"], color=["steelblue" if m else "#b0c4de" for m in made], width=0.8)
+        ax_w.set_xlabel("Season (start year)", fontsize=11, fontweight='bold')
+        ax_w.set_ylabel("Wins", fontsize=11, fontweight='bold')
+        ax_w.grid(axis='y', alpha=0.3, linestyle='--')
+        ax_w.spines['top'].set_visible(False)
+        ax_w.spines['right'].set_visible(False)
+        plt.tight_layout()
+        st.pyplot(fig_w, clear_figure=True)
+        st.caption("Darker bars: playoff seasons")
+
+    with h2:
+        st.markdown("#### Pace & Offense")
+        fig_p, ax_p = plt.subplots(figsize=(8, 4.5))
+        ax_p.plot(history["YEAR_START"], history["POSS_PG"], color="#667eea", linewidth=2, label="Possessions / game")
+        ax_p.set_xlabel("Season (start year)", fontsize=11, fontweight='bold')
+        ax_p.set_ylabel("Possessions / game", fontsize=11, fontweight='bold')
+        ax_o = ax_p.twinx()
+        ax_o.plot(history["YEAR_START"], history["ORTG_EST"], color="#e4572e", linewidth=2, label="Points / 100 poss.")
+        ax_o.set_ylabel("Points / 100 possessions", fontsize=11, fontweight='bold')
+        ax_p.grid(alpha=0.3, linestyle='--')
+        fig_p.legend(loc="upper left", fontsize=9)
+        plt.tight_layout()
+        st.pyplot(fig_p, clear_figure=True)
+        st.caption("Estimated from season box-score totals")
+
+    decades = franchise_decades(team_id)
+    if not decades.empty:
+        dd = decades.assign(
+            Decade=decades["DECADE"].astype(str) + "s",
+            Record=decades["W"].astype(int).astype(str) + "-" + decades["L"].astype(int).astype(str),
+            W_PCT=(decades["W_PCT"] * 100).round(1),
+        )[["Decade", "SEASONS", "Record", "W_PCT", "PLAYOFFS", "TITLES", "PPG", "POSS_PG", "ORTG_EST"]]
+        st.dataframe(
+            dd,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "SEASONS": st.column_config.NumberColumn("Seasons", width="small"),
+                "W_PCT": st.column_config.NumberColumn("Win%", format="%.1f%%"),
+                "PLAYOFFS": st.column_config.NumberColumn("Playoffs", help="Playoff appearances"),
+                "TITLES": st.column_config.NumberColumn("Titles"),
+                "PPG": st.column_config.NumberColumn("PPG", format="%.1f"),
+                "POSS_PG": st.column_config.NumberColumn("Pace (est.)", format="%.1f"),
+                "ORTG_EST": st.column_config.NumberColumn("ORtg (est.)", format="%.1f"),
+            },
+        )
+
 st.divider()
 
 # Player Statistics Section
 st.markdown('<p class="section-title">Player Performance</p>', unsafe_allow_html=True)
 
-# Load player stats
+# Load player stats (display table and leaders are built once per team/season in the data layer)
 with st.spinner("Loading player statistics..."):
-    pstats = get_team_players_season_stats(team_id, season, refresh=refresh)
+    disp, leader_rows = team_player_stats_view(team_id, season, refresh=refresh, season_type=season_type)
 
-if pstats.empty:
+if disp.empty:
     roster = get_team_roster(team_id, season, refresh=refresh)
     if not roster.empty:
         st.caption("Season player averages unavailable; showing roster instead.")
@@ -185,43 +307,10 @@ if pstats.empty:
         st.info("No player data available for this season.")
     st.stop()
 
-# Normalize column names
-rename = {
-    "PLAYER_NAME": "Name",
-    "GP": "GP", "MIN": "MIN", "PTS": "PTS", "REB": "REB", "AST": "AST",
-    "STL": "STL", "BLK": "BLK", "TOV": "TO", "PF": "PF",
-    "FG3_PCT": "3P%", "FT_PCT": "FT%",
-}
-for old, new in rename.items():
-    if old in pstats.columns and new not in pstats.columns:
-        pstats = pstats.rename(columns={old: new})
-
-# Convert percent decimals to %
-for pct_col in ["3P%", "FT%"]:
-    if pct_col in pstats.columns:
-        pstats[pct_col] = (pstats[pct_col].astype(float) * 100).round(1)
-
-# AST/TO ratio
-if "AST" in pstats.columns and "TO" in pstats.columns:
-    pstats["AST/TO"] = pstats.apply(
-        lambda r: (float(r["AST"]) / float(r["TO"])) if float(r["TO"]) != 0 else None, axis=1
-    )
-    pstats["AST/TO"] = pstats["AST/TO"].round(2)
-
 # Team Leaders Section
 st.markdown("#### Team Leaders")
 
-def _leader(col):
-    if col not in pstats.columns: 
-        return None
-    row = pstats.sort_values(col, ascending=False).head(1)
-    return row.iloc[0]["Name"], float(row.iloc[0][col])
-
-leaders = {
-    "Points": _leader("PTS"),
-    "Rebounds": _leader("REB"),
-    "Assists": _leader("AST")
-}
+leaders = {label: leader_rows.get(stat) for stat, label in TEAM_LEADER_STATS.items()}
 
 lc1, lc2, lc3 = st.columns(3)
 
@@ -248,10 +337,6 @@ st.markdown("")  # spacing
 # Player Statistics Table
 st.markdown("#### Complete Player Statistics")
 
-cols = ["Name", "GP", "MIN", "PTS", "REB", "AST", "STL", "BLK", "3P%", "FT%", "AST/TO"]
-show = [c for c in cols if c in pstats.columns]
-disp = pstats[show].sort_values("PTS", ascending=False).reset_index(drop=True)
-
 # Enhanced dataframe display with column configuration
 st.dataframe(
     disp,
@@ -3,12 +3,13 @@ import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 
-from courtvision.data.nba_client import (
-    list_all_teams, recent_seasons, search_players, team_players_for_dropdown,
-    list_seasons_for_player, get_player_season_row, get_team_season_base_totals,
-    compute_usage_rate, compute_true_shooting_pct,
-    get_team_record_and_ratings, get_team_h2h_games, compute_player_PER
+from courtvision.data.nba_client import TEAMS, SEASON_TYPES, recent_seasons, seasons_since, COMPARE_MAX
+from courtvision.data.st_cache import (
+    search_players, list_all_players,
+    get_team_record_and_ratings, get_team_h2h_games, refresh_team_summary,
+    compare_players, similar_players,
 )
+from courtvision.viz.comparisons import build_radar_figure
 
 # Page config
 st.set_page_config(layout="wide")
@@ -100,7 +101,7 @@ mode_col1, mode_col2, mode_col3 = st.columns([1, 2, 1])
 with mode_col2:
     mode = st.radio(
         "Select Comparison Type",
-        ["Players", "Teams"],
+        ["Players", "Teams", "Similar Players"],
         horizontal=True,
         label_visibility="collapsed"
     )
@@ -124,221 +125,114 @@ def pick_by_name(col, label):
     idx = col.selectbox(label, list(range(len(options))), format_func=lambda i: options[i], key=label)
     return int(options[idx].split("(id=")[1].split(")")[0])
 
-def first_available_season(player_id, preferred_season):
-    """Return (season_to_use, is_exact) for a player, falling back to most recent season."""
-    seasons = list(reversed(list_seasons_for_player(player_id, refresh=refresh)))
-    if not seasons:
-        return None, False
-    if preferred_season in seasons:
-        return preferred_season, True
-    return seasons[0], False
-
-def per_game_from_row(r, stat):
-    if r.empty: return None
-    gp = float(r.iloc[0].get("GP", 0) or 0)
-    val = float(r.iloc[0].get(stat, 0) or 0)
-    return round(val / gp, 1) if gp > 0 else None
-
-def team_id_from_row(row):
-    if row.empty: return None
-    if "TEAM_ID" in row.columns:
-        return int(row["TEAM_ID"].iloc[0])
-    return None
-
 # ---------- PLAYERS MODE ----------
 if mode == "Players":
     # Season selector centered
-    season_cols = st.columns([1, 2, 1])
+    season_cols = st.columns([1, 1, 1, 1])
     with season_cols[1]:
         seasons = recent_seasons(10)
         season = st.selectbox("Season", options=seasons, label_visibility="visible")
+    with season_cols[2]:
+        season_type = st.selectbox("Season Type", options=SEASON_TYPES, key="cmp_season_type")
 
     st.markdown("")
-    
-    # Two columns for player selection
-    col_left, col_right = st.columns(2)
 
-    # Player A (left side)
-    with col_left:
-        st.markdown('<div class="player-selector-card">', unsafe_allow_html=True)
-        st.markdown("#### Player A")
-        teams = list_all_teams()
-        team_opts = ["— All Teams —"] + [t["full_name"] for t in teams]
-        team_filter_a = st.selectbox("Filter by Team (optional)", team_opts, key="teamA")
-        if team_filter_a != "— All Teams —":
-            t = next(t for t in teams if t["full_name"] == team_filter_a)
-            roster = team_players_for_dropdown(t["team_id"], season, refresh=refresh)
-            opts = [f"{p['full_name']} (id={p['player_id']})" for p in roster]
-            pid_a = None
-            if opts:
-                idx = st.selectbox("Player A", list(range(len(opts))), format_func=lambda i: opts[i], key="pickA")
-                pid_a = int(opts[idx].split("(id=")[1].split(")")[0])
-            else:
-                pid_a = pick_by_name(st, "Player A")
-        else:
-            pid_a = pick_by_name(st, "Player A")
-        st.markdown('</div>', unsafe_allow_html=True)
-
-    # Player B (right side)
-    with col_right:
-        st.markdown('<div class="player-selector-card">', unsafe_allow_html=True)
-        st.markdown("#### Player B")
-        teams = list_all_teams()
-        team_opts = ["— All Teams —"] + [t["full_name"] for t in teams]
-        team_filter_b = st.selectbox("Filter by Team (optional)", team_opts, key="teamB")
-        if team_filter_b != "— All Teams —":
-            t = next(t for t in teams if t["full_name"] == team_filter_b)
-            roster = team_players_for_dropdown(t["team_id"], season, refresh=refresh)
-            opts = [f"{p['full_name']} (id={p['player_id']})" for p in roster]
-            pid_b = None
-            if opts:
-                idx = st.selectbox("Player B", list(range(len(opts))), format_func=lambda i: opts[i], key="pickB")
-                pid_b = int(opts[idx].split("(id=")[1].split(")")[0])
-            else:
-                pid_b = pick_by_name(st, "Player B")
-        else:
-            pid_b = pick_by_name(st, "Player B")
-        st.markdown('</div>', unsafe_allow_html=True)
+    st.markdown('<div class="player-selector-card">', unsafe_allow_html=True)
+    st.markdown("#### Players")
+    all_players = list_all_players()
+    player_names = {p["player_id"]: p["full_name"] for p in all_players}
+    picked = st.multiselect(
+        f"Players to compare (up to {COMPARE_MAX})",
+        options=list(player_names),
+        format_func=lambda pid: player_names.get(pid, f"Player {pid}"),
+        max_selections=COMPARE_MAX,
+        placeholder="Type a name...",
+        key="cmp_players",
+    )
+    st.markdown('</div>', unsafe_allow_html=True)
 
-    if not pid_a or not pid_b:
-        st.info("Select two players to compare.")
+    if len(picked) < 2:
+        st.info("Select at least two players to compare.")
         st.stop()
 
-    # Resolve seasons
-    season_a, exact_a = first_available_season(pid_a, season)
-    season_b, exact_b = first_available_season(pid_b, season)
-
-    # Load player data
-    row_a = get_player_season_row(pid_a, season_a, refresh=refresh)
-    row_b = get_player_season_row(pid_b, season_b, refresh=refresh)
-
-    # Get player names
-    from courtvision.data.nba_client import get_player_card
-    card_a = get_player_card(pid_a, refresh=refresh)
-    card_b = get_player_card(pid_b, refresh=refresh)
-    name_a = card_a.get("full_name", f"Player {pid_a}")
-    name_b = card_b.get("full_name", f"Player {pid_b}")
+    with st.spinner("Loading player seasons..."):
+        cmp = compare_players(picked, season, refresh=refresh, season_type=season_type)
 
     st.divider()
 
-    # Player comparison header
-    header_col1, header_col2, header_col3 = st.columns([1, 0.3, 1])
-    
-    with header_col1:
-        st.markdown(f"""
+    # Player header cards
+    card_cols = st.columns(len(cmp))
+    for col, (_, r) in zip(card_cols, cmp.iterrows()):
+        col.markdown(f"""
             <div class='comparison-card'>
-                <h2 style='margin: 0; font-size: 2rem;'>{name_a}</h2>
-                <p style='margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9;'>{season_a}{'*' if not exact_a else ''}</p>
+                <h2 style='margin: 0; font-size: 1.4rem;'>{r['NAME']}</h2>
+                <p style='margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9;'>{r['SEASON'] or '—'}{'*' if not r['EXACT'] else ''}</p>
             </div>
         """, unsafe_allow_html=True)
-    
-    with header_col2:
-        st.markdown('<div class="vs-divider">VS</div>', unsafe_allow_html=True)
-    
-    with header_col3:
-        st.markdown(f"""
-            <div class='comparison-card'>
-                <h2 style='margin: 0; font-size: 2rem;'>{name_b}</h2>
-                <p style='margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9;'>{season_b}{'*' if not exact_b else ''}</p>
-            </div>
-        """, unsafe_allow_html=True)
-
-    # Compute stats
-    ppg_a = per_game_from_row(row_a, "PTS"); rpg_a = per_game_from_row(row_a, "REB")
-    apg_a = per_game_from_row(row_a, "AST"); spg_a = per_game_from_row(row_a, "STL")
-    bpg_a = per_game_from_row(row_a, "BLK")
-
-    ppg_b = per_game_from_row(row_b, "PTS"); rpg_b = per_game_from_row(row_b, "REB")
-    apg_b = per_game_from_row(row_b, "AST"); spg_b = per_game_from_row(row_b, "STL")
-    bpg_b = per_game_from_row(row_b, "BLK")
-
-    # Advanced stats
-    tid_a = team_id_from_row(row_a); tid_b = team_id_from_row(row_b)
-    team_tot_a = get_team_season_base_totals(tid_a, season_a, refresh=refresh) if tid_a else pd.DataFrame()
-    team_tot_b = get_team_season_base_totals(tid_b, season_b, refresh=refresh) if tid_b else pd.DataFrame()
-    usg_a = compute_usage_rate(row_a, team_tot_a)
-    usg_b = compute_usage_rate(row_b, team_tot_b)
-    ts_a = compute_true_shooting_pct(row_a)
-    ts_b = compute_true_shooting_pct(row_b)
-    per_a = compute_player_PER(row_a, team_tot_a, season_a, refresh=refresh)
-    per_b = compute_player_PER(row_b, team_tot_b, season_b, refresh=refresh)
 
     # Comparison Table
     st.markdown('<p class="section-title">Statistical Comparison</p>', unsafe_allow_html=True)
-    
-    display = pd.DataFrame([
-        {"Metric": "Season used", "Player A": season_a + ("*" if not exact_a else ""), "Player B": season_b + ("*" if not exact_b else "")},
-        {"Metric": "PPG / RPG / APG / SPG / BPG",
-         "Player A": f"{ppg_a}/{rpg_a}/{apg_a}/{spg_a}/{bpg_a}",
-         "Player B": f"{ppg_b}/{rpg_b}/{apg_b}/{spg_b}/{bpg_b}"},
-        {"Metric": "Usage Rate", "Player A": f"{usg_a:.1f}%" if usg_a is not None else "—",
-                                 "Player B": f"{usg_b:.1f}%" if usg_b is not None else "—"},
-        {"Metric": "True Shooting %", "Player A": f"{ts_a:.1f}%" if ts_a is not None else "—",
-                                      "Player B": f"{ts_b:.1f}%" if ts_b is not None else "—"},
-        {"Metric": "PER (approx)", "Player A": f"{per_a:.1f}" if per_a is not None else "—",
-                                   "Player B": f"{per_b:.1f}" if per_b is not None else "—"},
-    ])
 
+    def _fmt(v, spec, suffix=""):
+        return f"{v:{spec}}{suffix}" if pd.notna(v) else "—"
+
+    metrics = [
+        ("Season used", lambda r: (r["SEASON"] or "—") + ("*" if not r["EXACT"] else "")),
+        ("Team", lambda r: r["TEAM_ABBREVIATION"] or "—"),
+        ("Games", lambda r: _fmt(r["GP"], ".0f")),
+        ("MPG", lambda r: _fmt(r["MPG"], ".1f")),
+        ("PPG / RPG / APG", lambda r: f"{_fmt(r['PPG'], '.1f')} / {_fmt(r['RPG'], '.1f')} / {_fmt(r['APG'], '.1f')}"),
+        ("SPG / BPG", lambda r: f"{_fmt(r['SPG'], '.1f')} / {_fmt(r['BPG'], '.1f')}"),
+        ("Usage Rate", lambda r: _fmt(r["USG_PCT"], ".1f", "%")),
+        ("True Shooting %", lambda r: _fmt(r["TS_PCT"], ".1f", "%")),
+        ("PER", lambda r: _fmt(r["PER"], ".1f")),
+    ]
+    labels = [f"{n} ({s})" if dup else n for n, s, dup in zip(cmp["NAME"], cmp["SEASON"], cmp["NAME"].duplicated(keep=False))]
+    display = pd.DataFrame(
+        [{"Metric": m, **{lab: f(r) for lab, (_, r) in zip(labels, cmp.iterrows())}} for m, f in metrics]
+    )
     st.dataframe(
         display,
         use_container_width=True,
         hide_index=True,
-        column_config={
-            "Metric": st.column_config.TextColumn("Metric", width="medium"),
-            "Player A": st.column_config.TextColumn(name_a, width="medium"),
-            "Player B": st.column_config.TextColumn(name_b, width="medium"),
-        }
+        column_config={"Metric": st.column_config.TextColumn("Metric", width="medium")},
     )
-    
+
+    st.markdown('<p class="section-title">Profile</p>', unsafe_allow_html=True)
+    st.plotly_chart(build_radar_figure(cmp), use_container_width=True)
+
     st.caption("*Season marked with an asterisk means your chosen season wasn't available; used the player's most recent season instead.")
-    st.caption("PER is computed using the full Hollinger/BBR formula (uPER → pace adjustment → normalized to league average = 15).")
+    st.caption("PER is computed using the full Hollinger/BBR formula (uPER → pace adjustment → normalized to league average = 15). "
+               "Radar axes are scaled to the best of the selected players.")
 
 # ---------- TEAMS MODE ----------
-else:
+elif mode == "Teams":
     # Season selector centered
-    season_cols = st.columns([1, 2, 1])
+    season_cols = st.columns([1, 1, 1, 1])
     with season_cols[1]:
         season = st.selectbox("Season", options=recent_seasons(10))
+    with season_cols[2]:
+        season_type = st.selectbox("Season Type", options=SEASON_TYPES, key="team_season_type")
 
     st.markdown("")
 
-    # Load teams
-    teams = list_all_teams()
-    team_names = [t["full_name"] for t in teams]
-    name_to_team = {t["full_name"]: t for t in teams}
-
     # Two columns for team selection
     col_left, col_right = st.columns(2)
 
     with col_left:
         st.markdown('<div class="team-selector-card">', unsafe_allow_html=True)
         st.markdown("#### Team A")
-        team_left = st.selectbox("Select First Team", options=team_names, key="team_left")
+        team_left = st.selectbox("Select First Team", options=TEAMS.names, key="team_left")
         st.markdown('</div>', unsafe_allow_html=True)
 
     with col_right:
         st.markdown('<div class="team-selector-card">', unsafe_allow_html=True)
         st.markdown("#### Team B")
-        team_right = st.selectbox("Select Second Team", options=team_names, key="team_right")
+        team_right = st.selectbox("Select Second Team", options=TEAMS.names, key="team_right")
         st.markdown('</div>', unsafe_allow_html=True)
 
-    # Get team info
-    tA = name_to_team.get(team_left)
-    tB = name_to_team.get(team_right)
-
-    def _team_id_safe(t):
-        if isinstance(t, dict):
-            for k in ("team_id", "TEAM_ID", "id"):
-                if k in t and t[k] is not None:
-                    return int(t[k])
-        return None
-
-    team_id_left = _team_id_safe(tA)
-    team_id_right = _team_id_safe(tB)
-
-    if team_id_left is None or team_id_right is None:
-        st.error("Could not resolve team IDs. Click 'Refresh Data' and try again.")
-        st.stop()
+    team_id_left = TEAMS.by_name[team_left]["team_id"]
+    team_id_right = TEAMS.by_name[team_right]["team_id"]
 
     st.divider()
 
@@ -349,7 +243,7 @@ else:
         st.markdown(f"""
             <div class='comparison-card'>
                 <h2 style='margin: 0; font-size: 2rem;'>{team_left}</h2>
-                <p style='margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9;'>{season} Season</p>
+                <p style='margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9;'>{season} {season_type}</p>
             </div>
         """, unsafe_allow_html=True)
     
@@ -360,14 +254,17 @@ else:
         st.markdown(f"""
             <div class='comparison-card'>
                 <h2 style='margin: 0; font-size: 2rem;'>{team_right}</h2>
-                <p style='margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9;'>{season} Season</p>
+                <p style='margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9;'>{season} {season_type}</p>
             </div>
         """, unsafe_allow_html=True)
 
     # Load team data
     with st.spinner("Loading team summaries..."):
-        A = get_team_record_and_ratings(team_id_left, season, refresh=refresh)
-        B = get_team_record_and_ratings(team_id_right, season, refresh=refresh)
+        if refresh:
+            # both rows come from one league summary: rebuild it once
+            refresh_team_summary(season, season_type=season_type)
+        A = get_team_record_and_ratings(team_id_left, season, season_type=season_type)
+        B = get_team_record_and_ratings(team_id_right, season, season_type=season_type)
 
     if A.empty or B.empty:
         st.error("Could not load team summaries.")
@@ -403,7 +300,7 @@ else:
 
     # Head-to-Head section
     with st.spinner("Computing head-to-head..."):
-        h2h_sum, h2h_games = get_team_h2h_games(team_id_left, team_id_right, season, refresh=refresh)
+        h2h_sum, h2h_games = get_team_h2h_games(team_id_left, team_id_right, season, refresh=refresh, season_type=season_type)
 
     st.markdown('<p class="section-title">Head-to-Head Matchup</p>', unsafe_allow_html=True)
     
@@ -433,7 +330,7 @@ else:
             }
         )
     else:
-        st.caption("No regular-season head-to-head games found for this season.")
+        st.caption(f"No {season_type.lower()} head-to-head games found for this season.")
 
     st.divider()
 
@@ -456,6 +353,59 @@ else:
         }
     )
 
+# ---------- SIMILAR PLAYERS MODE ----------
+else:
+    season_cols = st.columns([1, 2, 1])
+    with season_cols[1]:
+        season = st.selectbox("Season", options=recent_seasons(10), key="sim_season")
+
+    sim_cols = st.columns([2, 2, 1])
+    with sim_cols[0]:
+        st.markdown('<div class="player-selector-card">', unsafe_allow_html=True)
+        st.markdown("#### Player")
+        pid = pick_by_name(st, "Player")
+        st.markdown('</div>', unsafe_allow_html=True)
+    scope = sim_cols[1].radio(
+        "Search", ["This season", "Last 10 seasons", f"All seasons since {seasons_since()[0]}"],
+        help="Player-seasons are compared on per-36 production, shooting and usage, normalized within each season",
+    )
+    k = sim_cols[2].slider("Matches", min_value=5, max_value=25, value=10)
+
+    if not pid:
+        st.info("Select a player to find similar players.")
+        st.stop()
+
+    search = {
+        "This season": None,
+        "Last 10 seasons": list(reversed(recent_seasons(10))),
+    }.get(scope, seasons_since())
+    with st.spinner("Searching player-seasons..."):
+        me, matches = similar_players(pid, season, seasons=search, k=k, refresh=refresh)
+
+    if me.empty:
+        st.info(f"No {season} stats with enough minutes to compare for this player.")
+        st.stop()
+
+    st.divider()
+    st.markdown(f'<p class="section-title">Most Similar to {me["PLAYER_NAME"].iloc[0]} ({season})</p>', unsafe_allow_html=True)
+
+    cols = {
+        "PLAYER_NAME": "Player", "SEASON": "Season", "TEAM_ABBREVIATION": "Team", "SIMILARITY": "Similarity",
+        "PTS_36": "PTS/36", "REB_36": "REB/36", "AST_36": "AST/36", "FG3A_36": "3PA/36",
+        "TS_PCT": "TS%", "USG_PCT": "USG%",
+    }
+    disp = pd.concat([me, matches], ignore_index=True)[list(cols)].rename(columns=cols)
+    st.dataframe(
+        disp.round(1),
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Player": st.column_config.TextColumn("Player", width="medium"),
+            "Similarity": st.column_config.ProgressColumn("Similarity", min_value=0, max_value=100, format="%.1f"),
+        }
+    )
+    st.caption("First row is the selected player. Similarity is the cosine of season-normalized stat vectors (100 = identical profile).")
+
 # Footer
 st.divider()
 st.markdown("""
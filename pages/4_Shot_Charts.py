@@ -1,12 +1,37 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+import numpy as np
 
-from courtvision.data.nba_client import (
+from courtvision.data.nba_client import recent_seasons, TEAMS
+from courtvision.data.st_cache import (
     search_players,
-    recent_seasons,
-    get_player_shotchart,
+    player_shot_index,
+    league_shot_index,
+)
+from courtvision.viz.shotcharts import (
+    SHOT_FIGURES,
+    HEAT_BINS,
+    HOT_CELL,
+    HOT_SIGMA_FT,
+    HOT_PRIOR,
+    shot_summary,
+    build_scatter_figure,
+    build_heatmap_figure,
+    build_hot_zone_figure,
+    build_career_zone_mix_figure,
+    build_career_efficiency_figure,
+    build_raster_figure,
+    FG_SCALE,
+    VOLUME_SCALE,
+)
+from courtvision.data.shots import (
+    player_hot_zones,
+    smoothed_fg_surface,
+    smoothed_surface_from_grids,
+    baseline_surface,
+    player_career_shots,
+    team_shot_profile,
+    league_raster,
 )
 
 # Page config for better styling
@@ -36,10 +61,117 @@ st.markdown("### Settings")
 control_cols = st.columns([2, 2, 1, 1])
 season = control_cols[0].selectbox("Season", options=recent_seasons(10))
 season_type = control_cols[1].selectbox(" Season Type", options=["Regular Season", "Playoffs"])
+scope = control_cols[2].radio("View", options=["Season", "Career"], help="Career aggregates every season the player has shot data for")
 refresh = control_cols[3].button("Refresh", use_container_width=True)
 
+subject = st.radio("Chart shots for", options=["Players", "Team", "League"], horizontal=True)
+
 st.divider()
 
+# ---------- Team / opponent shot charts ----------
+
+if subject == "Team":
+    st.markdown("### Select Team")
+    tcols = st.columns([3, 2])
+    team_name = tcols[0].selectbox("Team", options=TEAMS.names)
+    side_label = tcols[1].radio("Shots", options=["Taken by team", "Allowed to opponents"], horizontal=True)
+    team = TEAMS.by_name[team_name]
+    side = "offense" if side_label == "Taken by team" else "defense"
+    if scope == "Career":
+        st.caption("Team charts are season-level; showing the selected season.")
+
+    team_key = ("team", team["team_id"], season, season_type)
+    if refresh:
+        SHOT_FIGURES.invalidate(("team",))
+
+    with st.spinner("Loading league shot cube..."):
+        prof = team_shot_profile(team["team_id"], season, season_type=season_type, side=side, refresh=refresh)
+    if prof is None:
+        st.info(f"No shot data for the {team_name} in {season} ({season_type}).")
+        st.stop()
+
+    zones = prof["zones"]
+    fga, fgm = int(zones["FGA"].sum()), int(zones["FGM"].sum())
+    lg = prof["league"]["zones"]
+    lg_fg = lg["FGM"].sum() / lg["FGA"].sum() if lg["FGA"].sum() else 0
+    st.markdown(f"### {team_name} — {'shots taken' if side == 'offense' else 'shots allowed'}")
+    m1, m2, m3 = st.columns(3)
+    m1.metric("FG%", f"{(fgm / fga * 100) if fga else 0:.1f}%", f"{((fgm / fga) - lg_fg) * 100 if fga else 0:+.1f} vs league")
+    m2.metric("Attempts", f"{fga:,}")
+    m3.metric("Made", f"{fgm:,}")
+
+    def _team_hot_zones():
+        league = prof["league"]
+        lg_surf = smoothed_surface_from_grids(league["made"], league["attempts"], sigma_ft=HOT_SIGMA_FT, cell=prof["cell"])
+        baseline = np.nan_to_num(lg_surf["fg"], nan=lg_fg)
+        surf = smoothed_surface_from_grids(
+            prof["made"], prof["attempts"], sigma_ft=HOT_SIGMA_FT, cell=prof["cell"],
+            baseline=baseline, prior_weight=HOT_PRIOR,
+        )
+        return build_hot_zone_figure([(team_name, surf)])
+
+    st.plotly_chart(
+        SHOT_FIGURES.figure(team_key + (side, "hotzones", HOT_SIGMA_FT, HOT_PRIOR), _team_hot_zones),
+        use_container_width=True,
+    )
+
+    lgz = lg.set_index("SHOT_ZONE_BASIC")
+    table = zones.assign(
+        **{
+            "FG%": (zones["FGM"] / zones["FGA"] * 100).round(1),
+            "Share": (zones["FGA"] / fga * 100).round(1) if fga else 0.0,
+            "League FG%": (zones["SHOT_ZONE_BASIC"].map(lgz["FGM"] / lgz["FGA"]) * 100).round(1),
+        }
+    ).rename(columns={"SHOT_ZONE_BASIC": "Zone"}).sort_values("FGA", ascending=False)
+    st.dataframe(table, use_container_width=True, hide_index=True)
+    st.stop()
+
+# ---------- League-wide rasterized maps ----------
+
+if subject == "League":
+    st.markdown("### League Shot Map")
+    st.caption("Every matching shot in the league, aggregated to a fixed pixel grid.")
+
+    with st.spinner("Loading league shots..."):
+        lidx = league_shot_index(season, season_type=season_type, refresh=refresh)
+    if lidx.n == 0:
+        st.info(f"No league shot data for {season} ({season_type}).")
+        st.stop()
+
+    lcols = st.columns([1, 1, 1.2, 2])
+    l_results = lcols[0].multiselect("Result", options=lidx.values("SHOT_MADE_FLAG"), key="l_result")
+    l_periods = lcols[1].multiselect("Quarter", options=lidx.values("PERIOD"), key="l_period")
+    l_shot_types = lcols[2].multiselect("Shot type", options=lidx.values("SHOT_TYPE"), key="l_shot_type")
+    l_zones = lcols[3].multiselect("Zone", options=lidx.values("SHOT_ZONE_BASIC"), key="l_zone")
+    rcols = st.columns(2)
+    l_measure = rcols[0].radio("Measure", options=["Shot density", "FG%"], horizontal=True, key="l_measure")
+    l_norm = rcols[1].radio(
+        "Color scaling", options=["eq_hist", "log", "linear"], horizontal=True, key="l_norm",
+        disabled=l_measure == "FG%",
+        help="eq_hist spreads colors evenly over pixels; log compresses dense areas",
+    )
+
+    l_filters = dict(
+        results=tuple(l_results), periods=tuple(l_periods),
+        shot_types=tuple(l_shot_types), zones=tuple(l_zones),
+    )
+    how = "mean" if l_measure == "FG%" else "count"
+    # the index was refreshed above, which already dropped the stale rasters
+    raster = league_raster(season, season_type=season_type, how=how, norm=l_norm, **l_filters)
+    if raster is None or raster["n"] == 0:
+        st.info("No shots match these filters.")
+        st.stop()
+
+    if refresh:
+        SHOT_FIGURES.invalidate(("league",))
+    title = f"{raster['n']:,} shots · {season} {season_type}"
+    fig_league = SHOT_FIGURES.figure(
+        ("league", raster["hash"]),
+        lambda: build_raster_figure(raster, title, colorscale=FG_SCALE if how == "mean" else VOLUME_SCALE),
+    )
+    st.plotly_chart(fig_league, use_container_width=True)
+    st.stop()
+
 st.markdown("### Select Players to Compare")
 st.caption("Search for up to two players to visualize their shot profiles side-by-side")
 
@@ -110,50 +242,162 @@ elif len(players) > 2:
 
 st.divider()
 
+# ---------- Career profile ----------
+
+if scope == "Career":
+    career_key = (tuple(p["player_id"] for p in players), "career", season_type)
+    if refresh:
+        SHOT_FIGURES.invalidate(career_key)
+
+    careers = {}
+    for p in players:
+        with st.spinner(f"Loading career shots for {p['name']}..."):
+            careers[p["player_id"]] = player_career_shots(p["player_id"], season_type=season_type, cell=HOT_CELL, refresh=refresh)
+
+    st.markdown("### Career Shot Profile")
+    stat_cols = st.columns(len(players))
+    for col, p in zip(stat_cols, players):
+        prof = careers[p["player_id"]]["profile"]
+        fga, fgm = int(prof["FGA"].sum()), int(prof["FGM"].sum())
+        seasons_played = careers[p["player_id"]]["seasons"]
+        span = f"{seasons_played[0]} → {seasons_played[-1]}" if seasons_played else "no shot data"
+        col.metric(f"**{p['name']}**", f"{(fgm / fga * 100) if fga else 0:.1f}%", f"{fgm}/{fga} · {span}")
+
+    for p in players:
+        prof = careers[p["player_id"]]["profile"]
+        if prof.empty:
+            st.info(f"No career shot data for {p['name']} ({season_type}).")
+            continue
+        c1, c2 = st.columns(2)
+        c1.plotly_chart(
+            SHOT_FIGURES.figure(career_key + (p["player_id"], "mix"),
+                                lambda: build_career_zone_mix_figure(prof, p["name"])),
+            use_container_width=True,
+        )
+        c2.plotly_chart(
+            SHOT_FIGURES.figure(career_key + (p["player_id"], "fg"),
+                                lambda: build_career_efficiency_figure(prof, p["name"])),
+            use_container_width=True,
+        )
+
+    st.markdown("### Career Hot Zones")
+    st.caption(f"Kernel-density FG% over every season ({HOT_SIGMA_FT:.0f} ft Gaussian).")
+
+    def _career_hot_zones():
+        surfaces = [
+            (p["name"], smoothed_surface_from_grids(
+                careers[p["player_id"]]["made"], careers[p["player_id"]]["attempts"],
+                sigma_ft=HOT_SIGMA_FT, cell=HOT_CELL,
+            ))
+            for p in players if careers[p["player_id"]]["seasons"]
+        ]
+        return build_hot_zone_figure(surfaces) if surfaces else None
+
+    fig_career = SHOT_FIGURES.figure(career_key + ("hotzones", HOT_CELL, HOT_SIGMA_FT), _career_hot_zones)
+    if fig_career is not None:
+        st.plotly_chart(fig_career, use_container_width=True)
+    st.stop()
+
+# ---------- Shot filters ----------
+
+# One in-memory index per player-season; filter changes are answered from it
+# without reloading or rescanning the shot frames.
+indexes = {
+    p["player_id"]: player_shot_index(p["player_id"], season, season_type=season_type, refresh=refresh)
+    for p in players
+}
+
+def _union(col):
+    vals = set()
+    for idx in indexes.values():
+        vals.update(idx.values(col))
+    return sorted(vals)
+
+with st.expander("Filter shots", expanded=False):
+    fcols = st.columns([1, 1.2, 2, 1])
+    f_periods = fcols[0].multiselect("Quarter", options=_union("PERIOD"), key="f_period")
+    f_shot_types = fcols[1].multiselect("Shot type", options=_union("SHOT_TYPE"), key="f_shot_type")
+    f_actions = fcols[2].multiselect("Action type", options=_union("ACTION_TYPE"), key="f_action")
+    f_last_n = fcols[3].number_input("Last N games (0 = all)", min_value=0, max_value=110, value=0, step=1, key="f_last_n")
+
+    all_dates = sorted({d for idx in indexes.values() for d in idx.game_dates.tolist()})
+    f_from = f_to = None
+    if all_dates:
+        picked = st.date_input(
+            "Game dates",
+            value=(all_dates[0], all_dates[-1]),
+            min_value=all_dates[0],
+            max_value=all_dates[-1],
+            key="f_dates",
+        )
+        if isinstance(picked, (list, tuple)) and len(picked) == 2:
+            if picked[0] > all_dates[0]:
+                f_from = picked[0]
+            if picked[1] < all_dates[-1]:
+                f_to = picked[1]
+
+filters = dict(
+    periods=tuple(f_periods),
+    shot_types=tuple(f_shot_types),
+    action_types=tuple(f_actions),
+    last_n_games=int(f_last_n),
+    date_from=f_from,
+    date_to=f_to,
+)
+filtered = any(filters.values())
+filter_key = tuple(str(filters[k]) for k in sorted(filters))
+
 # ---------- Load shot data ----------
 
-all_shots = []
+# Everything below is keyed by this selection; figures are served from the
+# spec cache and shots are only loaded when something has to be (re)built.
+selection = (tuple(p["player_id"] for p in players), season, season_type)
+if refresh:
+    SHOT_FIGURES.invalidate(selection)
+view = selection + (filter_key,)
+
+# Emptiness comes from the index bitmaps, so the warnings show on figure-cache hits too.
+shown = [p for p in players if len(indexes[p["player_id"]].positions(**filters))]
 for p in players:
-    with st.spinner(f"Loading shots for {p['name']}..."):
-        df = get_player_shotchart(
-            p["player_id"],
-            season,
-            season_type=season_type,
-            refresh=refresh,
-        )
-    if df.empty:
-        st.warning(f"No shot data for {p['name']} in {season} ({season_type}).")
+    if p in shown:
         continue
-    df = df.copy()
-    df["Player"] = p["name"]
-    all_shots.append(df)
-
-if not all_shots:
+    if filtered:
+        st.warning(f"No shots for {p['name']} match the current filters.")
+    else:
+        st.warning(f"No shot data for {p['name']} in {season} ({season_type}).")
+if not shown:
     st.info("No shot data available for the selected players / season.")
     st.stop()
 
-shots = pd.concat(all_shots, ignore_index=True)
+_loaded = {}
 
-# Minimal extra columns
-if "SHOT_MADE_FLAG" in shots.columns:
-    shots["Result"] = shots["SHOT_MADE_FLAG"].map({1: "Made", 0: "Miss"}).fillna("Unknown")
-if "SHOT_DISTANCE" not in shots.columns:
-    shots["SHOT_DISTANCE"] = None
+def player_shots(p):
+    return indexes[p["player_id"]].query(**filters)
+
+def load_shots():
+    if "shots" in _loaded:
+        return _loaded["shots"]
+    all_shots = []
+    for p in shown:
+        df = player_shots(p).copy()
+        df["Player"] = p["name"]
+        all_shots.append(df)
+
+    shots = pd.concat(all_shots, ignore_index=True)
+
+    # Minimal extra columns
+    if "SHOT_MADE_FLAG" in shots.columns:
+        shots["Result"] = shots["SHOT_MADE_FLAG"].map({1: "Made", 0: "Miss"}).fillna("Unknown")
+    if "SHOT_DISTANCE" not in shots.columns:
+        shots["SHOT_DISTANCE"] = None
+    _loaded["shots"] = shots
+    return shots
 
 # Calculate some stats for display
-stats_data = []
-for p in players:
-    player_shots = shots[shots["Player"] == p["name"]]
-    total_shots = len(player_shots)
-    made_shots = (player_shots["SHOT_MADE_FLAG"] == 1).sum() if "SHOT_MADE_FLAG" in player_shots.columns else 0
-    fg_pct = (made_shots / total_shots * 100) if total_shots > 0 else 0
-    
-    stats_data.append({
-        "Player": p["name"],
-        "Total Shots": total_shots,
-        "Made": made_shots,
-        "FG%": f"{fg_pct:.1f}%"
-    })
+stats_data = SHOT_FIGURES.data(
+    view + ("stats",),
+    lambda: shot_summary(load_shots(), [p["name"] for p in players]),
+)
 
 # Display stats
 st.markdown("### Shot Statistics")
@@ -164,143 +408,6 @@ for idx, stat in enumerate(stats_data):
 
 st.divider()
 
-# ---------- Court helper ----------
-
-def draw_court_lines():
-    """
-    Generate court line coordinates as numpy arrays for plotting.
-    Returns list of (x, y) arrays for each court element.
-    """
-    import numpy as np
-    
-    lines = []
-    
-    # Court dimensions
-    baseline_y = -47.5
-    court_width = 250
-    
-    # ===== OUTER BOUNDARY =====
-    # Baseline
-    lines.append((np.array([-court_width, court_width]), np.array([baseline_y, baseline_y])))
-    # Left sideline
-    lines.append((np.array([-court_width, -court_width]), np.array([baseline_y, 470])))
-    # Right sideline
-    lines.append((np.array([court_width, court_width]), np.array([baseline_y, 470])))
-    
-    # ===== BACKBOARD =====
-    lines.append((np.array([-30, 30]), np.array([-7.5, -7.5])))
-    
-    # ===== HOOP =====
-    hoop_theta = np.linspace(0, 2*np.pi, 50)
-    hoop_x = 7.5 * np.cos(hoop_theta)
-    hoop_y = 7.5 * np.sin(hoop_theta)
-    lines.append((hoop_x, hoop_y))
-    
-    # ===== PAINT/KEY =====
-    lane_width = 80  # half width on each side
-    free_throw_y = baseline_y + 190
-    
-    # Left lane line
-    lines.append((np.array([-lane_width, -lane_width]), np.array([baseline_y, free_throw_y])))
-    # Right lane line
-    lines.append((np.array([lane_width, lane_width]), np.array([baseline_y, free_throw_y])))
-    # Free throw line
-    lines.append((np.array([-lane_width, lane_width]), np.array([free_throw_y, free_throw_y])))
-    
-    # ===== FREE THROW CIRCLE =====
-    # Top arc (solid)
-    ft_theta = np.linspace(0, np.pi, 50)
-    ft_x = 60 * np.cos(ft_theta)
-    ft_y = 60 * np.sin(ft_theta) + free_throw_y
-    lines.append((ft_x, ft_y))
-    
-    # ===== RESTRICTED AREA =====
-    # Small arc under basket
-    restricted_theta = np.linspace(0, np.pi, 30)
-    restricted_x = 40 * np.cos(restricted_theta)
-    restricted_y = 40 * np.sin(restricted_theta)
-    lines.append((restricted_x, restricted_y))
-    
-    # ===== THREE-POINT LINE =====
-    # Left corner
-    lines.append((np.array([-220, -220]), np.array([baseline_y, 92.5])))
-    # Right corner
-    lines.append((np.array([220, 220]), np.array([baseline_y, 92.5])))
-    
-    # Three-point arc
-    corner_angle = np.arctan2(92.5, 220)
-    three_theta = np.linspace(corner_angle, np.pi - corner_angle, 100)
-    three_x = 237.5 * np.cos(three_theta)
-    three_y = 237.5 * np.sin(three_theta)
-    lines.append((three_x, three_y))
-    
-    return lines
-
-
-def add_simplified_court(fig):
-    """
-    Add court lines to figure using scatter traces.
-    """
-    court_lines = draw_court_lines()
-    
-    # Find all subplot references
-    axes_pairs = [("xaxis", "yaxis")]
-    i = 2
-    while f"xaxis{i}" in fig.layout and f"yaxis{i}" in fig.layout:
-        axes_pairs.append((f"xaxis{i}", f"yaxis{i}"))
-        i += 1
-    
-    # Add court lines to each subplot
-    for idx, (xaxis_key, yaxis_key) in enumerate(axes_pairs):
-        xaxis_num = "" if idx == 0 else str(idx + 1)
-        yaxis_num = "" if idx == 0 else str(idx + 1)
-        
-        for line_x, line_y in court_lines:
-            fig.add_trace(
-                dict(
-                    type="scatter",
-                    x=line_x,
-                    y=line_y,
-                    mode="lines",
-                    line=dict(color="#333333", width=2),  # Dark gray lines for light background
-                    showlegend=False,
-                    hoverinfo="skip",
-                    xaxis=f"x{xaxis_num}" if xaxis_num else "x",
-                    yaxis=f"y{yaxis_num}" if yaxis_num else "y",
-                )
-            )
-    
-    return fig
-
-
-def apply_court_layout(fig):
-    """
-    Apply consistent court dimensions and aspect ratio to all subplots.
-    """
-    x_range = [-250, 250]
-    y_range = [-52, 440]
-    
-    # Update all x and y axes
-    fig.update_xaxes(
-        range=x_range,
-        showgrid=False,
-        zeroline=False,
-        showticklabels=False,
-        title=""
-    )
-    fig.update_yaxes(
-        range=y_range,
-        scaleanchor="x",
-        scaleratio=1,
-        showgrid=False,
-        zeroline=False,
-        showticklabels=False,
-        title=""
-    )
-    
-    return fig
-
-
 # ---------- Shot scatter chart ----------
 
 st.markdown("### Shot Chart")
@@ -312,67 +419,11 @@ color_mode = st.radio(
     horizontal=True,
 )
 
-if color_mode == "Player":
-    color_col = "Player"
-    color_map = {"Nikola Jokić": "#1f77b4", "Kevin Durant": "#ff7f0e"}  # Custom colors
-elif color_mode == "Make/Miss" and "Result" in shots.columns:
-    color_col = "Result"
-    color_map = {"Made": "#2ecc71", "Miss": "#e74c3c"}  # Green for made, red for miss
-else:
-    color_col = "SHOT_ZONE_BASIC" if "SHOT_ZONE_BASIC" in shots.columns else "Player"
-    color_map = None
-
-# Minimal hover: player, distance, result
-hover_data = {
-    "Player": True,
-    "SHOT_DISTANCE": True,
-    "Result": True if "Result" in shots.columns else False,
-    "SHOT_ZONE_BASIC": False,
-    "GAME_DATE": False,
-    "LOC_X": False,
-    "LOC_Y": False,
-}
-
-fig_scatter = px.scatter(
-    shots,
-    x="LOC_X",
-    y="LOC_Y",
-    color=color_col,
-    color_discrete_map=color_map,
-    hover_data=hover_data,
-    facet_col="Player" if len(players) > 1 else None,
-    opacity=0.7,
+fig_scatter = SHOT_FIGURES.figure(
+    view + ("scatter", color_mode),
+    lambda: build_scatter_figure(load_shots(), color_mode, facet=len(players) > 1),
 )
 
-# Update marker size and styling
-fig_scatter.update_traces(marker=dict(size=8, line=dict(width=0.5, color='#333333')))
-
-# Apply court layout and add court lines
-fig_scatter = apply_court_layout(fig_scatter)
-fig_scatter = add_simplified_court(fig_scatter)
-
-fig_scatter.update_layout(
-    height=650,
-    margin=dict(l=10, r=10, t=50, b=10),
-    legend=dict(
-        orientation="h",
-        yanchor="bottom",
-        y=1.02,
-        xanchor="center",
-        x=0.5,
-        font=dict(size=12, color="#333333")
-    ),
-    plot_bgcolor="#f0e6d2",  # Light tan court color (like real wood)
-    paper_bgcolor="#ffffff",
-    font=dict(color="#333333", size=12),
-)
-
-# Update subplot titles
-fig_scatter.for_each_annotation(lambda a: a.update(
-    text=a.text.split("=")[-1],
-    font=dict(size=16, color="#333333", family="Arial Black")
-))
-
 st.plotly_chart(fig_scatter, use_container_width=True)
 
 st.divider()
@@ -383,95 +434,46 @@ st.caption("Darker areas show cold zones, brighter areas show hot zones. The cou
 
 metric = st.radio(
     "Heatmap metric:",
-    options=["FG%", "Shot volume (FGA)"],
+    options=["FG%", "Smoothed FG% (vs league)", "Shot volume (FGA)"],
     horizontal=True,
 )
 
-shots_heat = shots.dropna(subset=["LOC_X", "LOC_Y"])
-
-if shots_heat.empty:
-    st.info("No valid shot locations to build a heatmap.")
-else:
-    # Fixed court extents
-    x_min, x_max = -250, 250
-    y_min, y_max = -52, 440
-    bins_x = 30
-    bins_y = 30
-
-    if metric == "FG%" and "SHOT_MADE_FLAG" in shots_heat.columns:
-        fig_heat = px.density_heatmap(
-            shots_heat,
-            x="LOC_X",
-            y="LOC_Y",
-            z="SHOT_MADE_FLAG",
-            histfunc="avg",
-            nbinsx=bins_x,
-            nbinsy=bins_y,
-            facet_col="Player" if len(players) > 1 else None,
-            color_continuous_scale=[
-                [0.0, "#1a0033"],   # Deep purple (0%)
-                [0.2, "#4d0080"],   # Purple
-                [0.35, "#8B00FF"],  # Violet
-                [0.5, "#FF1493"],   # Deep pink
-                [0.65, "#FF6347"],  # Tomato
-                [0.8, "#FFD700"],   # Gold
-                [1.0, "#FFFF00"],   # Bright yellow (100%)
-            ],
-            range_color=(0, 1),
-            labels={"SHOT_MADE_FLAG": "FG%"},
-        )
-        color_title = "FG%"
-    else:
-        fig_heat = px.density_heatmap(
-            shots_heat,
-            x="LOC_X",
-            y="LOC_Y",
-            nbinsx=bins_x,
-            nbinsy=bins_y,
-            facet_col="Player" if len(players) > 1 else None,
-            color_continuous_scale=[
-                [0.0, "#0a0a0a"],   # Almost black (low)
-                [0.2, "#2d1b69"],   # Dark purple
-                [0.4, "#7209b7"],   # Purple
-                [0.6, "#f72585"],   # Pink
-                [0.8, "#ff6d00"],   # Orange
-                [1.0, "#ffd60a"],   # Yellow (high)
-            ],
-        )
-        color_title = "Shot Count"
-
-    # Force consistent bins across court
-    fig_heat.update_traces(
-        xbins=dict(start=x_min, end=x_max, size=(x_max - x_min) / bins_x),
-        ybins=dict(start=y_min, end=y_max, size=(y_max - y_min) / bins_y),
-        zsmooth="best",
+def _build_hot_zones():
+    surfaces = []
+    for p in players:
+        if filtered:
+            df = player_shots(p)
+            surf = smoothed_fg_surface(
+                df, sigma_ft=HOT_SIGMA_FT, cell=HOT_CELL, prior_weight=HOT_PRIOR,
+                baseline=baseline_surface(season, season_type, cell=HOT_CELL, shots=df),
+            ) if not df.empty else None
+        else:
+            surf = player_hot_zones(
+                p["player_id"], season, season_type=season_type,
+                sigma_ft=HOT_SIGMA_FT, cell=HOT_CELL, prior_weight=HOT_PRIOR,
+            )
+        if surf is not None:
+            surfaces.append((p["name"], surf))
+    return build_hot_zone_figure(surfaces) if surfaces else None
+
+if metric == "Smoothed FG% (vs league)":
+    st.caption(
+        f"Kernel-density FG% ({HOT_SIGMA_FT:.0f} ft Gaussian), shrunk toward the league average "
+        "for each zone where the player has few attempts."
     )
-
-    # Apply court layout and add court lines
-    fig_heat = apply_court_layout(fig_heat)
-    fig_heat = add_simplified_court(fig_heat)
-
-    fig_heat.update_layout(
-        height=650,
-        margin=dict(l=10, r=10, t=50, b=10),
-        coloraxis_colorbar=dict(
-            title=dict(text=color_title, font=dict(size=14, color="white")),
-            tickformat=".0%" if metric == "FG%" else None,
-            tickfont=dict(color="white", size=12),
-            len=0.7,
-            thickness=20,
-        ),
-        plot_bgcolor="#000000",  # Black background like Curry chart
-        paper_bgcolor="#16213e",
-        font=dict(color="white", size=12),
+    fig_heat = SHOT_FIGURES.figure(
+        view + ("hotzones", HOT_CELL, HOT_SIGMA_FT, HOT_PRIOR),
+        _build_hot_zones,
+    )
+else:
+    fig_heat = SHOT_FIGURES.figure(
+        view + ("heatmap", metric, HEAT_BINS),
+        lambda: build_heatmap_figure(load_shots(), metric, facet=len(players) > 1, bins=HEAT_BINS),
     )
 
-    # Update subplot titles
-    fig_heat.for_each_annotation(lambda a: a.update(
-        text=a.text.split("=")[-1],
-        font=dict(size=16, color="white", family="Arial Black")
-    ))
-
+if fig_heat is None:
+    st.info("No valid shot locations to build a heatmap.")
+else:
     st.plotly_chart(fig_heat, use_container_width=True)
 
 # Add footer
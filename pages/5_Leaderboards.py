@@ -0,0 +1,73 @@
+# pages/5_Leaderboards.py
+import streamlit as st
+
+from courtvision.data.nba_client import SEASON_TYPES, recent_seasons
+from courtvision.data.leaders import LEADER_STATS, QUALIFY_GP_FRAC, QUALIFY_MPG
+from courtvision.data.st_cache import league_leaderboard
+
+st.set_page_config(layout="wide")
+
+st.title("League Leaderboards")
+st.caption("Every player in the league ranked by season averages and advanced metrics")
+
+# --- Controls ---
+control_cols = st.columns([2, 2, 3, 2, 1])
+season = control_cols[0].selectbox("Season", options=recent_seasons(10))
+season_type = control_cols[1].selectbox("Season Type", options=SEASON_TYPES)
+stat = control_cols[2].selectbox(
+    "Stat",
+    options=list(LEADER_STATS),
+    format_func=lambda s: LEADER_STATS[s][0],
+)
+refresh = control_cols[4].button("Refresh", use_container_width=True)
+
+with st.spinner("Loading league leaderboard..."):
+    board = league_leaderboard(season, refresh=refresh, season_type=season_type)
+
+if board.n == 0:
+    st.info(f"No league data available for {season} ({season_type}).")
+    st.stop()
+
+teams = board.teams()
+team_labels = ["All teams"] + [abbr for _, abbr in teams]
+team_pick = control_cols[3].selectbox("Team", options=team_labels)
+team_id = None if team_pick == "All teams" else teams[team_labels.index(team_pick) - 1][0]
+
+opt_cols = st.columns([2, 3])
+qualified = opt_cols[0].checkbox(
+    "Qualified players only", value=True,
+    help=f"At least {QUALIFY_GP_FRAC:.0%} of team games and {QUALIFY_MPG:.0f} MPG; "
+         "percentage stats also need a pro-rated minimum of makes",
+)
+top_n = opt_cols[1].slider("Show top", min_value=10, max_value=100, value=25, step=5)
+
+rows = board.top(stat, n=top_n, qualified=qualified, team_id=team_id)
+if rows.empty:
+    st.info("No players qualify for this stat yet.")
+    st.stop()
+
+rank_col = f"{stat}_RANK" if qualified else f"{stat}_RANK_ALL"
+disp = rows.assign(Rank=rows[rank_col].astype(int))[
+    ["Rank", "PLAYER_NAME", "TEAM_ABBREVIATION", "GP", "MIN", stat, f"{stat}_PCTILE"]
+].rename(columns={
+    "PLAYER_NAME": "Player", "TEAM_ABBREVIATION": "Team", "MIN": "MPG",
+    stat: LEADER_STATS[stat][0], f"{stat}_PCTILE": "Percentile",
+})
+
+label = LEADER_STATS[stat][0]
+st.dataframe(
+    disp,
+    use_container_width=True,
+    hide_index=True,
+    column_config={
+        "Rank": st.column_config.NumberColumn("Rank", width="small", help="League rank"),
+        "Player": st.column_config.TextColumn("Player", width="medium"),
+        "GP": st.column_config.NumberColumn("GP", width="small", format="%d"),
+        "MPG": st.column_config.NumberColumn("MPG", width="small", format="%.1f"),
+        label: st.column_config.NumberColumn(label, format="%.2f" if stat == "AST_TO" else "%.1f"),
+        "Percentile": st.column_config.ProgressColumn(
+            "Percentile", min_value=0, max_value=100, format="%.0f",
+            help="Percentile among qualified players",
+        ),
+    },
+)
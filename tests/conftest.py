@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Tests import the app's packages from the repo root (no install step)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
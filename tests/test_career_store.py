@@ -0,0 +1,77 @@
+import pandas as pd
+import pytest
+
+from courtvision.data import nba_client as nc
+
+
+def _totals():
+    # season totals: player 1 played for two teams (listed with the last one), player 2 for one
+    return pd.DataFrame({
+        "PLAYER_ID": [1, 2], "PLAYER_NAME": ["a", "b"], "TEAM_ID": [20, 30], "TEAM_ABBREVIATION": ["BBB", "CCC"],
+        "AGE": [27.0, 31.0], "GP": [3, 2], "MIN": [90.0, 60.0], "FGM": [12, 8], "FGA": [24, 10], "PTS": [30, 20],
+    })
+
+
+def _game_log():
+    rows = [
+        # PLAYER_ID, TEAM_ID, abbr, GAME_ID, GAME_DATE, MIN, FGM, FGA, PTS
+        (1, 10, "AAA", 101, "2024-10-22", 30, 5, 8, 12),
+        (1, 20, "BBB", 202, "2025-02-10", 30, 3, 8, 8),
+        (1, 20, "BBB", 203, "2025-02-12", 30, 4, 8, 10),
+        (2, 30, "CCC", 301, "2024-10-23", 30, 4, 5, 10),
+        (2, 30, "CCC", 302, "2024-10-25", 30, 4, 5, 10),
+    ]
+    return pd.DataFrame(rows, columns=["PLAYER_ID", "TEAM_ID", "TEAM_ABBREVIATION", "GAME_ID", "GAME_DATE",
+                                       "MIN", "FGM", "FGA", "PTS"])
+
+
+class _FakeGameLog:
+    def __init__(self, **kw):
+        pass
+
+    def get_data_frames(self):
+        return [_game_log()]
+
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    monkeypatch.setattr(nc, "_p", lambda name: tmp_path / name)
+    monkeypatch.setattr(nc, "_CAREER_STORE", None)
+    monkeypatch.setattr(nc, "_league_player_totals", lambda season, refresh=False, season_type="Regular Season": _totals())
+    monkeypatch.setattr(nc.leaguegamelog, "LeagueGameLog", _FakeGameLog)
+    monkeypatch.setattr(nc, "_current_season_str", lambda: "2025-26")
+    index = pd.DataFrame({"player_id": [1, 2, 3], "from_year": [2024, 2023, 1990], "to_year": [2024, 2025, 2003]})
+    monkeypatch.setattr(nc, "player_index_table", lambda season=None, refresh=False: index.set_index("player_id", drop=False))
+    return tmp_path
+
+
+def test_traded_season_keeps_stints_and_tot(store):
+    rows = nc._season_career_rows("2024-25")
+    assert list(rows.columns) == nc.CAREER_COLS
+    one = rows[rows["PLAYER_ID"] == 1]
+    assert one["TEAM_ABBREVIATION"].tolist() == ["AAA", "BBB", "TOT"]
+    assert one["TEAM_ID"].tolist() == [10, 20, 0]
+    assert one["GP"].tolist() == [1, 2, 3]
+    assert one["FG_PCT"].tolist()[:2] == [0.625, 0.438]
+    assert one["PLAYER_AGE"].tolist() == [27.0, 27.0, 27.0]
+    assert rows.loc[rows["PLAYER_ID"] == 2, "TEAM_ABBREVIATION"].tolist() == ["CCC"]
+
+
+def test_store_serves_only_whole_careers(store, monkeypatch):
+    assert nc.ingest_career_store(["2024-25"]) == ["2024-25"]
+    assert nc.career_store_rows(1)["TEAM_ABBREVIATION"].tolist() == ["AAA", "BBB", "TOT"]
+    # reloaded from disk in the same order
+    monkeypatch.setattr(nc, "_CAREER_STORE", None)
+    assert nc.career_store_rows(1)["TEAM_ABBREVIATION"].tolist() == ["AAA", "BBB", "TOT"]
+
+    assert nc._career_store_covers(1)
+    assert not nc._career_store_covers(2)    # 2023-24 and 2025-26 are not in the store
+    assert not nc._career_store_covers(3)    # career before the store starts
+    assert not nc._career_store_covers(99)   # not in the player index
+
+    fetched = []
+    monkeypatch.setattr(nc, "player_career_frame", lambda pid, frame="SeasonTotalsRegularSeason", refresh=False:
+                        fetched.append(pid) or pd.DataFrame({"SEASON_ID": ["2023-24"]}))
+    assert nc._career_df(1)["TEAM_ABBREVIATION"].tolist() == ["AAA", "BBB", "TOT"]
+    assert nc._career_df(2)["SEASON_ID"].tolist() == ["2023-24"]
+    assert fetched == [2]
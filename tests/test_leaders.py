@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from courtvision.data import leaders
+
+
+def _totals(rows):
+    cols = ["PLAYER_ID", "PLAYER_NAME", "TEAM_ID", "TEAM_ABBREVIATION", "GP", "MIN", "PTS", "FGM", "FG_PCT"]
+    return pd.DataFrame(rows, columns=cols)
+
+
+@pytest.fixture
+def season(monkeypatch):
+    #            id  name  team abbr  GP   MIN   PTS   FGM  FG_PCT
+    p = _totals([
+        (1, "a1", 1, "AAA", 60, 2100, 1800, 700, 0.50),   # 30 ppg, qualified
+        (2, "a2", 1, "AAA", 40, 1400, 1200, 450, 0.55),   # 40 < 0.7 * 60 games
+        (3, "a3", 1, "AAA", 50, 500, 1250, 450, 0.65),    # 10 mpg
+        (4, "b1", 2, "BBB", 55, 1925, 1100, 200, 0.60),   # 200 FGM < 300 * 60/82
+        (5, "b2", 2, "BBB", 45, 900, 1125, 300, 0.45),    # 25 ppg, qualified
+        (6, "b3", 2, "BBB", 0, 0, 0, 0, np.nan),          # no games
+    ])
+    monkeypatch.setattr(leaders, "_league_player_totals", lambda season, refresh=False, season_type="Regular Season": p)
+    monkeypatch.setattr(leaders, "league_advanced_table", lambda season, refresh=False, season_type="Regular Season": pd.DataFrame())
+    return p
+
+
+def _by_player(df, col):
+    return dict(zip(df["PLAYER_NAME"], df[col]))
+
+
+def test_qualification(season):
+    df = leaders._leaderboard_frame("2024-25")
+    assert _by_player(df, "QUALIFIED") == {"a1": True, "a2": False, "a3": False, "b1": True, "b2": True, "b3": False}
+
+
+def test_ranks_and_percentiles(season):
+    df = leaders._leaderboard_frame("2024-25")
+    rank = _by_player(df, "PTS_RANK")
+    assert (rank["a1"], rank["b2"], rank["b1"]) == (1, 2, 3)
+    assert all(np.isnan(rank[n]) for n in ("a2", "a3", "b3"))
+    # everyone with games, ties share the best rank
+    rank_all = _by_player(df, "PTS_RANK_ALL")
+    assert (rank_all["a1"], rank_all["a2"], rank_all["a3"], rank_all["b2"], rank_all["b1"]) == (1, 1, 3, 3, 5)
+    assert np.isnan(rank_all["b3"])
+    pct = _by_player(df, "PTS_PCTILE")
+    assert (pct["a1"], pct["b2"], pct["b1"]) == (100.0, pytest.approx(66.7), pytest.approx(33.3))
+
+
+def test_percentage_minimum_scales_with_games_played(season):
+    df = leaders._leaderboard_frame("2024-25")
+    fg = _by_player(df, "FG_PCT_RANK")
+    # 300 FGM over 82 games -> ~219.5 after 60 games: b1 (200 FGM) has the best FG% but is not ranked
+    assert (fg["a1"], fg["b2"]) == (1, 2)
+    assert np.isnan(fg["b1"])
+    assert _by_player(df, "FG_PCT_RANK_ALL")["b1"] == 2
+
+
+def test_playoff_qualification_uses_own_team_games(monkeypatch):
+    p = _totals([
+        (1, "a1", 1, "AAA", 20, 700, 500, 180, 0.5),
+        (2, "b1", 2, "BBB", 5, 150, 100, 40, 0.5),    # out after 5 games: 5 of 5 (not 5 of 20)
+        (3, "b2", 2, "BBB", 3, 90, 60, 20, 0.5),      # 3 < 0.7 * 5
+    ])
+    monkeypatch.setattr(leaders, "_league_player_totals", lambda season, refresh=False, season_type="Regular Season": p)
+    monkeypatch.setattr(leaders, "league_advanced_table", lambda season, refresh=False, season_type="Regular Season": pd.DataFrame())
+    df = leaders._leaderboard_frame("2024-25", season_type="Playoffs")
+    assert _by_player(df, "QUALIFIED") == {"a1": True, "b1": True, "b2": False}
+
+
+def test_leaderboard_top_and_team_filter(season):
+    board = leaders.Leaderboard(leaders._leaderboard_frame("2024-25"))
+    assert board.top("PTS", n=2)["PLAYER_NAME"].tolist() == ["a1", "b2"]
+    assert board.top("PTS", n=0, team_id=2)["PLAYER_NAME"].tolist() == ["b2", "b1"]
+    assert board.top("PTS", n=0, qualified=False)["PLAYER_NAME"].tolist() == ["a1", "a2", "a3", "b2", "b1"]
+    assert board.player(5)["PTS_RANK"] == 2
+    assert board.player(99) is None
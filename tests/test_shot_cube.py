@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+
+from courtvision.data import shots
+
+
+def _game(game_id, date, n_home, n_away):
+    rows = [(game_id, date, 1 if i < n_home else 2, 0, 100, i % 2, "Mid-Range") for i in range(n_home + n_away)]
+    return pd.DataFrame(rows, columns=["GAME_ID", "GAME_DATE", "TEAM_ID", "LOC_X", "LOC_Y", "SHOT_MADE_FLAG", "SHOT_ZONE_BASIC"])
+
+
+@pytest.fixture
+def league(monkeypatch, tmp_path):
+    state = {}
+    monkeypatch.setattr(shots, "_p", lambda name: tmp_path / name)
+    monkeypatch.setattr(shots, "get_league_shots", lambda season, season_type="Regular Season", refresh=False: state["shots"])
+    return state
+
+
+def _attempts(rows):
+    return rows.groupby("TEAM_ID")["FGA"].sum().to_dict()
+
+
+def test_in_progress_game_is_completed_on_refresh(league):
+    # game 2 is in progress when first ingested (2 + 1 shots), final later (6 + 4)
+    league["shots"] = pd.concat([_game(1, 20250101, 5, 5), _game(2, 20250102, 2, 1)], ignore_index=True)
+    assert _attempts(shots.update_shot_cube("2024-25")) == {1: 7, 2: 6}
+
+    league["shots"] = pd.concat([_game(1, 20250101, 5, 5), _game(2, 20250102, 6, 4)], ignore_index=True)
+    assert _attempts(shots.update_shot_cube("2024-25", refresh=True)) == {1: 11, 2: 9}
+
+    # a later date settles game 2; game 1 is not aggregated again
+    league["shots"] = pd.concat([_game(1, 20250101, 5, 5), _game(2, 20250102, 6, 4), _game(3, 20250103, 1, 1)],
+                                ignore_index=True)
+    assert _attempts(shots.update_shot_cube("2024-25", refresh=True)) == {1: 12, 2: 10}
+    meta = shots._load_json(shots._p("shot_cube_2024-25_Regular_Season_20.json"))
+    assert meta["games"] == [1, 2]
+    assert _attempts(shots.update_shot_cube("2024-25")) == {1: 12, 2: 10}
+
+
+def test_refresh_without_new_games_matches_full_build(league):
+    league["shots"] = pd.concat([_game(1, 20250101, 5, 3), _game(2, 20250102, 4, 4)], ignore_index=True)
+    shots.update_shot_cube("2024-25")
+    again = shots.update_shot_cube("2024-25", refresh=True)
+    full = shots._cube_rows(league["shots"], shots.CUBE_CELL)
+    pd.testing.assert_frame_equal(again.reset_index(drop=True), full, check_dtype=False)
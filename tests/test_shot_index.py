@@ -0,0 +1,100 @@
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from courtvision.data.shots import ShotIndex, period_label, result_label
+
+
+@pytest.fixture(scope="module")
+def shots():
+    rng = np.random.default_rng(3)
+    n = 2000
+    dates = pd.date_range("2024-10-22", periods=40, freq="2D").strftime("%Y%m%d")
+    return pd.DataFrame({
+        "LOC_X": rng.integers(-250, 250, n),
+        "LOC_Y": rng.integers(-50, 420, n),
+        "SHOT_MADE_FLAG": rng.integers(0, 2, n),
+        "PERIOD": rng.integers(1, 7, n),   # 5 and 6 are overtimes
+        "ACTION_TYPE": rng.choice(["Jump Shot", "Layup Shot", "Dunk Shot", "Hook Shot"], n),
+        "SHOT_TYPE": rng.choice(["2PT Field Goal", "3PT Field Goal"], n),
+        "SHOT_ZONE_BASIC": rng.choice(["Restricted Area", "Mid-Range", "Above the Break 3", "Left Corner 3"], n),
+        "GAME_DATE": rng.choice(dates, n),
+    })
+
+
+def _pandas_filter(df, periods=(), action_types=(), shot_types=(), zones=(), results=(),
+                   date_from=None, date_to=None):
+    m = pd.Series(True, index=df.index)
+    if periods:
+        m &= df["PERIOD"].map(period_label).isin(periods)
+    if action_types:
+        m &= df["ACTION_TYPE"].isin(action_types)
+    if shot_types:
+        m &= df["SHOT_TYPE"].isin(shot_types)
+    if zones:
+        m &= df["SHOT_ZONE_BASIC"].isin(zones)
+    if results:
+        m &= df["SHOT_MADE_FLAG"].map(result_label).isin(results)
+    d = pd.to_datetime(df["GAME_DATE"], format="%Y%m%d").dt.date
+    if date_from is not None:
+        m &= d >= date_from
+    if date_to is not None:
+        m &= d <= date_to
+    return df[m].reset_index(drop=True)
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"periods": ("1st",)},
+    {"periods": ("4th", "OT")},
+    {"action_types": ("Jump Shot", "Hook Shot"), "shot_types": ("3PT Field Goal",)},
+    {"zones": ("Mid-Range",), "results": ("Made",)},
+    {"results": ("Missed",), "periods": ("2nd", "3rd"), "zones": ("Restricted Area", "Left Corner 3")},
+    {"date_from": dt.date(2024, 11, 15), "date_to": dt.date(2024, 12, 20)},
+    {"date_to": dt.date(2024, 11, 1), "shot_types": ("2PT Field Goal",)},
+    {"action_types": ("Alley Oop",)},   # value that never occurs
+])
+def test_query_matches_pandas_filter(shots, filters):
+    got = ShotIndex(shots).query(**filters)
+    pd.testing.assert_frame_equal(got, _pandas_filter(shots, **filters))
+
+
+def test_values_are_normalized_labels(shots):
+    idx = ShotIndex(shots)
+    assert idx.values("PERIOD") == ["1st", "2nd", "3rd", "4th", "OT"]
+    assert idx.values("SHOT_MADE_FLAG") == ["Made", "Missed"]
+
+
+def test_last_n_games_for_one_player_counts_dates(shots):
+    # A player's frame has no GAME_ID; one game per date
+    idx = ShotIndex(shots)
+    last3 = sorted(shots["GAME_DATE"].unique())[-3:]
+    got = idx.query(last_n_games=3)
+    assert sorted(got["GAME_DATE"].unique()) == last3
+    assert len(got) == shots["GAME_DATE"].isin(last3).sum()
+    assert len(idx.query(last_n_games=500)) == len(shots)
+
+
+def test_last_n_games_counts_games_not_dates():
+    # League / team frames: several games share a date
+    df = pd.DataFrame({
+        "GAME_ID": [11, 11, 12, 13, 14, 14, 15],
+        "GAME_DATE": ["20250101", "20250101", "20250101", "20250102", "20250103", "20250103", "20250103"],
+        "SHOT_MADE_FLAG": [1, 0, 1, 0, 1, 1, 0],
+        "PERIOD": 1,
+    })
+    idx = ShotIndex(df)
+    assert set(idx.query(last_n_games=1)["GAME_ID"]) == {15}
+    assert set(idx.query(last_n_games=2)["GAME_ID"]) == {14, 15}
+    assert set(idx.query(last_n_games=4)["GAME_ID"]) == {12, 13, 14, 15}
+    # combined with another filter
+    assert idx.query(last_n_games=2, results=("Made",))["GAME_ID"].tolist() == [14, 14]
+
+
+def test_query_memo_ignores_filter_order(shots):
+    idx = ShotIndex(shots)
+    a = idx.query(zones=["Mid-Range", "Left Corner 3"], results={"Made"})
+    assert idx.query(zones=("Left Corner 3", "Mid-Range"), results=["Made"]) is a
+    assert len(idx._results) == 1
@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from courtvision.data import nba_client as nc
+
+CONSTS = {
+    "factor": 0.59, "VOP": 1.06, "DRBP": 0.76,
+    "lgFT": 17000.0, "lgFTA": 22000.0, "lgFG": 43000.0, "lgAST": 26000.0, "lgPF": 20000.0,
+}
+
+
+def _uper_row_loop(p, team_totals, consts):
+    """The original per-row league_average_uPER loop: (uPER list, minutes-weighted mean)."""
+    team_map = {int(r["TEAM_ID"]): r for _, r in team_totals.iterrows()}
+    factor = consts["factor"]; VOP = consts["VOP"]; DRBP = consts["DRBP"]
+    lgFT = consts["lgFT"]; lgFTA = consts["lgFTA"]; lgPF = consts["lgPF"]
+
+    def uper_row(r):
+        MIN = float(r.get("MIN", 0) or 0)
+        if MIN <= 0: return 0.0, 0.0
+        TEAM_ID = int(r.get("TEAM_ID", 0) or 0)
+        t = team_map.get(TEAM_ID, {})
+        tmFG  = float(t.get("FGM", t.get("FG", 0)) or 0.0)
+        tmAST = float(t.get("AST", 0) or 0.0)
+        tmAST_over_tmFG = (tmAST / tmFG) if tmFG else 0.0
+
+        FG   = float(r.get("FGM", r.get("FG", 0)) or 0.0)
+        FGA  = float(r.get("FGA", 0) or 0.0)
+        _3P  = float(r.get("FG3M", 0) or 0.0)
+        FT   = float(r.get("FTM", 0) or 0.0)
+        FTA  = float(r.get("FTA", 0) or 0.0)
+        AST  = float(r.get("AST", 0) or 0.0)
+        ORB  = float(r.get("OREB", 0) or 0.0)
+        TRB  = float(r.get("REB", 0) or 0.0)
+        STL  = float(r.get("STL", 0) or 0.0)
+        BLK  = float(r.get("BLK", 0) or 0.0)
+        TOV  = float(r.get("TOV", r.get("TO", 0)) or 0.0)
+        PF   = float(r.get("PF", 0) or 0.0)
+
+        uPER_num = (
+            _3P + (2.0/3.0)*AST
+            + FG * (2.0 - factor * tmAST_over_tmFG)
+            + 0.5 * FT * (2.0 - (1.0/3.0) * tmAST_over_tmFG)
+            - VOP*TOV
+            - VOP*DRBP*(FGA - FG)
+            - VOP*0.44*(0.44 + 0.56*DRBP)*(FTA - FT)
+            + VOP*(1-DRBP)*(TRB - ORB)
+            + VOP*DRBP*ORB
+            + VOP*STL
+            + VOP*DRBP*BLK
+            - PF * ((lgFT/max(lgPF,1e-9)) - 0.44*(lgFTA/max(lgPF,1e-9))*VOP)
+        )
+        return (uPER_num / MIN), MIN
+
+    rows = [uper_row(r) for _, r in p.iterrows()]
+    total_min = sum(m for _, m in rows)
+    mean = sum(u * m for u, m in rows) / total_min if total_min > 0 else None
+    return [u for u, _ in rows], mean
+
+
+@pytest.fixture
+def league():
+    rng = np.random.default_rng(7)
+    n, team_ids = 200, [1610612737 + i for i in range(6)]
+    fga = rng.integers(0, 1500, n).astype(float)
+    fta = rng.integers(0, 500, n).astype(float)
+    reb = rng.integers(0, 800, n).astype(float)
+    p = pd.DataFrame({
+        "PLAYER_ID": np.arange(n),
+        "PLAYER_NAME": [f"P{i}" for i in range(n)],
+        # one player on a team missing from the team table
+        "TEAM_ID": rng.choice(team_ids, n).tolist()[:-1] + [1],
+        "MIN": rng.uniform(0, 2800, n).round(1),
+        "FGA": fga, "FGM": np.floor(fga * rng.uniform(0.3, 0.6, n)),
+        "FG3M": rng.integers(0, 200, n).astype(float),
+        "FTA": fta, "FTM": np.floor(fta * rng.uniform(0.5, 0.9, n)),
+        "REB": reb, "OREB": np.floor(reb * rng.uniform(0, 0.4, n)),
+        "AST": rng.integers(0, 600, n).astype(float),
+        "STL": rng.integers(0, 150, n).astype(float),
+        "BLK": rng.integers(0, 150, n).astype(float),
+        "TOV": rng.integers(0, 300, n).astype(float),
+        "PF": rng.integers(0, 250, n).astype(float),
+    })
+    p.loc[:4, "MIN"] = 0.0   # players with no minutes count as uPER 0, weight 0
+    teams = pd.DataFrame({
+        "TEAM_ID": team_ids,
+        "FGM": rng.integers(3000, 3500, len(team_ids)).astype(float),
+        "AST": rng.integers(1800, 2300, len(team_ids)).astype(float),
+    })
+    return p, teams
+
+
+def test_vectorized_uper_matches_row_loop(league):
+    p, teams = league
+    expected, expected_mean = _uper_row_loop(p, teams, CONSTS)
+
+    uPER, team_ids = nc._player_uPER(p, teams, CONSTS)
+    np.testing.assert_allclose(uPER, expected, rtol=1e-12, atol=1e-15)
+    assert team_ids.tolist() == p["TEAM_ID"].tolist()
+
+    MIN = p["MIN"].to_numpy()
+    assert (uPER * MIN).sum() / MIN.sum() == pytest.approx(expected_mean, rel=1e-12)
+
+
+def test_unknown_team_gets_zero_assist_ratio(league):
+    p, teams = league
+    row = p.tail(1)   # TEAM_ID 1 is not in the team table
+    uPER, _ = nc._player_uPER(row, teams, CONSTS)
+    num = nc._uPER_numerator(row, np.zeros(1), CONSTS)
+    assert uPER[0] == pytest.approx(num[0] / row["MIN"].iloc[0], rel=1e-12)
+
+
+@pytest.fixture
+def season_tables(league, monkeypatch, tmp_path):
+    p, teams = league
+    consts = dict(CONSTS, lgPace=99.0, lguPER=0.35)
+    pace = pd.DataFrame({"TEAM_ID": teams["TEAM_ID"], "PACE": np.linspace(96.0, 102.0, len(teams))})
+    monkeypatch.setattr(nc, "_p", lambda name: tmp_path / name)
+    monkeypatch.setattr(nc, "_ADVANCED", {})
+    monkeypatch.setattr(nc, "_league_player_totals", lambda season, refresh=False, season_type="Regular Season": p)
+    monkeypatch.setattr(nc, "_league_team_base", lambda season, refresh=False, season_type="Regular Season": teams)
+    monkeypatch.setattr(nc, "_league_advanced", lambda season, refresh=False, season_type="Regular Season": pace)
+    monkeypatch.setattr(nc, "_league_constants", lambda season, refresh=False, season_type="Regular Season": consts)
+    return p, teams, pace
+
+
+def test_player_PER_matches_league_table(season_tables):
+    p, teams, _ = season_tables
+    table = nc.league_advanced_table("2024-25")
+    for i in (10, 50, 120):
+        row = p.iloc[[i]]
+        team = teams[teams["TEAM_ID"] == row["TEAM_ID"].iloc[0]]
+        assert nc.compute_player_PER(row, team, "2024-25") == pytest.approx(table.loc[i, "PER"], rel=1e-12)
+
+
+def test_player_PER_rates_a_stint_against_its_team(season_tables):
+    p, teams, pace = season_tables
+    stint = p.iloc[[10]]
+    other = teams[teams["TEAM_ID"] != stint["TEAM_ID"].iloc[0]].iloc[[0]]
+    tid = int(other["TEAM_ID"].iloc[0])
+    uPER, _ = nc._player_uPER(stint.assign(TEAM_ID=tid), teams, dict(CONSTS))
+    tmPace = float(pace.set_index("TEAM_ID").loc[tid, "PACE"])
+    expected = uPER[0] * (99.0 / tmPace) * (15.0 / 0.35)
+    assert nc.compute_player_PER(stint, other, "2024-25") == pytest.approx(expected, rel=1e-12)
+    assert nc.compute_player_PER(p.iloc[[0]], other, "2024-25") is None   # no minutes